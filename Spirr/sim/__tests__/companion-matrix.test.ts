@@ -0,0 +1,75 @@
+// Precompiled companion matrix: the decoded asset must agree with the companionsGood/companionsBad
+// lists in plants.json it was compiled from (climate-data/build_companions.py).
+import { describe, expect, it } from "vitest";
+import plants from "../../src/data/plants.json";
+import {
+  BENEFICIAL,
+  companionMask,
+  companionRelation,
+  NEUTRAL,
+  partnerCounts,
+  UNFAVORABLE,
+} from "../../src/lib/companionMatrix";
+
+type ListedPlant = { key: string; companionsGood?: string[]; companionsBad?: string[] };
+const bundled = plants as ListedPlant[];
+const byKey = new Map(bundled.map((plant) => [plant.key, plant]));
+
+/** The relationship the lists imply: symmetric, "bad" beats "good", a plant is neutral to itself. */
+function listed(a: string, b: string): number {
+  if (a === b) {
+    return NEUTRAL;
+  }
+  const pa = byKey.get(a)!;
+  const pb = byKey.get(b)!;
+  if (pa.companionsBad?.includes(b) || pb.companionsBad?.includes(a)) {
+    return UNFAVORABLE;
+  }
+  if (pa.companionsGood?.includes(b) || pb.companionsGood?.includes(a)) {
+    return BENEFICIAL;
+  }
+  return NEUTRAL;
+}
+
+describe("companionRelation", () => {
+  it("matches the plants.json lists for every pair of bundled plants", () => {
+    for (const a of bundled) {
+      for (const b of bundled) {
+        expect(companionRelation(a.key, b.key), `${a.key} / ${b.key}`).toBe(listed(a.key, b.key));
+      }
+    }
+  });
+
+  it("has both kinds of pairing in the bundled data", () => {
+    const relations = bundled.flatMap((a) => bundled.map((b) => companionRelation(a.key, b.key)));
+    expect(relations).toContain(BENEFICIAL);
+    expect(relations).toContain(UNFAVORABLE);
+  });
+
+  it("returns undefined when either key is not in the matrix", () => {
+    const known = bundled[0].key;
+    expect(companionRelation("custom_abc123", known)).toBeUndefined();
+    expect(companionRelation(known, "custom_abc123")).toBeUndefined();
+    expect(companionRelation("custom_abc123", "custom_def456")).toBeUndefined();
+  });
+});
+
+describe("partnerCounts", () => {
+  it("counts the beneficial and unfavorable partners in a bed", () => {
+    const bed = bundled.map((plant) => plant.key);
+    const mask = companionMask(bed);
+    for (const plant of bundled) {
+      const relations = bed.map((key) => listed(plant.key, key));
+      expect(partnerCounts(plant.key, mask), plant.key).toEqual({
+        good: relations.filter((r) => r === BENEFICIAL).length,
+        bad: relations.filter((r) => r === UNFAVORABLE).length,
+      });
+    }
+  });
+
+  it("ignores keys outside the matrix", () => {
+    const known = bundled[0].key;
+    expect(partnerCounts("custom_abc123", companionMask([known]))).toEqual({ good: 0, bad: 0 });
+    expect(partnerCounts(known, companionMask(["custom_abc123"]))).toEqual({ good: 0, bad: 0 });
+  });
+});
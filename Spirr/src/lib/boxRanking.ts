@@ -1,4 +1,5 @@
 import { getBedTypeLabel, getSunLabel, type BedType } from "./boxMeta";
+import { companionMask, partnerCounts } from "./companionMatrix";
 import { companionHints } from "./companions";
 import { getFamilyName } from "./families";
 import { getPlantName } from "./plants";
@@ -78,6 +79,9 @@ export function rankPlantsForBox(
  *  - sun: a full-sun plant in a shaded box → blocker; in partial shade → caution; in sun → positive
  *  - soil depth: box shallower than the plant needs → blocker; deep enough → positive
  *  - bed type: box outside the plant's preferred beds → caution; inside → positive
+ *  - companions: a poor neighbour already in the box → caution; a good one → positive. Within a
+ *    tier, each beneficial partner in the box also adds 1 to the score and each unfavorable one
+ *    subtracts 1 (bitset counts from the precompiled companion matrix; custom plants count 0)
  *  - occupancy: box already has active plantings → caution; empty → positive
  *
  * Every input field is optional in the data model; a missing field simply contributes nothing
@@ -139,7 +143,10 @@ function evaluateFit(
 
   // Companion planting — how the plant pairs with what's already growing here (Increment F).
   const activeInBox = plantings.filter((p) => p.boxId === box.id && p.status === "active");
-  const hints = companionHints(plant, activeInBox.map((p) => p.plantKey).filter(Boolean), findPlant);
+  const activeKeys = activeInBox.map((p) => p.plantKey).filter(Boolean);
+  const hints = companionHints(plant, activeKeys, findPlant);
+  const partners = partnerCounts(plant.key, companionMask(activeKeys));
+  const companionBalance = partners.good - partners.bad;
   const goodCompanions = hints.filter((h) => h.kind === "good").map((h) => getPlantName(h.plant, language));
   const badCompanions = hints.filter((h) => h.kind === "bad").map((h) => getPlantName(h.plant, language));
   if (goodCompanions.length > 0) {
@@ -161,9 +168,9 @@ function evaluateFit(
     return { tier: "avoid", reasons: blockers, score: -blockers.length };
   }
   if (cautions.length > 0) {
-    return { tier: "ok", reasons: cautions, score: positives.length - cautions.length };
+    return { tier: "ok", reasons: cautions, score: positives.length - cautions.length + companionBalance };
   }
-  return { tier: "good", reasons: positives, score: positives.length };
+  return { tier: "good", reasons: positives, score: positives.length + companionBalance };
 }
 
 /** Join names into a Norwegian list: ["a","b","c"] → "a, b og c". */
@@ -0,0 +1,82 @@
+import companionMatrixJson from "../data/companion-matrix.json";
+
+// Companion graph of the bundled plants, compiled from plants.json by climate-data/build_companions.py
+// (format in climate_data/companions.py). Re-run it whenever companionsGood/companionsBad change.
+
+export const BENEFICIAL = 1;
+export const NEUTRAL = 0;
+export const UNFAVORABLE = -1;
+
+interface CompanionMatrixAsset {
+  keys: string[];
+  /** base64 int8, keys² row-major: 1 beneficial, 0 neutral, -1 unfavorable. Symmetric. */
+  matrix: string;
+  /** Bytes per bitset row: ceil(keys / 8). */
+  rowBytes: number;
+  /** base64 bitsets, one row per plant: partner j is bit (j & 7) of byte (j >> 3). */
+  beneficial: string;
+  antagonistic: string;
+}
+
+function decodeBase64(s: string): Uint8Array {
+  return Uint8Array.from(atob(s), (c) => c.charCodeAt(0));
+}
+
+const asset = companionMatrixJson as CompanionMatrixAsset;
+const size = asset.keys.length;
+const indexByKey = new Map(asset.keys.map((key, i) => [key, i]));
+const matrix = new Int8Array(decodeBase64(asset.matrix).buffer);
+const beneficialBits = decodeBase64(asset.beneficial);
+const antagonisticBits = decodeBase64(asset.antagonistic);
+
+/**
+ * Relationship between two bundled plants (BENEFICIAL / NEUTRAL / UNFAVORABLE), or undefined when
+ * either key is not in the compiled matrix (custom plants) — callers fall back to the plant lists.
+ */
+export function companionRelation(a: string, b: string): number | undefined {
+  const i = indexByKey.get(a);
+  const j = indexByKey.get(b);
+  if (i === undefined || j === undefined) {
+    return undefined;
+  }
+  return matrix[i * size + j];
+}
+
+/** Bed membership as a bitset over the matrix index. Keys outside the matrix are ignored. */
+export function companionMask(keys: string[]): Uint8Array {
+  const mask = new Uint8Array(asset.rowBytes);
+  for (const key of keys) {
+    const j = indexByKey.get(key);
+    if (j !== undefined) {
+      mask[j >> 3] |= 1 << (j & 7);
+    }
+  }
+  return mask;
+}
+
+function popcount8(byte: number): number {
+  let n = 0;
+  for (let b = byte; b; b &= b - 1) {
+    n++;
+  }
+  return n;
+}
+
+/**
+ * How many of the plants in `mask` are beneficial / antagonistic partners of `key` — one AND per
+ * byte of the plant's bitset rows instead of scanning both plants' lists for every neighbour.
+ */
+export function partnerCounts(key: string, mask: Uint8Array): { good: number; bad: number } {
+  const i = indexByKey.get(key);
+  if (i === undefined) {
+    return { good: 0, bad: 0 };
+  }
+  let good = 0;
+  let bad = 0;
+  const row = i * asset.rowBytes;
+  for (let b = 0; b < asset.rowBytes; b++) {
+    good += popcount8(beneficialBits[row + b] & mask[b]);
+    bad += popcount8(antagonisticBits[row + b] & mask[b]);
+  }
+  return { good, bad };
+}
@@ -1,3 +1,4 @@
+import { BENEFICIAL, companionRelation, UNFAVORABLE } from "./companionMatrix";
 import type { PlantInfo } from "../types";
 
 export interface CompanionHint {
@@ -11,7 +12,8 @@ export interface CompanionHint {
  * Companion pairings between `plant` and the plants already growing in a box (Increment F).
  * Soft information only — like rotation, it never blocks. The bundled data is symmetric, but we
  * check both directions so a one-sided custom-plant tag still surfaces. One hint per distinct
- * neighbour, with "bad" winning over "good" if a plant somehow appears on both lists.
+ * neighbour, with "bad" winning over "good" if a plant somehow appears on both lists. Pairs of bundled
+ * plants are read from the precompiled companion matrix; custom plants fall back to the lists.
  *
  * A neighbour of the *same* plant is skipped — two lettuces beside each other isn't a pairing.
  */
@@ -34,8 +36,15 @@ export function companionHints(
     if (!neighbour) {
       continue;
     }
-    const isBad = bad.has(key) || (neighbour.companionsBad?.includes(plant.key) ?? false);
-    const isGood = good.has(key) || (neighbour.companionsGood?.includes(plant.key) ?? false);
+    const relation = companionRelation(plant.key, key);
+    const isBad =
+      relation !== undefined
+        ? relation === UNFAVORABLE
+        : bad.has(key) || (neighbour.companionsBad?.includes(plant.key) ?? false);
+    const isGood =
+      relation !== undefined
+        ? relation === BENEFICIAL
+        : good.has(key) || (neighbour.companionsGood?.includes(plant.key) ?? false);
     if (isBad) {
       hints.push({ kind: "bad", plant: neighbour });
     } else if (isGood) {
@@ -33,17 +33,31 @@ export interface FrostNormalEntry {
    */
   growDays5?: number[];
   growDays10?: number[];
+  /**
+   * Frost-date distribution across the normal years: 10/25/50/75/90th percentiles of the yearly
+   * last spring / first autumn frost DOY (index 2 equals the median above). `lastFrostPct[4]` is
+   * "90% chance of no frost after this day". Optional — older data lacks them.
+   */
+  lastFrostPct?: number[];
+  firstFrostPct?: number[];
+  /**
+   * Empirical daily frost risk, base64-packed uint8: byte `doy - 1` is the % of years with
+   * Tmin ≤ 0°C on that day. Decode with `Uint8Array.from(atob(s), (c) => c.charCodeAt(0))`.
+   */
+  frostRisk?: string;
   /**
    * Number of years (1991–2024, ≥300 obs days each) the normal is derived from. Optional —
    * pre-Tier-2 data lacks it. Recent, well-sited stations may have a short record.
    */
   years?: number;
   /**
-   * Coarse reliability of the frost dates: `"low"` when the station has a short record
-   * (< ~15 contributing years), else `"high"`. The app surfaces `"low"` as a caution so the
-   * user knows the dates for a young station are less certain. Optional (pre-Tier-2 data lacks it).
+   * 90% bootstrap intervals `[lo, hi]` of the medians (resampled over the contributing years):
+   * how far the normal could plausibly move with a different sample of years. Wide frost-date
+   * intervals are surfaced as a caution. Optional — older data lacks them.
    */
-  confidence?: "high" | "low";
+  lastFrostCi?: number[];
+  firstFrostCi?: number[];
+  gdd5Ci?: number[];
 }
 
 export interface StationEntry {
@@ -74,6 +88,26 @@ export const LAPSE_DAYS_PER_METRE = 0.065;
 // growing day. This is the temperature half of LAPSE_DAYS_PER_METRE (which folds in ~10 days/°C).
 export const LAPSE_C_PER_METRE = 0.0065;
 
+// A frost-date bootstrap interval wider than this (days) marks the station as low confidence.
+// Roughly where a ~12-day year-to-year spread leaves a record of < ~15 years.
+export const LOW_CONFIDENCE_CI_DAYS = 14;
+// Fallback for data without intervals: fewer contributing years than this is low confidence.
+const LOW_CONFIDENCE_YEARS = 15;
+
+function stationConfidence(normal: FrostNormalEntry): "high" | "low" | undefined {
+  if (normal.lastFrostCi && normal.firstFrostCi) {
+    const width = Math.max(
+      normal.lastFrostCi[1] - normal.lastFrostCi[0],
+      normal.firstFrostCi[1] - normal.firstFrostCi[0],
+    );
+    return width > LOW_CONFIDENCE_CI_DAYS ? "low" : "high";
+  }
+  if (normal.years !== undefined) {
+    return normal.years < LOW_CONFIDENCE_YEARS ? "low" : "high";
+  }
+  return undefined;
+}
+
 /**
  * Lapse-correct a station GDD curve to the user's elevation. Each checkpoint gains `deltaT` extra
  * degree-days per growing day accumulated so far (`deltaT > 0` when the garden sits below the
@@ -132,8 +166,11 @@ export interface ResolvedLocation {
   gddCurve10: number[];
   /** Years the station's normal is derived from (undefined for pre-Tier-2 data). */
   stationYears?: number;
-  /** `"low"` when the station has a short record — surfaced as a caution. */
+  /** `"low"` when the station's frost-date intervals are wide — surfaced as a caution. */
   stationConfidence?: "high" | "low";
+  /** The station's frost-date intervals, shifted like `lastFrostDoy` / `firstFrostDoy`. */
+  lastFrostCi?: number[];
+  firstFrostCi?: number[];
 }
 
 /**
@@ -176,7 +213,9 @@ export function resolveLocation(input: ResolveLocationInput): ResolvedLocation |
     gddCurve5,
     gddCurve10,
     stationYears: stationFrost.years,
-    stationConfidence: stationFrost.confidence,
+    stationConfidence: stationConfidence(stationFrost),
+    lastFrostCi: stationFrost.lastFrostCi?.map((d) => Math.round(d + elevationShiftDays + offsetDays)),
+    firstFrostCi: stationFrost.firstFrostCi?.map((d) => Math.round(d - elevationShiftDays - offsetDays)),
   };
 }
 
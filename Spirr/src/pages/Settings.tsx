@@ -516,6 +516,8 @@ export function Settings() {
               <p className="text-xs" style={{ color: "#b4690e" }}>
                 ⚠ Kort måleserie{resolvedLocation.stationYears ? ` (~${resolvedLocation.stationYears} år)` : ""} — frostdatoene
                 for denne stasjonen er mer usikre enn for stasjoner med lange serier.
+                {resolvedLocation.lastFrostCi &&
+                  ` Siste vårfrost ligger trolig mellom ${formatDoy(resolvedLocation.lastFrostCi[0])} og ${formatDoy(resolvedLocation.lastFrostCi[1])}.`}
               </p>
             )}
           </div>
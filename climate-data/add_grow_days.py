@@ -4,39 +4,25 @@ Reads the existing frost-normals.json, recomputes each station from the cached
 1991-2020 daily observations (offline — no network), and attaches the new
 `growDays5` / `growDays10` fields without disturbing the existing curves/normals.
 These let the app lapse-correct the GDD heat budget for the user's elevation
-(Increment I, Layer 0 fix). Idempotent. Run: `python add_grow_days.py`.
+(Increment I, Layer 0 fix). Idempotent. Now a thin wrapper over
+`patch_fields.py growDays5 growDays10`. Run: `python add_grow_days.py`.
 """
 
-import json
+import argparse
 from pathlib import Path
 
-from climate_data import frost
+import patch_fields
+from climate_data import profiling
 
 DATA = Path(__file__).parent.parent / "mvp-mygarden" / "src" / "data" / "frost-normals.json"
 
 
 def main() -> None:
-    entries = json.loads(DATA.read_text())
-    out: list[dict] = []
-    missing: list[str] = []
-    for i, e in enumerate(entries, 1):
-        key = e["key"]
-        rec = frost.derive_from_observations(key)
-        if rec is None:
-            missing.append(key)
-            out.append(e)
-            print(f"[{i}/{len(entries)}] {key}: SKIP (no cache / insufficient) — left without growDays")
-            continue
-        merged = dict(e)
-        merged["growDays5"] = rec["growDays5"]
-        merged["growDays10"] = rec["growDays10"]
-        out.append(merged)
-        print(f"[{i}/{len(entries)}] {key}: growDays5[12]={rec['growDays5'][12]} "
-              f"growDays10[12]={rec['growDays10'][12]}")
-
-    DATA.write_text(json.dumps(out, ensure_ascii=False, indent=2) + "\n")
-    print(f"\nWrote {len(out)} entries to {DATA}")
-    print(f"missing growDays: {len(missing)} {missing}")
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    profiling.add_arguments(p)
+    profiling.configure(p.parse_args())
+    patch_fields.patch(DATA, ["growDays5", "growDays10"])
+    profiling.finish()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,93 @@
+"""Offline climate analyses over per-year station statistics.
+
+Every station in the shipped frost-normals.json is re-derived from the Frost
+cache (offline — a cache miss is skipped, never fetched) across a process
+pool, reduced to its per-year statistics (`frost.per_year_stats`), and the
+chosen analysis runs over those:
+
+  python analyze.py rolling [--window 30]     # sliding-window normals per station
+  python analyze.py trends                    # Theil–Sen frost/GDD trends per decade
+
+Output goes to data/out/<analysis>.json unless `--out` says otherwise.
+"""
+
+import argparse
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from climate_data import frost, frost_api, metrics, profiling, rolling, trends
+
+DATA = Path(__file__).parent.parent / "mvp-mygarden" / "src" / "data" / "frost-normals.json"
+OUT_DIR = Path(__file__).parent / "data" / "out"
+
+
+def _init_worker() -> None:
+    frost_api.CACHE_ONLY = True
+
+
+def _station_stats(key: str) -> tuple[str, frost.YearlyStats | None]:
+    # fields=() skips curves/distributions in _compute_normal; only its gates matter here.
+    normal, yearly = frost.derive_with_yearly(key, fields=())
+    return key, frost.per_year_stats(yearly) if normal is not None else None
+
+
+def collect(keys: list[str], workers: int | None = None) -> dict[str, frost.YearlyStats]:
+    _init_worker()
+    if workers == 1:
+        results = list(map(_station_stats, keys))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            results = list(pool.map(_station_stats, keys, chunksize=8))
+    stats = {k: s for k, s in results if s is not None}
+    missing = [k for k, s in results if s is None]
+    print(f"  per-year stats: {len(stats)} stations ({len(missing)} missing from cache / insufficient)")
+    return stats
+
+
+def cmd_rolling(args: argparse.Namespace, stats: dict[str, frost.YearlyStats]) -> list[dict]:
+    out = [rolling.rolling_normals(k, s, window=args.window) for k, s in stats.items()]
+    if out:
+        print(f"  windows of {args.window} years starting {out[0]['starts'][0]}..{out[0]['starts'][-1]}")
+    return out
+
+
+def cmd_trends(args: argparse.Namespace, stats: dict[str, frost.YearlyStats]) -> list[dict]:
+    out = trends.compute(stats)
+    print(f"  {sum(r['shifting'] for r in out)}/{len(out)} stations with a significant trend")
+    return out
+
+
+COMMANDS = {"rolling": cmd_rolling, "trends": cmd_trends}
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = p.add_subparsers(dest="command", required=True)
+    r = sub.add_parser("rolling", help="Sliding-window normals per station")
+    r.add_argument("--window", type=int, default=rolling.DEFAULT_WINDOW,
+                   help="Window length in years (default: %(default)s)")
+    sub.add_parser("trends", help="Theil–Sen trends (days/decade, GDD/decade) per station")
+    for sp in sub.choices.values():
+        sp.add_argument("--data", type=Path, default=DATA, help=f"frost-normals.json naming the stations (default: {DATA})")
+        sp.add_argument("--out", type=Path, default=None, help=f"Output file (default: {OUT_DIR}/<command>.json)")
+        sp.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count; 1 = serial)")
+        profiling.add_arguments(sp)
+    args = p.parse_args()
+    profiling.configure(args)
+
+    keys = [e["key"] for e in json.loads(args.data.read_text())]
+    with metrics.stage("collect"):
+        stats = collect(keys, workers=1 if profiling.enabled() else args.workers)
+    with metrics.stage(args.command):
+        result = COMMANDS[args.command](args, stats)
+
+    out = args.out or OUT_DIR / f"{args.command}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, ensure_ascii=False, indent=2) + "\n")
+    print(f"  -> {out}: {len(result)} entries")
+    profiling.finish()
+
+
+if __name__ == "__main__":
+    main()
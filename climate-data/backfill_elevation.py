@@ -14,11 +14,14 @@ Elevations cache to data/raw/elevations.json (keyed by the file's coordinate ord
 so a re-run is instant and offline.
 """
 
+import argparse
 import json
 import time
 import urllib.request
 from pathlib import Path
 
+from climate_data import metrics, profiling
+
 APP_POSTNUMMER = Path(__file__).parent.parent / "Spirr" / "src" / "data" / "postnummer.json"
 CACHE = Path(__file__).parent / "data" / "raw" / "elevations.json"
 ELEVATION_URL = "https://api.open-meteo.com/v1/elevation"
@@ -76,11 +79,16 @@ def fetch_elevations(coords: list[tuple[float, float]]) -> list[float]:
 
 
 def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    profiling.add_arguments(p)
+    profiling.configure(p.parse_args())
+
     entries = json.loads(APP_POSTNUMMER.read_text())
     print(f"  loaded {len(entries)} postnumre from {APP_POSTNUMMER.name}")
 
     coords = [(e["centroidLat"], e["centroidLon"]) for e in entries]
-    elevations = fetch_elevations(coords)
+    with metrics.stage("fetch_elevations"):
+        elevations = fetch_elevations(coords)
     assert len(elevations) == len(entries), "elevation/entry count mismatch"
 
     changed = 0
@@ -93,11 +101,13 @@ def main() -> None:
             changed += 1
         e["centroidElevationM"] = new
 
-    APP_POSTNUMMER.write_text(json.dumps(entries, ensure_ascii=False, indent=2) + "\n")
+    with metrics.stage("write"):
+        APP_POSTNUMMER.write_text(json.dumps(entries, ensure_ascii=False, indent=2) + "\n")
     vals = [e["centroidElevationM"] for e in entries]
     print(f"  updated {changed}/{len(entries)} elevations")
     print(f"  range: {min(vals)}–{max(vals)} m, distinct values: {len(set(vals))}")
     print(f"  -> wrote {APP_POSTNUMMER}")
+    profiling.finish()
 
 
 if __name__ == "__main__":
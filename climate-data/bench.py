@@ -0,0 +1,230 @@
+"""Benchmark the climate derivation hot paths against synthetic Frost fixtures.
+
+Generates a throwaway Frost cache (34 years of daily min/mean per station, and
+per-year sub-daily `air_temperature` for a mean-only station) plus a geonames
+NO.zip with `climate_data.synthetic`, then times, fully offline:
+
+  - fetch_daily      `frost._fetch_daily` from a warm cache (read + JSON decode + bucketing)
+  - compute_normal   `frost._compute_normal` on already-decoded station data
+  - fetch_hourly     `frost._fetch_hourly` (per-year decode + sub-daily → daily reduction)
+  - nearest_station  `postnummer._nearest_station` for every centroid (5k × 600 by default)
+  - build_main       the whole `build.main` against the warm cache
+  - fetch_http       (--with-server) uncached `frost_api.get` round trips against the local
+                     Frost stand-in (climate_data.frost_server), rate limiter off
+
+Results (min / median / mean seconds per repeat, plus sizes and the git commit)
+are written as JSON to data/out/bench/, so runs can be compared across commits:
+
+  python bench.py                         # default sizes
+  python bench.py --quick                 # small sizes, smoke test
+  python bench.py --compare data/out/bench/<older>.json
+"""
+
+import argparse
+import contextlib
+import datetime as dt
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import build
+from climate_data import frost, frost_api, frost_server, metrics, postnummer, synthetic
+
+DEFAULT_OUT_DIR = Path(__file__).parent / "data" / "out" / "bench"
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> dict[str, float]:
+    fn()  # warm-up (page cache, imports, lazy allocations)
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return {
+        "repeat": repeat,
+        "minS": round(min(samples), 6),
+        "medianS": round(statistics.median(samples), 6),
+        "meanS": round(statistics.fmean(samples), 6),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args: argparse.Namespace, work: Path) -> dict[str, Any]:
+    cache = work / "frost"
+    raw = work / "raw"
+    ids = synthetic.station_ids(args.build_stations)
+    print(f"fixtures: {len(ids)} stations (every {args.hourly_every}th sub-daily, "
+          f"{args.interval_min} min) + {args.postnumre} postnumre -> {work}")
+    synthetic.write_cache(cache, ids, seed=args.seed, hourly_every=args.hourly_every,
+                          interval_min=args.interval_min)
+    synthetic.write_geonames_zip(raw / "NO.zip", args.postnumre, seed=args.seed)
+
+    frost_api.CACHE_DIR = cache
+    frost_api.CACHE_ONLY = True
+    postnummer.CACHE_DIR = raw
+
+    daily_ids = [sid for i, sid in enumerate(ids) if not (args.hourly_every and i % args.hourly_every == 0)]
+    sample = daily_ids[: args.sample]
+    hourly_id = ids[0] if args.hourly_every else None
+    results: dict[str, Any] = {}
+
+    print("  fetch_daily")
+    results["fetch_daily"] = _time(lambda: [frost._fetch_daily(s) for s in sample], args.repeat)
+    results["fetch_daily"]["stations"] = len(sample)
+
+    print("  compute_normal")
+    decoded = [frost._fetch_daily(s) for s in sample]
+    results["compute_normal"] = _time(
+        lambda: [frost._compute_normal(s, y) for s, y in zip(sample, decoded)], args.repeat)
+    results["compute_normal"]["stations"] = len(sample)
+
+    if hourly_id:
+        print("  fetch_hourly")
+        results["fetch_hourly"] = _time(lambda: frost._fetch_hourly(hourly_id), args.repeat)
+        results["fetch_hourly"]["intervalMin"] = args.interval_min
+
+    print("  nearest_station")
+    stations = [{**synthetic.station_meta(sid, args.seed), "name": sid}
+                for sid in synthetic.station_ids(args.nearest_stations)]
+    points = synthetic.centroids(args.postnumre, args.seed)
+    results["nearest_station"] = _time(
+        lambda: [postnummer._nearest_station(lat, lon, stations) for lat, lon in points], args.repeat)
+    results["nearest_station"].update(points=len(points), stations=len(stations))
+
+    print("  build_main")
+    out = work / "out"
+
+    def full_build() -> None:
+        metrics.reset()
+        argv = ["build.py", "--out-dir", str(out), "--diff-dir", str(work / "diff"),
+                "--metrics-out", str(work / "build-metrics.json")]
+        with contextlib.redirect_stdout(io.StringIO()), _argv(argv):
+            build.main()
+
+    results["build_main"] = _time(full_build, max(1, args.repeat // 2))
+    results["build_main"]["stations"] = len(ids)
+
+    if args.with_server:
+        print("  fetch_http")
+        results["fetch_http"] = _bench_http(args, ids, sample)
+    return results
+
+
+def _bench_http(args: argparse.Namespace, ids: list[str], sample: list[str]) -> dict[str, Any]:
+    opts = frost_server.default_options(stations=len(ids), seed=args.seed, hourly_every=args.hourly_every,
+                                        latency_ms=args.server_latency_ms)
+    server, standin, base = frost_server.serve_in_thread(opts)
+    os.environ.setdefault("FROST_CLIENT_ID", "bench")
+    saved = frost_api.BASE, frost_api.CACHE_ONLY, frost_api.MIN_INTERVAL_S
+    frost_api.BASE, frost_api.CACHE_ONLY, frost_api.MIN_INTERVAL_S = base, False, 0.0
+    params = {
+        "elements": "min(air_temperature P1D),mean(air_temperature P1D)",
+        "referencetime": f"{frost.NORMAL_START}/{frost.NORMAL_END}",
+    }
+    try:
+        r = _time(lambda: [frost_api.get("/observations/v0.jsonld", {"sources": s, **params}) for s in sample],
+                  args.repeat)
+    finally:
+        frost_api.BASE, frost_api.CACHE_ONLY, frost_api.MIN_INTERVAL_S = saved
+        server.shutdown()
+    r.update(requests=len(sample), latencyMs=args.server_latency_ms,
+             requestsPerS=round(len(sample) / r["medianS"], 2) if r["medianS"] else None)
+    return r
+
+
+@contextlib.contextmanager
+def _argv(argv: list[str]):
+    saved = sys.argv
+    sys.argv = argv
+    try:
+        yield
+    finally:
+        sys.argv = saved
+
+
+def _compare(current: dict[str, Any], previous_path: Path) -> None:
+    prev = json.loads(previous_path.read_text())
+    print(f"\nvs {previous_path.name} (commit {prev.get('commit')}):")
+    for name, r in current["results"].items():
+        p = prev.get("results", {}).get(name)
+        if not p:
+            print(f"  {name:16s} {r['medianS']:10.4f}s   (new)")
+            continue
+        ratio = r["medianS"] / p["medianS"] if p["medianS"] else float("inf")
+        flag = "  ! slower" if ratio > 1.10 else ""
+        print(f"  {name:16s} {r['medianS']:10.4f}s  was {p['medianS']:10.4f}s  x{ratio:5.2f}{flag}")
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--quick", action="store_true", help="Small sizes for a fast smoke run")
+    p.add_argument("--repeat", type=int, default=5, help="Timed repeats per benchmark (default: %(default)s)")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--build-stations", type=int, default=40,
+                   help="Stations in the synthetic cache / full build (default: %(default)s)")
+    p.add_argument("--hourly-every", type=int, default=10,
+                   help="Every Nth station is mean-only (sub-daily fallback); 0 = none (default: %(default)s)")
+    p.add_argument("--interval-min", type=int, default=60,
+                   help="Sub-daily cadence in minutes; 10 = real Frost cadence (default: %(default)s)")
+    p.add_argument("--sample", type=int, default=10,
+                   help="Stations timed in fetch_daily / compute_normal (default: %(default)s)")
+    p.add_argument("--nearest-stations", type=int, default=600)
+    p.add_argument("--postnumre", type=int, default=5000)
+    p.add_argument("--with-server", action="store_true",
+                   help="Also benchmark uncached fetches over HTTP against the local Frost stand-in")
+    p.add_argument("--server-latency-ms", type=float, default=0.0,
+                   help="Latency the stand-in adds per request in --with-server (default: %(default)s)")
+    p.add_argument("--out", type=Path, default=None, help=f"Result file (default: {DEFAULT_OUT_DIR}/<commit>-<time>.json)")
+    p.add_argument("--compare", type=Path, default=None, help="Earlier result file to compare against")
+    p.add_argument("--keep-fixtures", type=Path, default=None, help="Write fixtures here and keep them")
+    args = p.parse_args()
+    if args.quick:
+        args.repeat, args.build_stations, args.sample = 2, 6, 3
+        args.nearest_stations, args.postnumre, args.hourly_every = 100, 500, 3
+
+    if args.keep_fixtures:
+        results = run(args, args.keep_fixtures)
+    else:
+        with tempfile.TemporaryDirectory(prefix="climate-bench-") as tmp:
+            results = run(args, Path(tmp))
+
+    commit = _git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "params": {k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items()
+                   if k not in ("out", "compare", "keep_fixtures")},
+        "results": results,
+    }
+    out = args.out or DEFAULT_OUT_DIR / f"{commit or 'nogit'}-{dt.datetime.now():%Y%m%d-%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2) + "\n")
+
+    print()
+    for name, r in results.items():
+        print(f"  {name:16s} median {r['medianS']:.4f}s  min {r['minS']:.4f}s")
+    print(f"-> {out}")
+    if args.compare:
+        _compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
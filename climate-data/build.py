@@ -1,12 +1,14 @@
-"""Entry point — runs the three builders and writes JSON assets."""
+"""Entry point — runs the builders and writes JSON assets."""
 
 import argparse
 import json
 from pathlib import Path
 
-from climate_data import frost, postnummer, stations
+from climate_data import climatology, diff, elements, frost, frost_api, geocode, lookup, metrics, postnummer, profiling, stations
 
 DEFAULT_OUT = Path(__file__).parent.parent / "mvp-mygarden" / "src" / "data"
+DEFAULT_DIFF_DIR = Path(__file__).parent / "data" / "out" / "diff"
+DEFAULT_METRICS_OUT = Path(__file__).parent / "data" / "out" / "build-metrics.json"
 
 
 def main() -> None:
@@ -28,40 +30,164 @@ def main() -> None:
         action="store_true",
         help="Fetch per-postnummer elevation from open-meteo (slow, rate-limited)",
     )
+    p.add_argument(
+        "--frost-base",
+        default=None,
+        help=f"Frost API base URL, e.g. a local climate_data.frost_server (default: {frost_api.BASE})",
+    )
+    p.add_argument(
+        "--elements",
+        type=lambda v: [e for e in v.split(",") if e],
+        default=[],
+        help=f"Also derive element-normals.json for these elements (comma-separated: {','.join(elements.ELEMENTS)})",
+    )
+    p.add_argument(
+        "--climatology",
+        action="store_true",
+        help="Also write daily-climatology.json: smoothed 366-day median Tmin/Tmean per station",
+    )
+    p.add_argument(
+        "--reverse-geocoder",
+        action="store_true",
+        help="Also write postnummer-grid.json: grid index for coordinates -> nearest postnummer",
+    )
     p.add_argument(
         "--max-stations",
         type=int,
         default=None,
         help="Limit the number of stations processed (useful for quick test runs)",
     )
+    p.add_argument(
+        "--diff-dir",
+        type=Path,
+        default=DEFAULT_DIFF_DIR,
+        help=f"Where to write the diff report against the previous build (default: {DEFAULT_DIFF_DIR})",
+    )
+    p.add_argument(
+        "--patch",
+        action="store_true",
+        help="Also write a compact <asset>.patch.json per changed asset into --diff-dir",
+    )
+    p.add_argument(
+        "--drift-tolerance",
+        type=float,
+        default=diff.DEFAULT_TOLERANCE,
+        help="Flag numeric field changes larger than this as drift (default: %(default)s)",
+    )
+    p.add_argument(
+        "--metrics-out",
+        type=Path,
+        default=DEFAULT_METRICS_OUT,
+        help=f"Where to write the JSON run report (default: {DEFAULT_METRICS_OUT})",
+    )
+    p.add_argument(
+        "--progress",
+        action="store_true",
+        help="Show a live progress line with rate + ETA instead of one line per station",
+    )
+    profiling.add_arguments(p)
     args = p.parse_args()
+    # Before any fetching: a typo shouldn't cost the whole frost pass
+    unknown = [e for e in args.elements if e not in elements.ELEMENTS]
+    if unknown:
+        p.error(f"unknown element(s): {unknown}")
+    profiling.configure(args)
+    if args.frost_base:
+        frost_api.BASE = args.frost_base.rstrip("/")
 
     args.out_dir.mkdir(parents=True, exist_ok=True)
+    diffs: dict[str, diff.AssetDiff] = {}
 
     print("stations (candidates):")
-    candidates = stations.build()
+    with metrics.stage("stations"):
+        candidates = stations.build()
     print(f"  candidates: {len(candidates)}")
 
     print("frost normals:")
-    fn_list = frost.build(candidates, source=args.source, max_stations=args.max_stations)
+    # The daily climatology comes off the same per-station daily data as the normals
+    clim_list: list[climatology.DailyClimatology] = []
+    with metrics.stage("frost_normals"):
+        fn_list = frost.build(candidates, source=args.source, max_stations=args.max_stations,
+                              progress=args.progress,
+                              on_yearly=climatology.collector(clim_list) if args.climatology else None)
     print(f"  derived: {len(fn_list)} / {len(candidates) if args.max_stations is None else args.max_stations}")
 
     keep_ids = {n["key"] for n in fn_list}
     final_stations = [s for s in candidates if s["id"] in keep_ids]
 
-    _write(args.out_dir / "stations.json", final_stations)
-    _write(args.out_dir / "frost-normals.json", fn_list)
+    _write(args.out_dir / "stations.json", final_stations, args, diffs)
+    _write(args.out_dir / "frost-normals.json", fn_list, args, diffs)
 
-    print("postnummer:")
-    pn_list = postnummer.build(final_stations, with_elevation=args.with_elevation)
-    _write(args.out_dir / "postnummer.json", pn_list)
-
-    print(f"Done — wrote 3 files to {args.out_dir}/")
+    if args.elements:
+        print(f"element normals ({', '.join(args.elements)}):")
+        with metrics.stage("element_normals"):
+            el_list = elements.build(final_stations, args.elements)
+        _write(args.out_dir / "element-normals.json", el_list, args, diffs)
 
+    if args.climatology:
+        print("daily climatology:")
+        print(f"  daily climatology: {len(clim_list)} / {len(fn_list)} stations")
+        _write(args.out_dir / "daily-climatology.json", clim_list, args, diffs)
 
-def _write(path: Path, data: list[dict]) -> None:
-    path.write_text(json.dumps(data, ensure_ascii=False, indent=2) + "\n")
+    print("postnummer:")
+    with metrics.stage("postnummer"), profiling.memory("postnummer.build"):
+        pn_list = postnummer.build(final_stations, with_elevation=args.with_elevation)
+    _write(args.out_dir / "postnummer.json", pn_list, args, diffs)
+    if args.reverse_geocoder:
+        with metrics.stage("reverse_geocoder"):
+            grid = geocode.PostnummerGrid.from_entries(pn_list)
+            # Derived entirely from postnummer.json (diffed above), so not diffed itself.
+            (args.out_dir / "postnummer-grid.json").write_text(json.dumps(grid.to_asset()) + "\n")
+        print(f"  -> postnummer-grid.json: {grid.rows}x{grid.cols} cells")
+
+    print("climate lookup:")
+    with metrics.stage("lookup"):
+        lookup_table = lookup.build(pn_list, final_stations, fn_list)
+    _write(args.out_dir / "climate-lookup.json", lookup_table, args, diffs)
+
+    _write_diff_report(args, diffs)
+    metrics.write(args.metrics_out)
+    profiling.finish()
+    n_files = 4 + bool(args.elements) + args.climatology + args.reverse_geocoder
+    print(f"Done — wrote {n_files} files to {args.out_dir}/ (run report: {args.metrics_out})")
+
+
+def _write(
+    path: Path,
+    data: list[dict] | dict[str, dict],
+    args: argparse.Namespace,
+    diffs: dict[str, diff.AssetDiff],
+) -> None:
+    with metrics.stage("write"):
+        previous = diff.load_previous(path)
+        path.write_text(json.dumps(data, ensure_ascii=False, indent=2) + "\n")
     print(f"  -> {path.name}: {len(data)} entries")
+    if previous is None:
+        return
+    new = diff.index(data, diff.KEY_FIELDS.get(path.name))
+    d = diff.diff_assets(previous, new, tolerance=args.drift_tolerance)
+    diffs[path.name] = d
+    if args.patch and (d["added"] or d["removed"] or d["changed"]):
+        args.diff_dir.mkdir(parents=True, exist_ok=True)
+        patch_path = args.diff_dir / f"{path.stem}.patch.json"
+        patch_path.write_text(json.dumps(diff.to_patch(d, new), ensure_ascii=False, separators=(",", ":")) + "\n")
+
+
+def _write_diff_report(args: argparse.Namespace, diffs: dict[str, diff.AssetDiff]) -> None:
+    if not diffs:
+        return
+    print("diff vs previous build:")
+    for name, d in diffs.items():
+        print(diff.summary(name, d))
+        for line in d["drift"][:20]:
+            print(f"    ! {line}")
+        if len(d["drift"]) > 20:
+            print(f"    ! … {len(d['drift']) - 20} more")
+    args.diff_dir.mkdir(parents=True, exist_ok=True)
+    report = args.diff_dir / "build-diff.json"
+    report.write_text(json.dumps(
+        {"driftTolerance": args.drift_tolerance, "assets": diffs}, ensure_ascii=False, indent=2) + "\n")
+    print(f"  -> {report}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,43 @@
+"""Compile the app's companion lists into companion-matrix.json.
+
+Reads Spirr/src/data/plants.json, folds every plant's companionsGood /
+companionsBad into a dense int8 matrix plus per-plant beneficial/antagonistic
+bitsets (`climate_data/companions.py`, format in its docstring) and writes
+them next to plants.json. Offline and deterministic; re-run whenever the
+companion lists in plants.json change.
+
+Run:  python3 build_companions.py [--plants PATH] [--out PATH]
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from climate_data import companions
+
+APP_DATA = Path(__file__).parent.parent / "Spirr" / "src" / "data"
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--plants", type=Path, default=APP_DATA / "plants.json", help="plants.json to read")
+    p.add_argument("--out", type=Path, default=APP_DATA / "companion-matrix.json", help="Asset to write")
+    args = p.parse_args()
+
+    started = time.perf_counter()
+    plants = json.loads(args.plants.read_text())
+    keys, matrix, unknown = companions.compile_matrix(plants)
+    for plant, partner in unknown:
+        print(f"  unknown companion key {partner!r} listed by {plant!r} (skipped)")
+
+    args.out.write_text(json.dumps(companions.to_asset(keys, matrix), ensure_ascii=False) + "\n")
+    pairs = len(keys) * (len(keys) - 1) // 2
+    good = int((matrix == companions.BENEFICIAL).sum()) // 2
+    bad = int((matrix == companions.UNFAVORABLE).sum()) // 2
+    print(f"Wrote {args.out} — {len(keys)} plants, {good} beneficial and {bad} unfavorable of {pairs} pairs, "
+          f"{args.out.stat().st_size} bytes, {(time.perf_counter() - started) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
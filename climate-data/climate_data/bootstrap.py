@@ -0,0 +1,53 @@
+"""Batched bootstrap intervals for per-station medians.
+
+Input is a (stations × years) array of per-year values, NaN where a year doesn't
+contribute (see `frost.stack_yearly`). Each replicate resamples a station's own
+non-NaN years with replacement and takes the median. All stations are resampled
+at once, a chunk of replicates at a time, as one (stations × replicates × years)
+gather and sort.
+
+Every replicate draws one row of uniforms shared by all stations. Each station
+scales those uniforms by its own year count. So a station's interval depends
+only on its own data and the seed, never on which other stations are in the
+batch. Patching a single station therefore reproduces its value from a full build.
+"""
+
+import numpy as np
+
+DEFAULT_REPLICATES = 2000
+DEFAULT_SEED = 1991
+DEFAULT_LEVEL = 90.0
+# Replicates per chunk; bounds the (S, chunk, Y) temporaries to a few tens of MB for ~600 stations.
+CHUNK = 200
+
+
+def median_replicates(values: np.ndarray, replicates: int = DEFAULT_REPLICATES,
+                      seed: int = DEFAULT_SEED) -> np.ndarray:
+    """(S, Y) per-year values → (S, replicates) bootstrap medians; NaN rows for stations without data."""
+    s_count, width = values.shape
+    v = np.sort(values, axis=1)                   # NaN sorts last: a row's n values are a prefix
+    n = (~np.isnan(v)).sum(axis=1)                # (S,)
+    lo = ((np.maximum(n, 1) - 1) // 2)[:, None, None]
+    hi = (np.maximum(n, 1) // 2)[:, None, None]
+    in_sample = np.arange(width)[None, None, :] < n[:, None, None]
+    rng = np.random.default_rng(seed)
+    out = np.empty((s_count, replicates))
+    for start in range(0, replicates, CHUNK):
+        b = min(CHUNK, replicates - start)
+        u = rng.random((b, width))                 # shared draws; station s uses the first n[s] per row
+        idx = (u[None, :, :] * n[:, None, None]).astype(np.intp)
+        sample = np.take_along_axis(v[:, None, :], idx, axis=2)
+        sample = np.where(in_sample, sample, np.inf)
+        sample.sort(axis=2)
+        mid = np.take_along_axis(sample, lo, axis=2) + np.take_along_axis(sample, hi, axis=2)
+        out[:, start:start + b] = mid[:, :, 0] / 2
+    out[n == 0] = np.nan
+    return out
+
+
+def median_intervals(values: np.ndarray, replicates: int = DEFAULT_REPLICATES,
+                     seed: int = DEFAULT_SEED, level: float = DEFAULT_LEVEL) -> np.ndarray:
+    """(S, Y) → (S, 2) percentile-bootstrap interval [lo, hi] of each row's median."""
+    meds = median_replicates(values, replicates, seed)
+    tail = (100.0 - level) / 2
+    return np.percentile(meds, [tail, 100.0 - tail], axis=1).T
@@ -0,0 +1,89 @@
+"""Per-station daily climatology: smoothed daily-median Tmin / Tmean for DOY 1..366.
+
+The FrostNormal curves only have 13 month-end checkpoints, so the app interpolates
+between them. Here each station gets the median across its valid years
+(>= MIN_DAYS_PER_YEAR days) of every day's Tmin and Tmean. That comes straight
+off the columnar years × 366 grid. A centred SMOOTH_DAYS running mean that wraps
+around the year end then removes day-to-day sampling noise. Values are stored as
+int16 tenths of a degree, base64-packed (`columnar.pack_i16`): 366 values in
+~980 chars per series.
+
+With a daily Tmean the GDD between any two days is exact, for any base:
+`gdd_between` sums max(0, Tmean - base) over the DOY range, and in the app that is
+a prefix sum over the decoded array.
+"""
+
+from collections.abc import Callable
+from typing import TypedDict
+
+import numpy as np
+
+from climate_data import columnar, frost, metrics
+
+SMOOTH_DAYS = 15
+FIELDS = ("tmin", "tmean")
+
+
+class DailyClimatology(TypedDict):
+    key: str
+    years: int
+    # 366 int16 tenths of °C (index = DOY - 1), little-endian, base64. Index 365 (31 Dec in a
+    # leap year) comes from leap years only.
+    tmin: str
+    tmean: str
+
+
+def daily_medians(grid: columnar.StationGrid) -> dict[str, np.ndarray]:
+    """Field -> (366,) median per DOY across the grid's valid years, smoothed; NaN if never observed."""
+    valid = columnar.valid_years(grid, frost.MIN_DAYS_PER_YEAR)
+    out: dict[str, np.ndarray] = {}
+    for f in FIELDS:
+        v = grid["values"][f][valid]
+        observed = (~np.isnan(v)).any(axis=0)
+        med = np.full(columnar.N_DOY, np.nan)
+        med[observed] = np.nanmedian(v[:, observed], axis=0)
+        out[f] = columnar.circular_smooth(med, SMOOTH_DAYS)
+    return out
+
+
+def compute(key: str, yearly: frost.Yearly) -> DailyClimatology | None:
+    grid = columnar.from_yearly(yearly, FIELDS)
+    years = int(columnar.valid_years(grid, frost.MIN_DAYS_PER_YEAR).sum())
+    if years < frost.MIN_YEARS_WITH_FROST:
+        return None
+    med = daily_medians(grid)
+    if any(np.isnan(med[f]).any() for f in FIELDS):
+        return None
+    return {"key": key, "years": years, **{f: columnar.pack_i16(med[f] * 10) for f in FIELDS}}
+
+
+def decode(packed: str) -> np.ndarray:
+    """Packed series -> (366,) float °C."""
+    return columnar.unpack_i16(packed) / 10.0
+
+
+def gdd_between(tmean_c: np.ndarray, base: float, start_doy: int, end_doy: int) -> float:
+    """GDD (base `base`) accumulated from `start_doy` through `end_doy` inclusive (1-based), wrapping
+    over the year end when end < start. The sum runs over a non-leap year, which skips index 365:
+    DOY 366 (31 Dec in a leap year) counts as DOY 365, as in the lookup server."""
+    if not (1 <= start_doy <= columnar.N_DOY and 1 <= end_doy <= columnar.N_DOY):
+        raise ValueError(f"DOY out of range 1..{columnar.N_DOY}: {start_doy}, {end_doy}")
+    start_doy, end_doy = min(start_doy, 365), min(end_doy, 365)
+    daily = np.maximum(tmean_c[:365] - base, 0.0)
+    prefix = np.concatenate([[0.0], np.cumsum(daily)])
+    if end_doy >= start_doy:
+        return float(prefix[end_doy] - prefix[start_doy - 1])
+    return float(prefix[365] - prefix[start_doy - 1] + prefix[end_doy])
+
+
+def collector(out: list[DailyClimatology]) -> Callable[[str, frost.Yearly], None]:
+    """`frost.build` on_yearly hook: appends each derived station's climatology to `out`, from the
+    daily data the normal was just computed from (no second read of the observations)."""
+    def add(key: str, yearly: frost.Yearly) -> None:
+        with metrics.timed("climatology.station_s"):
+            rec = compute(key, yearly)
+        if rec is None:
+            metrics.count("climatology.stations_skipped")
+            return
+        out.append(rec)
+    return add
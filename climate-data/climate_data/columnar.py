@@ -0,0 +1,200 @@
+"""Columnar year × day-of-year store for one station's daily observations.
+
+`frost.py` keeps observations as nested dicts ({year: {doy: {tmin, tmean}}}),
+which is fine for three scalar normals but means every new statistic is another
+Python loop over ~12k days. Here each daily field is a float array of shape
+(n_years, 366) with NaN for "no value", plus a `present` mask of days that had
+any record at all (the MIN_DAYS_PER_YEAR gate counts those). Extractors then
+operate on whole arrays at once: per-year events are reductions along axis 1,
+normals are NaN-aware medians along axis 0.
+
+DOY columns are 0-based (column 0 = 1 January); column 365 only exists in leap
+years and is always NaN otherwise.
+"""
+
+import base64
+import datetime as dt
+from collections.abc import Iterable, Mapping
+from typing import Any, Literal, TypedDict
+
+import numpy as np
+
+N_DOY = 366
+Reducer = Literal["mean", "min", "max", "sum", "last"]
+
+
+class StationGrid(TypedDict):
+    years: np.ndarray           # (Y,) int
+    present: np.ndarray         # (Y, 366) bool — a record existed for that day
+    values: dict[str, np.ndarray]  # field -> (Y, 366) float64, NaN = missing
+
+
+class FieldSpec(TypedDict):
+    field: str
+    reducer: Reducer
+    # Only observations at this level value (e.g. soil depth in cm) are kept; None = any.
+    level: float | None
+
+
+def empty(years: Iterable[int], fields: Iterable[str]) -> StationGrid:
+    ys = np.asarray(sorted(set(years)), dtype=np.int32)
+    shape = (len(ys), N_DOY)
+    return {
+        "years": ys,
+        "present": np.zeros(shape, dtype=bool),
+        "values": {f: np.full(shape, np.nan) for f in fields},
+    }
+
+
+def from_yearly(yearly: Mapping[int, Mapping[int, Mapping[str, float]]],
+                fields: Iterable[str] = ("tmin", "tmean")) -> StationGrid:
+    """Adapter from frost.py's nested-dict store, so temperature normals share the array path."""
+    fields = list(fields)
+    grid = empty(yearly.keys(), fields)
+    row = {int(y): i for i, y in enumerate(grid["years"])}
+    for year, days in yearly.items():
+        i = row[year]
+        for doy, v in days.items():
+            grid["present"][i, doy - 1] = True
+            for f in fields:
+                if f in v:
+                    grid["values"][f][i, doy - 1] = v[f]
+    return grid
+
+
+def from_observations(records: Iterable[Mapping[str, Any]], specs: Mapping[str, FieldSpec],
+                      years: Iterable[int]) -> StationGrid:
+    """Single pass over Frost /observations records into one grid, every requested element at
+    once. `specs` is keyed by Frost elementId; several observations of the same element on one
+    day (sub-daily readings, several sensors) are combined with the spec's reducer."""
+    fields = [s["field"] for s in specs.values()]
+    grid = empty(years, fields)
+    row = {int(y): i for i, y in enumerate(grid["years"])}
+    n = len(grid["years"])
+    sums = {f: np.zeros((n, N_DOY)) for f in fields}
+    counts = {f: np.zeros((n, N_DOY), dtype=np.int32) for f in fields}
+    for rec in records:
+        rt = rec.get("referenceTime", "")
+        try:
+            d = dt.date.fromisoformat(rt[:10])
+        except ValueError:
+            continue
+        i = row.get(d.year)
+        if i is None:
+            continue
+        j = d.timetuple().tm_yday - 1
+        grid["present"][i, j] = True
+        for obs in rec.get("observations", []):
+            spec = specs.get(obs.get("elementId", ""))
+            val = obs.get("value")
+            if spec is None or val is None:
+                continue
+            if spec["level"] is not None and (obs.get("level") or {}).get("value") != spec["level"]:
+                continue
+            f, val = spec["field"], float(val)
+            cur = grid["values"][f][i, j]
+            r = spec["reducer"]
+            if r == "min":
+                grid["values"][f][i, j] = val if np.isnan(cur) else min(cur, val)
+            elif r == "max":
+                grid["values"][f][i, j] = val if np.isnan(cur) else max(cur, val)
+            elif r == "last":
+                grid["values"][f][i, j] = val
+            else:  # mean / sum
+                sums[f][i, j] += val
+                counts[f][i, j] += 1
+    for spec in specs.values():
+        f = spec["field"]
+        has = counts[f] > 0
+        if spec["reducer"] == "sum":
+            grid["values"][f][has] = sums[f][has]
+        elif spec["reducer"] == "mean":
+            grid["values"][f][has] = sums[f][has] / counts[f][has]
+    return grid
+
+
+def _doy_cols() -> np.ndarray:
+    return np.arange(1, N_DOY + 1)
+
+
+def last_doy_where(mask: np.ndarray, through_doy: int) -> np.ndarray:
+    """Per row, the last 1-based DOY <= `through_doy` where `mask` holds; NaN if none."""
+    m = mask & (_doy_cols() <= through_doy)[None, :]
+    idx = N_DOY - 1 - np.argmax(m[:, ::-1], axis=1)
+    return np.where(m.any(axis=1), idx + 1, np.nan)
+
+
+def first_doy_where(mask: np.ndarray, from_doy: int = 1) -> np.ndarray:
+    """Per row, the first 1-based DOY >= `from_doy` where `mask` holds; NaN if none."""
+    m = mask & (_doy_cols() >= from_doy)[None, :]
+    return np.where(m.any(axis=1), np.argmax(m, axis=1) + 1, np.nan)
+
+
+def valid_years(grid: StationGrid, min_days: int) -> np.ndarray:
+    """(Y,) bool: years with at least `min_days` days on record (frost.MIN_DAYS_PER_YEAR)."""
+    return grid["present"].sum(axis=1) >= min_days
+
+
+def month_of_doy(years: np.ndarray) -> np.ndarray:
+    """(Y, 366) int month (1-12) per DOY column; 0 for column 365 in non-leap years."""
+    common = np.repeat(np.arange(1, 13), [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+    leap = np.repeat(np.arange(1, 13), [31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+    common = np.append(common, 0)
+    is_leap = (years % 4 == 0) & ((years % 100 != 0) | (years % 400 == 0))
+    return np.where(is_leap[:, None], leap[None, :], common[None, :])
+
+
+def monthly_cumulative(daily: np.ndarray, months: np.ndarray) -> np.ndarray:
+    """(Y, 366) daily contributions (NaN = 0) → (Y, 13) cumulative month-end checkpoints,
+    index 0 = 0, index 12 = annual total — the layout of FrostNormal.gddCurve5.
+
+    Each month is summed sequentially in DOY order (cumsum, not numpy's pairwise sum), then
+    the months are accumulated in order, so results round the same way as a plain running
+    sum. This is the one implementation behind both the normals and `frost.per_year_stats`."""
+    contrib = np.nan_to_num(daily, nan=0.0)
+    per_month = np.zeros((daily.shape[0], 13))
+    for m in range(1, 13):
+        per_month[:, m] = np.cumsum(np.where(months == m, contrib, 0.0), axis=1)[:, -1]
+    return np.cumsum(per_month, axis=1)
+
+
+def percentiles_int(values: np.ndarray, qs: Iterable[float], axis: int = 0) -> np.ndarray:
+    """NaN-ignoring linear-interpolated percentiles, rounded half to even (p50 == median_int)."""
+    return np.round(np.nanpercentile(values, list(qs), axis=axis)).astype(np.int64)
+
+
+def pack_u8(values: np.ndarray) -> str:
+    """Base64 of values clipped to 0..255 as uint8 — ~1.3 chars per value in the JSON asset.
+    Decode in the app with `Uint8Array.from(atob(s), c => c.charCodeAt(0))`."""
+    return base64.b64encode(np.clip(np.rint(values), 0, 255).astype(np.uint8).tobytes()).decode("ascii")
+
+
+def pack_i16(values: np.ndarray) -> str:
+    """Base64 of values rounded to little-endian int16 — for signed series such as temperatures
+    in tenths of a degree. Decode with `new Int16Array(Uint8Array.from(atob(s), c => c.charCodeAt(0)).buffer)`."""
+    return base64.b64encode(np.clip(np.rint(values), -32768, 32767).astype("<i2").tobytes()).decode("ascii")
+
+
+def unpack_i16(packed: str) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(packed), dtype="<i2").astype(np.int64)
+
+
+def circular_smooth(values: np.ndarray, window: int) -> np.ndarray:
+    """Centred `window`-day (odd) running mean along the last axis, wrapping Dec → Jan. NaNs are
+    skipped; a day stays NaN only if its whole window is empty."""
+    half = window // 2
+    padded = np.concatenate([values[..., -half:], values, values[..., :half]], axis=-1)
+    ok = ~np.isnan(padded)
+    cs = np.cumsum(np.where(ok, padded, 0.0), axis=-1)
+    cn = np.cumsum(ok, axis=-1)
+    zero = np.zeros((*values.shape[:-1], 1))
+    cs, cn = np.concatenate([zero, cs], axis=-1), np.concatenate([zero, cn], axis=-1)
+    s = cs[..., window:] - cs[..., :-window]
+    n = cn[..., window:] - cn[..., :-window]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(n > 0, s / n, np.nan)
+
+
+def median_int(values: np.ndarray, axis: int = 0) -> np.ndarray:
+    """NaN-ignoring median rounded like `int(round(statistics.median(...)))` (half to even)."""
+    return np.round(np.nanmedian(values, axis=axis)).astype(np.int64)
@@ -0,0 +1,99 @@
+"""Companion compatibility matrix compiled from the app's plants.json.
+
+Each bundled plant lists `companionsGood` / `companionsBad` as other plant
+keys. The app checks those lists in both directions for every pair of
+neighbours. That is O(n²) list scans to score a bed of n plants. This stage
+folds the lists into a dense plant × plant int8 matrix once, at build time:
+
+  - a pair is BENEFICIAL or UNFAVORABLE if either plant lists the other
+  - UNFAVORABLE wins when a pair is listed both ways, as in `companionHints`
+  - the diagonal is NEUTRAL (a plant beside itself is not a pairing)
+
+Plants are indexed by their position in plants.json.
+
+`to_asset()` is the compact form shipped as companion-matrix.json:
+
+  { keys:         plant keys, index order
+    matrix:       base64 int8, len(keys)² row-major: 1 beneficial, 0 neutral, -1 unfavorable
+    rowBytes:     ceil(len(keys) / 8)
+    beneficial:   base64 uint8 bitsets, one row of rowBytes per plant. Partner j of plant i
+    antagonistic: is bit (j & 7) of byte i * rowBytes + (j >> 3). }
+
+A bed's score is the sum of the matrix over its distinct pairs (`bed_score`).
+The bitsets answer "which partners are good/bad for this plant" with one AND
+against the bed's membership mask.
+"""
+
+import base64
+from typing import TypedDict
+
+import numpy as np
+
+BENEFICIAL = 1
+NEUTRAL = 0
+UNFAVORABLE = -1
+
+
+class CompanionAsset(TypedDict):
+    keys: list[str]
+    matrix: str
+    rowBytes: int
+    beneficial: str
+    antagonistic: str
+
+
+def _b64(a: np.ndarray) -> str:
+    return base64.b64encode(a.tobytes()).decode("ascii")
+
+
+def compile_matrix(plants: list[dict]) -> tuple[list[str], np.ndarray, list[tuple[str, str]]]:
+    """(keys, int8 matrix, unknown (plant, partner) references) from plants.json entries."""
+    keys = [p["key"] for p in plants]
+    index = {k: i for i, k in enumerate(keys)}
+    n = len(keys)
+    good = np.zeros((n, n), dtype=bool)
+    bad = np.zeros((n, n), dtype=bool)
+    unknown: list[tuple[str, str]] = []
+    for i, plant in enumerate(plants):
+        for field, mask in (("companionsGood", good), ("companionsBad", bad)):
+            for partner in plant.get(field) or []:
+                j = index.get(partner)
+                if j is None:
+                    unknown.append((plant["key"], partner))
+                else:
+                    mask[i, j] = True
+    good |= good.T
+    bad |= bad.T
+    matrix = np.where(bad, UNFAVORABLE, np.where(good, BENEFICIAL, NEUTRAL)).astype(np.int8)
+    np.fill_diagonal(matrix, NEUTRAL)
+    return keys, matrix, unknown
+
+
+def bitsets(mask: np.ndarray) -> np.ndarray:
+    """Pack each row of a boolean matrix into little-endian bit order bytes."""
+    return np.packbits(mask, axis=1, bitorder="little")
+
+
+def to_asset(keys: list[str], matrix: np.ndarray) -> CompanionAsset:
+    if matrix.shape != (len(keys), len(keys)):
+        raise ValueError(f"matrix shape {matrix.shape} does not match {len(keys)} keys")
+    return {
+        "keys": keys,
+        "matrix": _b64(matrix.astype(np.int8)),
+        "rowBytes": (len(keys) + 7) // 8,
+        "beneficial": _b64(bitsets(matrix == BENEFICIAL)),
+        "antagonistic": _b64(bitsets(matrix == UNFAVORABLE)),
+    }
+
+
+def from_asset(asset: CompanionAsset) -> tuple[list[str], np.ndarray]:
+    n = len(asset["keys"])
+    matrix = np.frombuffer(base64.b64decode(asset["matrix"]), dtype=np.int8).reshape(n, n)
+    return asset["keys"], matrix
+
+
+def bed_score(matrix: np.ndarray, members: np.ndarray) -> int:
+    """Sum of the relationships over every distinct pair of plant indices in a bed."""
+    members = np.unique(members)
+    sub = matrix[np.ix_(members, members)]
+    return int(sub[np.triu_indices(len(members), k=1)].sum())
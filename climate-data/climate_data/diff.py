@@ -0,0 +1,129 @@
+"""Per-key diff + compact patch between two builds of a climate asset.
+
+Every asset is a list of records with a unique key field (or, for
+climate-lookup.json, an object already keyed by postnummer). `diff_assets`
+compares the previous build with the new one and reports added / removed keys
+and field-level changes per changed record. Numeric changes larger than the
+tolerance are flagged as drift — the generalization of the gdd5 check the
+one-off add_gdd_curves.py did by hand — so a rebuild that silently moves
+normals is visible before it ships.
+
+`to_patch` reduces a diff to the minimum a client needs to go from the old
+asset to the new one, and `apply_patch` is the reference implementation of
+applying it.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, TypedDict
+
+# Key field per list-shaped asset. Assets not listed here are already keyed objects.
+KEY_FIELDS = {
+    "stations.json": "id",
+    "frost-normals.json": "key",
+    "postnummer.json": "postnummer",
+    "element-normals.json": "key",
+    "daily-climatology.json": "key",
+}
+# Absolute tolerance per numeric value (or per element of a numeric list) before a change
+# counts as drift. 1 matches the gdd5 rounding slack the patch scripts accepted.
+DEFAULT_TOLERANCE = 1.0
+
+
+class FieldChange(TypedDict):
+    old: Any
+    new: Any
+
+
+class AssetDiff(TypedDict):
+    added: list[str]
+    removed: list[str]
+    changed: dict[str, dict[str, FieldChange]]
+    drift: list[str]
+
+
+def index(data: list[dict] | dict[str, dict], key_field: str | None) -> dict[str, dict]:
+    if isinstance(data, dict):
+        return data
+    if key_field is None:
+        raise ValueError("list-shaped asset needs a key field")
+    return {str(r[key_field]): r for r in data}
+
+
+def load_previous(path: Path) -> dict[str, dict] | None:
+    """The asset as it was before this build, indexed by key; None on first build."""
+    if not path.exists():
+        return None
+    try:
+        data = json.loads(path.read_text())
+    except json.JSONDecodeError:
+        return None
+    return index(data, KEY_FIELDS.get(path.name))
+
+
+def numeric_delta(old: Any, new: Any) -> float | None:
+    """Largest absolute numeric difference, or None if the values aren't comparable numbers."""
+    if isinstance(old, bool) or isinstance(new, bool):
+        return None
+    if isinstance(old, (int, float)) and isinstance(new, (int, float)):
+        return abs(new - old)
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        deltas = [numeric_delta(a, b) for a, b in zip(old, new)]
+        if any(d is None for d in deltas):
+            return None
+        return max(deltas, default=0.0)
+    return None
+
+
+def diff_assets(
+    old: dict[str, dict],
+    new: dict[str, dict],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> AssetDiff:
+    added = sorted(k for k in new if k not in old)
+    removed = sorted(k for k in old if k not in new)
+    changed: dict[str, dict[str, FieldChange]] = {}
+    drift: list[str] = []
+    for key in sorted(k for k in new if k in old):
+        a, b = old[key], new[key]
+        if a == b:
+            continue
+        fields: dict[str, FieldChange] = {}
+        for field in sorted(a.keys() | b.keys()):
+            va, vb = a.get(field), b.get(field)
+            if va == vb:
+                continue
+            fields[field] = {"old": va, "new": vb}
+            delta = numeric_delta(va, vb)
+            if delta is not None and delta > tolerance:
+                drift.append(f"{key}: {field} moved by {delta:g} ({va} -> {vb})")
+        changed[key] = fields
+    return {"added": added, "removed": removed, "changed": changed, "drift": drift}
+
+
+def to_patch(diff: AssetDiff, new: dict[str, dict]) -> dict[str, Any]:
+    """Compact patch: full records for added keys, removed keys, and only the new value of each
+    changed field (null for a field that no longer exists)."""
+    return {
+        "added": {k: new[k] for k in diff["added"]},
+        "removed": diff["removed"],
+        "changed": {k: {f: c["new"] for f, c in fields.items()} for k, fields in diff["changed"].items()},
+    }
+
+
+def apply_patch(old: dict[str, dict], patch: dict[str, Any]) -> dict[str, dict]:
+    out = {k: dict(v) for k, v in old.items() if k not in set(patch["removed"])}
+    for key, fields in patch["changed"].items():
+        rec = out.setdefault(key, {})
+        for field, value in fields.items():
+            if value is None:
+                rec.pop(field, None)
+            else:
+                rec[field] = value
+    out.update({k: dict(v) for k, v in patch["added"].items()})
+    return out
+
+
+def summary(name: str, diff: AssetDiff) -> str:
+    return (f"  {name}: +{len(diff['added'])} -{len(diff['removed'])} "
+            f"~{len(diff['changed'])} drift={len(diff['drift'])}")
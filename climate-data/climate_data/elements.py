@@ -0,0 +1,199 @@
+"""Generic element-normal engine: precipitation, snow and soil-temperature normals.
+
+`frost.py` is hard-wired to daily min/mean air temperature. Here each climate
+element is declared once as an `ElementSpec`:
+
+  - `elementId` / `reducer` / `level`: which Frost series to fetch and how several
+    observations of it on one day collapse to a daily value
+  - `events`:  per-year extractors over the (years × 366) array → one value per
+    year (NaN = no event / not applicable); the normal is the median across
+    valid years
+  - `curves`:  per-year 13-checkpoint cumulative curves (same layout as
+    FrostNormal.gddCurve5), median per checkpoint
+
+Every element rides the same fetch (`frost_api.get`, cached per station and
+element), the same single-pass decode into a `columnar.StationGrid`, the same
+MIN_DAYS_PER_YEAR gate and the same vectorized median. Adding a normal means
+adding an extractor, not another loop over the raw observations.
+"""
+
+import re
+from collections.abc import Callable, Iterable
+from typing import TypedDict
+from urllib.error import HTTPError
+
+import numpy as np
+
+from climate_data import columnar, frost, frost_api, metrics
+from climate_data.stations import StationEntry
+
+Extractor = Callable[[np.ndarray, np.ndarray], np.ndarray]  # (values (Y,366), months (Y,366)) -> (Y,) or (Y,13)
+
+SNOW_COVER_CM = 1.0
+WET_DAY_MM = 1.0
+SOIL_THRESHOLDS_C = (6.0, 8.0, 10.0)
+SOIL_RUN_DAYS = 5
+# Like frost's MIN_YEARS_WITH_FROST: fewer usable years than this and the element is omitted.
+MIN_YEARS = frost.MIN_YEARS_WITH_FROST
+
+
+class ElementSpec(TypedDict):
+    name: str
+    elementId: str
+    reducer: columnar.Reducer
+    level: float | None
+    events: dict[str, Extractor]
+    curves: dict[str, Extractor]
+
+
+def running_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing `window`-day mean along DOY; NaN unless every day in the window has a value."""
+    filled = np.nan_to_num(values, nan=0.0)
+    ok = (~np.isnan(values)).astype(np.int32)
+    cs = np.concatenate([np.zeros((values.shape[0], 1)), np.cumsum(filled, axis=1)], axis=1)
+    cn = np.concatenate([np.zeros((values.shape[0], 1), dtype=np.int64), np.cumsum(ok, axis=1)], axis=1)
+    out = np.full(values.shape, np.nan)
+    s = cs[:, window:] - cs[:, :-window]
+    n = cn[:, window:] - cn[:, :-window]
+    out[:, window - 1:] = np.where(n == window, s / window, np.nan)
+    return out
+
+
+def _annual_sum(v: np.ndarray, _m: np.ndarray) -> np.ndarray:
+    return np.nansum(v, axis=1)
+
+
+def _count_days(threshold: float) -> Extractor:
+    return lambda v, _m: (v >= threshold).sum(axis=1).astype(float)
+
+
+def _snow_end(v: np.ndarray, _m: np.ndarray) -> np.ndarray:
+    # Years with data but no spring snow cover count as 0 (snow-free), not as "no event".
+    end = columnar.last_doy_where(v >= SNOW_COVER_CM, frost.SPRING_LAST_DOY)
+    return np.where(np.isnan(end), 0.0, end)
+
+
+def _snow_start(v: np.ndarray, _m: np.ndarray) -> np.ndarray:
+    return columnar.first_doy_where(v >= SNOW_COVER_CM, frost.AUTUMN_FIRST_DOY)
+
+
+def _soil_reaches(threshold: float) -> Extractor:
+    # First spring day the trailing SOIL_RUN_DAYS-day mean reaches the threshold — a sustained
+    # warm-up rather than a single mild day.
+    return lambda v, _m: columnar.first_doy_where(running_mean(v, SOIL_RUN_DAYS) >= threshold, 1)
+
+
+def _cumulative(v: np.ndarray, months: np.ndarray) -> np.ndarray:
+    return columnar.monthly_cumulative(v, months)
+
+
+ELEMENTS: dict[str, ElementSpec] = {
+    "precip": {
+        "name": "precip",
+        "elementId": "sum(precipitation_amount P1D)",
+        "reducer": "mean",
+        "level": None,
+        "events": {"precipAnnualMm": _annual_sum, "wetDays": _count_days(WET_DAY_MM)},
+        "curves": {"precipCurve": _cumulative},
+    },
+    "snow": {
+        "name": "snow",
+        "elementId": "surface_snow_thickness",
+        "reducer": "max",
+        "level": None,
+        "events": {
+            "snowCoverEndDoy": _snow_end,
+            "snowCoverStartDoy": _snow_start,
+            "snowDays": _count_days(SNOW_COVER_CM),
+        },
+        "curves": {},
+    },
+    "soil": {
+        "name": "soil",
+        "elementId": "mean(soil_temperature P1D)",
+        "reducer": "mean",
+        "level": 10.0,  # cm depth — sowing-depth soil temperature
+        "events": {f"soilReaches{int(t)}Doy": _soil_reaches(t) for t in SOIL_THRESHOLDS_C},
+        "curves": {},
+    },
+}
+
+
+def _cache_slug(element_id: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", element_id.lower()).strip("_")
+
+
+def cache_key(station_id: str, element_id: str) -> str:
+    """Frost cache key of one element's observations (also what the frost_server replay reads)."""
+    return f"obs_{station_id}_{_cache_slug(element_id)}_{frost.NORMAL_START[:4]}_{frost.NORMAL_END[:4]}"
+
+
+def _years() -> range:
+    return range(int(frost.NORMAL_START[:4]), int(frost.NORMAL_END[:4]) + 1)
+
+
+def fetch_grid(station_id: str, specs: Iterable[ElementSpec]) -> columnar.StationGrid:
+    """One cached request per element (so adding an element never refetches the others), all
+    decoded into a single grid. Elements the station doesn't report (Frost answers with an HTTP
+    error, usually 404) are logged and stay all-NaN; any other error propagates."""
+    specs = list(specs)
+    grid = columnar.empty(_years(), [s["name"] for s in specs])
+    for spec in specs:
+        try:
+            data = frost_api.get(
+                "/observations/v0.jsonld",
+                {
+                    "sources": station_id,
+                    "elements": spec["elementId"],
+                    "referencetime": f"{frost.NORMAL_START}/{frost.NORMAL_END}",
+                },
+                cache_key=cache_key(station_id, spec["elementId"]),
+            )
+        except HTTPError as ex:
+            metrics.count("elements.http_skips")
+            print(f"    {station_id}: {spec['elementId']} skipped (HTTP {ex.code})")
+            continue
+        one = columnar.from_observations(
+            data.get("data", []),
+            {spec["elementId"]: {"field": spec["name"], "reducer": spec["reducer"], "level": spec["level"]}},
+            _years(),
+        )
+        grid["values"][spec["name"]] = one["values"][spec["name"]]
+    return grid
+
+
+def compute(station_id: str, grid: columnar.StationGrid, specs: Iterable[ElementSpec]) -> dict | None:
+    """Normals for every element with enough valid years; None if no element qualifies."""
+    months = columnar.month_of_doy(grid["years"])
+    out: dict = {"key": station_id}
+    for spec in specs:
+        v = grid["values"][spec["name"]]
+        valid = (~np.isnan(v)).sum(axis=1) >= frost.MIN_DAYS_PER_YEAR
+        n = int(valid.sum())
+        if n < MIN_YEARS:
+            continue
+        vv, mm = v[valid], months[valid]
+        for field, fn in spec["events"].items():
+            per_year = fn(vv, mm)
+            if int((~np.isnan(per_year)).sum()) >= MIN_YEARS:
+                out[field] = int(columnar.median_int(per_year))
+        for field, fn in spec["curves"].items():
+            out[field] = [int(x) for x in columnar.median_int(fn(vv, mm), axis=0)]
+        out[f"{spec['name']}Years"] = n
+    return out if len(out) > 1 else None
+
+
+def build(stations: list[StationEntry], names: Iterable[str]) -> list[dict]:
+    specs = [ELEMENTS[n] for n in names]
+    out: list[dict] = []
+    n = len(stations)
+    for i, s in enumerate(stations, 1):
+        with metrics.timed("elements.station_s"):
+            grid = fetch_grid(s["id"], specs)
+            rec = compute(s["id"], grid, specs)
+        if rec is None:
+            print(f"  [{i}/{n}] {s['id']} {s['name']}: no element normals")
+            continue
+        out.append(rec)
+        print(f"  [{i}/{n}] {s['id']} {s['name']}: {', '.join(k for k in rec if k != 'key')}")
+    return out
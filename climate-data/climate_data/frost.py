@@ -8,12 +8,15 @@ API /observations endpoint, then derive three normals:
 """
 
 import datetime as dt
+import time
 from collections import defaultdict
 from statistics import median
-from typing import Literal, TypedDict
+from typing import Callable, Collection, Literal, TypedDict
 from urllib.error import HTTPError
 
-from climate_data import frost_api
+import numpy as np
+
+from climate_data import bootstrap, columnar, frost_api, metrics, profiling
 from climate_data.stations import StationEntry
 
 Source = Literal["senorge", "frost-api"]
@@ -28,10 +31,10 @@ FROST_THRESHOLD_C = 0.0
 SPRING_LAST_DOY = 213          # July 31
 AUTUMN_FIRST_DOY = 214         # August 1
 MIN_DAYS_PER_YEAR = 300
-# Lowered 15 -> 10 (Tier-2): admits recent, well-sited stations. Stations with fewer than
-# LOW_CONFIDENCE_YEARS contributing years are flagged confidence="low" so the app can warn.
+# Lowered 15 -> 10 (Tier-2): admits recent, well-sited stations. How much less certain a short
+# record is shows up in the bootstrap intervals (CI_FIELDS) rather than a years cut-off.
 MIN_YEARS_WITH_FROST = 10
-LOW_CONFIDENCE_YEARS = 15
+FROST_PERCENTILES = (10, 25, 50, 75, 90)
 
 
 class FrostNormal(TypedDict):
@@ -39,11 +42,14 @@ class FrostNormal(TypedDict):
     lastFrostDoy: int
     firstFrostDoy: int
     gdd5: int
-    # Number of years (1991-2024, >=300 obs days, real growing season) the normal is derived
-    # from, and a coarse confidence: "low" when years < LOW_CONFIDENCE_YEARS (short record →
-    # noisier dates), else "high". The app surfaces "low" as a caution in the location trust line.
+    # Number of years (1991-2024, >=300 obs days, real growing season) the normal is derived from.
     years: int
-    confidence: str
+    # Bootstrap interval [lo, hi] (bootstrap.DEFAULT_LEVEL, i.e. 90%) of each median, from
+    # resampling the contributing years. hi - lo is how far the normal could plausibly move
+    # with a different sample of years. The app warns when the frost-date intervals are wide.
+    lastFrostCi: list[int]
+    firstFrostCi: list[int]
+    gdd5Ci: list[int]
     # Cumulative growing-degree-day curves (median across the normal years): 13 month-boundary
     # checkpoints where index 0 = year start (always 0), index k = cumulative GDD through the end of
     # month k, index 12 = annual total. base 5 for cool crops, base 10 for warm crops. Drives the
@@ -55,49 +61,26 @@ class FrostNormal(TypedDict):
     # below its station is ΔT warmer, worth ~ΔT extra GDD per growing day (Increment I, Layer 0 fix).
     growDays5: list[int]
     growDays10: list[int]
+    # Frost-date distribution across the normal years, FROST_PERCENTILES (10/25/50/75/90) of the
+    # yearly last-spring / first-autumn frost DOY; index 2 == lastFrostDoy / firstFrostDoy.
+    # "90% chance of no frost after day X" is lastFrostPct[4]; "90% chance the first autumn frost
+    # comes after X" is firstFrostPct[0].
+    lastFrostPct: list[int]
+    firstFrostPct: list[int]
+    # Empirical daily frost risk: for each DOY 1..366, % of observed years with Tmin <= 0 that
+    # day, packed as base64 uint8 (columnar.pack_u8) — 366 values in ~490 chars.
+    frostRisk: str
 
 
-def _monthly_cumulative(days: dict[int, dict[str, float]], year: int, base: float) -> list[int]:
-    """Cumulative GDD (base `base`) through the end of each month, as 13 checkpoints
-    (index 0 = 0, index 12 = annual total). Same per-day clipping and present-days-only
-    semantics as the `gdd5` sum, so gddCurve5[12] matches the gdd5 derivation."""
-    monthly = [0.0] * 13  # indices 1..12 used
-    jan1 = dt.date(year, 1, 1)
-    for doy, v in days.items():
-        if "tmean" not in v:
-            continue
-        g = v["tmean"] - base
-        if g <= 0.0:
-            continue
-        month = (jan1 + dt.timedelta(days=doy - 1)).month
-        monthly[month] += g
-    cum = [0] * 13
-    run = 0.0
-    for m in range(1, 13):
-        run += monthly[m]
-        cum[m] = int(round(run))
-    return cum
-
-
-def _monthly_cumulative_growdays(days: dict[int, dict[str, float]], year: int, base: float) -> list[int]:
-    """Cumulative count of growing days (Tmean above `base`) through the end of each month, as 13
-    checkpoints. Mirrors `_monthly_cumulative` but counts qualifying days instead of summing GDD —
-    so the app can credit ~ΔT extra GDD per growing day when lapse-correcting for elevation."""
-    monthly = [0] * 13  # indices 1..12 used
-    jan1 = dt.date(year, 1, 1)
-    for doy, v in days.items():
-        if "tmean" not in v:
-            continue
-        if v["tmean"] - base <= 0.0:
-            continue
-        month = (jan1 + dt.timedelta(days=doy - 1)).month
-        monthly[month] += 1
-    cum = [0] * 13
-    run = 0
-    for m in range(1, 13):
-        run += monthly[m]
-        cum[m] = run
-    return cum
+def _gdd_daily(tmean: np.ndarray, base: float) -> np.ndarray:
+    """Per-day GDD contribution max(0, Tmean - base); missing days (NaN) contribute 0."""
+    return np.where(tmean > base, tmean - base, 0.0)  # NaN compares False
+
+
+def _growday_daily(tmean: np.ndarray, base: float) -> np.ndarray:
+    """1 for a *growing day* (Tmean above `base`), else 0 — so the app can credit ~ΔT extra GDD
+    per growing day when lapse-correcting for elevation."""
+    return (tmean > base).astype(np.float64)
 
 
 Yearly = dict[int, dict[int, dict[str, float]]]
@@ -204,26 +187,143 @@ def _fetch_hourly(station_id: str) -> Yearly:
     return yearly
 
 
-def derive_from_observations(station_id: str) -> FrostNormal | None:
+def derive_from_observations(station_id: str, fields: Collection[str] | None = None) -> FrostNormal | None:
+    return derive_with_yearly(station_id, fields)[0]
+
+
+def derive_with_yearly(station_id: str, fields: Collection[str] | None = None) -> tuple[FrostNormal | None, Yearly]:
+    """Like `derive_from_observations`, but also returns the daily data the normal came from
+    (the hourly-derived data when the fallback was used), for per-year statistics."""
     # Daily-min path (cheap, ~408 stations). Fall back to hourly aggregation for stations
     # that have daily mean / sub-hourly temp but no daily-min series (~188, incl. Kaupanger).
-    normal = _compute_normal(station_id, _fetch_daily(station_id))
+    with metrics.timed("frost.fetch_daily_s"), profiling.memory("_fetch_daily"):
+        yearly = _fetch_daily(station_id)
+    with metrics.timed("frost.compute_normal_s"), profiling.memory("_compute_normal"):
+        normal = _compute_normal(station_id, yearly, fields)
     if normal is not None:
-        return normal
-    return _compute_normal(station_id, _fetch_hourly(station_id))
+        return normal, yearly
+    metrics.count("frost.hourly_fallbacks")
+    with metrics.timed("frost.fetch_hourly_s"), profiling.memory("_fetch_hourly"):
+        yearly = _fetch_hourly(station_id)
+    with metrics.timed("frost.compute_normal_s"), profiling.memory("_compute_normal"):
+        return _compute_normal(station_id, yearly, fields), yearly
+
+
+# The 13-checkpoint curves: per-day contribution from a (Y, 366) Tmean grid, accumulated to month
+# ends by `monthly_curves`. A caller that only needs some fields (patch_fields.py) can skip the
+# rest. Scalars are always derived — the MIN_YEARS_WITH_FROST / gdd gates depend on them.
+CURVE_FIELDS: dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "gddCurve5": lambda tmean: _gdd_daily(tmean, 5.0),
+    "gddCurve10": lambda tmean: _gdd_daily(tmean, 10.0),
+    "growDays5": lambda tmean: _growday_daily(tmean, 5.0),
+    "growDays10": lambda tmean: _growday_daily(tmean, 10.0),
+}
+
+
+def monthly_curves(grid: columnar.StationGrid, fields: Collection[str]) -> dict[str, np.ndarray]:
+    """(Y, 13) rounded cumulative checkpoints (index 0 = 0, index 12 = annual total) of each
+    CURVE_FIELDS field for every grid year, in one `columnar.monthly_cumulative` call per field.
+    The one rounding path behind both `_compute_normal` and `per_year_stats`."""
+    tmean = grid["values"]["tmean"]
+    months = columnar.month_of_doy(grid["years"])
+    return {f: np.round(columnar.monthly_cumulative(CURVE_FIELDS[f](tmean), months)) for f in fields}
+
+
+# Distribution fields come from one array pass over the station's years × DOY grid rather than
+# per-year loops; skipped when a caller (patch_fields.py) asks for other fields only.
+DISTRIBUTION_FIELDS = ("lastFrostPct", "firstFrostPct", "frostRisk")
+
+
+def yearly_frost_doys(grid: columnar.StationGrid) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per grid year: (valid, last spring frost DOY, first autumn frost DOY), NaN when a valid year
+    has no frost in that half — the same year filter and definitions as `_compute_normal`."""
+    valid = columnar.valid_years(grid, MIN_DAYS_PER_YEAR)
+    frost_day = grid["values"]["tmin"] <= FROST_THRESHOLD_C  # NaN compares False
+    last = columnar.last_doy_where(frost_day, SPRING_LAST_DOY)
+    first = columnar.first_doy_where(frost_day, AUTUMN_FIRST_DOY)
+    return valid, np.where(valid, last, np.nan), np.where(valid, first, np.nan)
+
 
+class YearlyStats(TypedDict):
+    """Per-year inputs of a station's normal, one row per valid (>= MIN_DAYS_PER_YEAR) year, NaN
+    where the year doesn't contribute — the values `_compute_normal` takes medians of. The curves
+    come from the same `monthly_curves`, and gdd5 is a running sum in DOY order like
+    `_compute_normal`'s (the fetchers fill each year's days chronologically)."""
+    years: np.ndarray        # (Y,) int
+    lastFrost: np.ndarray    # (Y,) DOY, NaN = no spring frost that year
+    firstFrost: np.ndarray   # (Y,) DOY, NaN = no autumn frost that year
+    gdd5: np.ndarray         # (Y,) annual GDD base 5, NaN = no growing season (gdd == 0)
+    gddCurve5: np.ndarray    # (Y, 13) per-year cumulative checkpoints, NaN rows as gdd5
+    gddCurve10: np.ndarray   # (Y, 13)
 
-def _compute_normal(station_id: str, yearly: Yearly) -> FrostNormal | None:
+
+def per_year_stats(yearly: Yearly) -> YearlyStats:
+    grid = columnar.from_yearly(yearly)
+    valid, last, first = yearly_frost_doys(grid)
+    gdd5 = np.cumsum(_gdd_daily(grid["values"]["tmean"][valid], 5.0), axis=1)[:, -1]  # sequential: see YearlyStats
+    season = gdd5 > 0
+    curves = monthly_curves(grid, ("gddCurve5", "gddCurve10"))
+    curve5, curve10 = curves["gddCurve5"][valid], curves["gddCurve10"][valid]
+    return {
+        "years": grid["years"][valid].astype(np.int32),
+        "lastFrost": last[valid],
+        "firstFrost": first[valid],
+        "gdd5": np.where(season, gdd5, np.nan),
+        "gddCurve5": np.where(season[:, None], curve5, np.nan),
+        "gddCurve10": np.where(season[:, None], curve10, np.nan),
+    }
+
+
+def stack_yearly(stats: dict[str, YearlyStats], series: str, first: int, last: int) -> np.ndarray:
+    """(stations, calendar years first..last) array of one YearlyStats series, NaN where absent;
+    rows in `stats` order."""
+    out = np.full((len(stats), last - first + 1), np.nan)
+    for i, s in enumerate(stats.values()):
+        yrs = s["years"]
+        keep = (yrs >= first) & (yrs <= last)
+        out[i, yrs[keep] - first] = s[series][keep]
+    return out
+
+
+# CI field -> YearlyStats series whose median it brackets.
+CI_FIELDS = {"lastFrostCi": "lastFrost", "firstFrostCi": "firstFrost", "gdd5Ci": "gdd5"}
+
+
+def attach_intervals(normals: list[FrostNormal], stats: dict[str, YearlyStats]) -> None:
+    """Set CI_FIELDS on every normal in place, bootstrapping all stations in one batch per series."""
+    if not normals:
+        return
+    first, last = int(NORMAL_START[:4]), int(NORMAL_END[:4])
+    batch = {n["key"]: stats[n["key"]] for n in normals}
+    for field, series in CI_FIELDS.items():
+        ci = np.round(bootstrap.median_intervals(stack_yearly(batch, series, first, last)))
+        for normal, (lo, hi) in zip(normals, ci):
+            normal[field] = [int(lo), int(hi)]
+
+
+def _frost_distribution(yearly: Yearly) -> dict:
+    grid = columnar.from_yearly(yearly, ("tmin",))
+    valid, last, first = yearly_frost_doys(grid)
+    tmin = grid["values"]["tmin"][valid]
+    observed = (~np.isnan(tmin)).sum(axis=0)
+    frosty = (tmin <= FROST_THRESHOLD_C).sum(axis=0)
+    risk = np.where(observed > 0, 100.0 * frosty / np.maximum(observed, 1), 0.0)
+    return {
+        "lastFrostPct": [int(x) for x in columnar.percentiles_int(last, FROST_PERCENTILES)],
+        "firstFrostPct": [int(x) for x in columnar.percentiles_int(first, FROST_PERCENTILES)],
+        "frostRisk": columnar.pack_u8(risk),
+    }
+
+
+def _compute_normal(station_id: str, yearly: Yearly, fields: Collection[str] | None = None) -> FrostNormal | None:
     if not yearly:
         return None
 
+    wanted = [f for f in CURVE_FIELDS if fields is None or f in fields]
     last_frosts: list[int] = []
     first_frosts: list[int] = []
     gdds: list[float] = []
-    curves5: list[list[int]] = []
-    curves10: list[list[int]] = []
-    growdays5: list[list[int]] = []
-    growdays10: list[list[int]] = []
+    season_years: list[int] = []
     for year, days in yearly.items():
         if len(days) < MIN_DAYS_PER_YEAR:
             continue
@@ -245,50 +345,68 @@ def _compute_normal(station_id: str, yearly: Yearly) -> FrostNormal | None:
         if gdd > 0:
             gdds.append(gdd)
             # Curves only from years with a real growing season, mirroring the gdd5 filter.
-            curves5.append(_monthly_cumulative(days, year, 5.0))
-            curves10.append(_monthly_cumulative(days, year, 10.0))
-            growdays5.append(_monthly_cumulative_growdays(days, year, 5.0))
-            growdays10.append(_monthly_cumulative_growdays(days, year, 10.0))
+            season_years.append(year)
 
     if len(last_frosts) < MIN_YEARS_WITH_FROST or len(first_frosts) < MIN_YEARS_WITH_FROST:
         return None
     if not gdds:
         return None
 
-    # Median per checkpoint across years (each curve is a 13-length cumulative array).
-    gdd_curve5 = [int(round(median([c[k] for c in curves5]))) for k in range(13)]
-    gdd_curve10 = [int(round(median([c[k] for c in curves10]))) for k in range(13)]
-    grow_days5 = [int(round(median([c[k] for c in growdays5]))) for k in range(13)]
-    grow_days10 = [int(round(median([c[k] for c in growdays10]))) for k in range(13)]
-
     years = len(gdds)
-    return {
+    normal: FrostNormal = {
         "key": station_id,
         "lastFrostDoy": int(round(median(last_frosts))),
         "firstFrostDoy": int(round(median(first_frosts))),
         "gdd5": int(round(median(gdds))),
-        "gddCurve5": gdd_curve5,
-        "gddCurve10": gdd_curve10,
-        "growDays5": grow_days5,
-        "growDays10": grow_days10,
-        "years": years,
-        "confidence": "low" if years < LOW_CONFIDENCE_YEARS else "high",
     }
+    # Median per checkpoint across years; every year's curve comes from one pass over the station grid.
+    if wanted:
+        grid = columnar.from_yearly(yearly, ("tmean",))
+        rows = np.searchsorted(grid["years"], season_years)  # grid years are sorted
+        for f, curve in monthly_curves(grid, wanted).items():
+            normal[f] = [int(round(x)) for x in np.median(curve[rows], axis=0)]
+    if fields is None or any(f in fields for f in DISTRIBUTION_FIELDS):
+        normal.update(_frost_distribution(yearly))
+    normal["years"] = years
+    return normal
 
 
-def build(stations: list[StationEntry], source: Source = "frost-api", max_stations: int | None = None) -> list[FrostNormal]:
+def build(
+    stations: list[StationEntry],
+    source: Source = "frost-api",
+    max_stations: int | None = None,
+    progress: bool = False,
+    on_yearly: Callable[[str, Yearly], None] | None = None,
+) -> list[FrostNormal]:
+    """Derive every station's normal. `on_yearly(station_id, yearly)` is called for each derived
+    station with the daily data its normal came from, so later stages (the daily climatology)
+    reuse it instead of reading the observations again."""
     if source != "frost-api":
         raise NotImplementedError(f"source={source} not implemented yet")
 
     targets = stations[:max_stations] if max_stations else stations
     n = len(targets)
     out: list[FrostNormal] = []
+    stats: dict[str, YearlyStats] = {}
+    t0 = time.perf_counter()
     for i, s in enumerate(targets, 1):
-        normal = derive_from_observations(s["id"])
+        with metrics.timed("frost.station_derive_s"):
+            normal, yearly = derive_with_yearly(s["id"])
+        if progress:
+            metrics.progress(i, n, t0, f"{s['id']} {s['name']}")
         if normal is None:
-            print(f"  [{i}/{n}] {s['id']} {s['name']}: skip (insufficient data)")
+            metrics.count("frost.stations_skipped")
+            if not progress:
+                print(f"  [{i}/{n}] {s['id']} {s['name']}: skip (insufficient data)")
             continue
+        metrics.count("frost.stations_derived")
+        stats[s["id"]] = per_year_stats(yearly)
+        if on_yearly is not None:
+            on_yearly(s["id"], yearly)
         out.append(normal)
-        print(f"  [{i}/{n}] {s['id']} {s['name']}: "
-              f"last={normal['lastFrostDoy']} first={normal['firstFrostDoy']} gdd5={normal['gdd5']}")
+        if not progress:
+            print(f"  [{i}/{n}] {s['id']} {s['name']}: "
+                  f"last={normal['lastFrostDoy']} first={normal['firstFrostDoy']} gdd5={normal['gdd5']}")
+    with metrics.timed("frost.bootstrap_s"):
+        attach_intervals(out, stats)
     return out
@@ -2,41 +2,66 @@
 
 import base64
 import json
+import os
 import time
+import urllib.error
 import urllib.parse
 import urllib.request
 from pathlib import Path
 from typing import Any
 
+from climate_data import metrics
 from climate_data.config import frost_credentials
 
-BASE = "https://frost.met.no"
+# Overridable (env or assignment) to point at a local stand-in, see climate_data/frost_server.py.
+BASE = os.environ.get("FROST_API_BASE", "https://frost.met.no").rstrip("/")
 CACHE_DIR = Path(__file__).parent.parent / "data" / "raw" / "frost"
 MIN_INTERVAL_S = 1.1
+# When True, a cache miss raises CacheMiss instead of calling the API (offline patch runs).
+CACHE_ONLY = False
 
 _last_call = 0.0
 
 
+class CacheMiss(LookupError):
+    """Raised in CACHE_ONLY mode when a response isn't cached."""
+
+
 def get(path: str, params: dict[str, str], cache_key: str | None = None) -> dict[str, Any]:
     if cache_key:
         cache_file = CACHE_DIR / f"{cache_key}.json"
         if cache_file.exists():
-            return json.loads(cache_file.read_text())
+            raw = cache_file.read_bytes()
+            metrics.count("frost.cache_hits")
+            metrics.count("frost.cache_bytes", len(raw))
+            with metrics.timed("frost.decode_s"):
+                return json.loads(raw)
+        metrics.count("frost.cache_misses")
+    if CACHE_ONLY:
+        raise CacheMiss(cache_key or path)
 
     global _last_call
     delta = time.time() - _last_call
     if delta < MIN_INTERVAL_S:
+        metrics.observe("frost.rate_limit_sleep_s", MIN_INTERVAL_S - delta)
         time.sleep(MIN_INTERVAL_S - delta)
 
     cid, _ = frost_credentials()
     auth = base64.b64encode(f"{cid}:".encode()).decode()
     url = f"{BASE}{path}?" + urllib.parse.urlencode(params)
     req = urllib.request.Request(url, headers={"Authorization": f"Basic {auth}"})
+    metrics.count("frost.requests")
     try:
-        with urllib.request.urlopen(req, timeout=60) as r:
-            data = json.loads(r.read().decode())
+        with metrics.timed("frost.fetch_s"), urllib.request.urlopen(req, timeout=60) as r:
+            body = r.read()
+    except urllib.error.HTTPError as ex:
+        metrics.count(f"frost.http_{ex.code}")
+        raise
     finally:
         _last_call = time.time()
+    metrics.count("frost.bytes", len(body))
+    with metrics.timed("frost.decode_s"):
+        data = json.loads(body)
 
     if cache_key:
         CACHE_DIR.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,269 @@
+"""Local stand-in for the Frost API, for offline load tests of the fetch path.
+
+Serves the three endpoints the builders use —
+
+  /sources/v0.jsonld
+  /observations/availableTimeSeries/v0.jsonld
+  /observations/v0.jsonld
+
+— either replayed from a Frost response cache (`--replay data/raw/frost`,
+mapping each request to the cache key `frost.py` / `stations.py` / `elements.py`
+would use) or generated on the fly by `climate_data.synthetic`: air temperature,
+or the requested daily element (precipitation, snow depth, soil temperature). Knobs for exercising
+`frost_api.get` under stress: per-request latency + jitter, random 429 / 503
+injection, and Frost's 403 "request too large" for observation requests
+spanning more than `--too-large-days`. Requests without an Authorization
+header get a 401, as on the real service.
+
+Point the client at it with `FROST_API_BASE=http://127.0.0.1:8765` (any
+FROST_CLIENT_ID will do) or `build.py --frost-base ...`:
+
+  python -m climate_data.frost_server --stations 600 --latency-ms 80 --p429 0.02
+"""
+
+import argparse
+import datetime as dt
+import functools
+import json
+import random
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, TypedDict
+
+from climate_data import elements, frost, synthetic
+
+DEFAULT_PORT = 8765
+# Full-window sub-daily requests 403 on the real API (hence frost._fetch_hourly's per-year
+# loop); daily requests over the whole window are fine.
+DEFAULT_TOO_LARGE_DAYS = 400
+
+
+class ServerOptions(TypedDict):
+    stations: int
+    seed: int
+    hourly_every: int
+    interval_min: int
+    replay: Path | None
+    latency_ms: float
+    jitter_ms: float
+    p429: float
+    p503: float
+    too_large_days: int
+
+
+class _Error(Exception):
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+def _error_body(code: int, message: str) -> dict[str, Any]:
+    return {"@type": "ErrorResponse", "error": {"code": code, "message": message, "reason": message}}
+
+
+def _span_days(referencetime: str) -> tuple[dt.date, dt.date, int]:
+    try:
+        a, b = referencetime.split("/")
+        lo, hi = dt.date.fromisoformat(a[:10]), dt.date.fromisoformat(b[:10])
+    except ValueError:
+        raise _Error(400, f"Invalid referencetime: {referencetime}")
+    return lo, hi, (hi - lo).days + 1
+
+
+class FrostStandIn:
+    """Request → payload resolution (replay or synthetic), independent of HTTP plumbing."""
+
+    def __init__(self, opts: ServerOptions) -> None:
+        self.opts = opts
+        self.ids = synthetic.station_ids(opts["stations"])
+        self.mean_only = {sid for i, sid in enumerate(self.ids)
+                          if opts["hourly_every"] and i % opts["hourly_every"] == 0}
+        self.rnd = random.Random(f"{opts['seed']}:faults")
+        self.lock = threading.Lock()
+        self.stats: dict[str, int] = {"requests": 0, "429": 0, "503": 0, "403": 0, "404": 0}
+        # Per instance: a decorated method would share one cache across stand-ins and keep each alive
+        self._synthetic = functools.lru_cache(maxsize=256)(self._generate)
+
+    def _replay(self, cache_key: str) -> bytes:
+        path = self.opts["replay"] / f"{cache_key}.json"
+        if not path.exists():
+            raise _Error(404, "No data found")
+        return path.read_bytes()
+
+    def _generate(self, kind: str, sid: str, year: int, element: str = "") -> bytes:
+        if kind == "sources":
+            payload = synthetic.sources(self.ids, self.opts["seed"])
+        elif kind == "ats_all":
+            payload = synthetic.available_series(self.ids)
+        elif kind == "ats":
+            payload = synthetic.available_series([sid], "air_temperature")
+        elif kind == "daily":
+            payload = synthetic.daily(sid, self.opts["seed"], with_min=sid not in self.mean_only)
+        elif kind == "element":
+            payload = synthetic.element_daily(sid, element, self.opts["seed"])
+        else:
+            payload = synthetic.subdaily(sid, year, self.opts["seed"], self.opts["interval_min"])
+        return json.dumps(payload).encode()
+
+    def resolve(self, path: str, params: dict[str, str]) -> bytes:
+        replay = self.opts["replay"] is not None
+        if path == "/sources/v0.jsonld":
+            return self._replay("sources_no_1991_2024") if replay else self._synthetic("sources", "", 0)
+
+        if path == "/observations/availableTimeSeries/v0.jsonld":
+            sid = params.get("sources", "")
+            if not sid:
+                return self._replay("ats_meandaily") if replay else self._synthetic("ats_all", "", 0)
+            return self._replay(f"ats_{sid}") if replay else self._synthetic("ats", sid, 0)
+
+        if path == "/observations/v0.jsonld":
+            sid = params.get("sources", "")
+            element_ids = params.get("elements", "")
+            lo, hi, days = _span_days(params.get("referencetime", ""))
+            # frost._fetch_hourly asks for bare air_temperature; everything else is daily
+            sub_daily = element_ids == "air_temperature"
+            if sub_daily and days > self.opts["too_large_days"]:
+                raise _Error(403, "This request is too large, please reduce the time span or number of "
+                                  "sources/elements")
+            if sid not in self.ids and not replay:
+                raise _Error(404, "No data found")
+            if sub_daily:
+                if replay:
+                    return self._replay(f"obs_hourly_{sid}_{lo.year}")
+                if sid not in self.mean_only:
+                    raise _Error(404, "No data found")
+                return self._synthetic("subdaily", sid, lo.year)
+            if "air_temperature P1D" in element_ids:
+                if replay:
+                    return self._replay(f"obs_{sid}_{frost.NORMAL_START[:4]}_{frost.NORMAL_END[:4]}")
+                return self._synthetic("daily", sid, 0)
+            # One element per request, as elements.fetch_grid asks
+            if replay:
+                return self._replay(elements.cache_key(sid, element_ids))
+            if element_ids not in synthetic.ELEMENT_IDS:
+                raise _Error(404, "No data found")
+            return self._synthetic("element", sid, 0, element_ids)
+
+        raise _Error(404, f"Unknown endpoint {path}")
+
+    def inject(self) -> None:
+        """Latency first (a throttled request still costs a round trip), then faults."""
+        o = self.opts
+        delay = o["latency_ms"] + (self.rnd.uniform(-o["jitter_ms"], o["jitter_ms"]) if o["jitter_ms"] else 0.0)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+        with self.lock:
+            r = self.rnd.random()
+        if r < o["p429"]:
+            raise _Error(429, "Too many requests")
+        if r < o["p429"] + o["p503"]:
+            raise _Error(503, "Service unavailable")
+
+    def count(self, key: str) -> None:
+        with self.lock:
+            self.stats[key] = self.stats.get(key, 0) + 1
+
+
+def _handler(standin: FrostStandIn) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:  # noqa: N802 (http.server API)
+            standin.count("requests")
+            url = urllib.parse.urlsplit(self.path)
+            params = dict(urllib.parse.parse_qsl(url.query))
+            try:
+                if "Authorization" not in self.headers:
+                    raise _Error(401, "Unauthorized")
+                standin.inject()
+                body = standin.resolve(url.path, params)
+                self._send(200, body)
+            except _Error as ex:
+                standin.count(str(ex.code))
+                self._send(ex.code, json.dumps(_error_body(ex.code, str(ex))).encode())
+
+        def _send(self, code: int, body: bytes) -> None:
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            if code == 429:
+                self.send_header("Retry-After", "1")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt: str, *args: Any) -> None:
+            pass  # keep load tests quiet; totals are in standin.stats
+
+    return Handler
+
+
+def default_options(**overrides: Any) -> ServerOptions:
+    opts: ServerOptions = {
+        "stations": 600,
+        "seed": 0,
+        "hourly_every": 3,
+        "interval_min": 60,
+        "replay": None,
+        "latency_ms": 0.0,
+        "jitter_ms": 0.0,
+        "p429": 0.0,
+        "p503": 0.0,
+        "too_large_days": DEFAULT_TOO_LARGE_DAYS,
+    }
+    opts.update(overrides)  # type: ignore[typeddict-item]
+    return opts
+
+
+def make_server(host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                opts: ServerOptions | None = None) -> tuple[ThreadingHTTPServer, FrostStandIn]:
+    standin = FrostStandIn(opts or default_options())
+    server = ThreadingHTTPServer((host, port), _handler(standin))
+    server.daemon_threads = True
+    return server, standin
+
+
+def serve_in_thread(opts: ServerOptions | None = None) -> tuple[ThreadingHTTPServer, FrostStandIn, str]:
+    """Start on an ephemeral port in a daemon thread; returns (server, stand-in, base URL)."""
+    server, standin = make_server(port=0, opts=opts)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, standin, f"http://{host}:{port}"
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=DEFAULT_PORT)
+    p.add_argument("--replay", type=Path, default=None, help="Serve responses from this Frost cache dir")
+    p.add_argument("--stations", type=int, default=600, help="Synthetic station count (default: %(default)s)")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--hourly-every", type=int, default=3,
+                   help="Every Nth synthetic station is mean-only (sub-daily fallback) (default: %(default)s)")
+    p.add_argument("--interval-min", type=int, default=60, help="Sub-daily cadence (default: %(default)s)")
+    p.add_argument("--latency-ms", type=float, default=0.0, help="Added latency per request")
+    p.add_argument("--jitter-ms", type=float, default=0.0, help="± uniform jitter on the latency")
+    p.add_argument("--p429", type=float, default=0.0, help="Probability of a 429 Too Many Requests")
+    p.add_argument("--p503", type=float, default=0.0, help="Probability of a 503 Service Unavailable")
+    p.add_argument("--too-large-days", type=int, default=DEFAULT_TOO_LARGE_DAYS,
+                   help="403 sub-daily observation requests spanning more days (default: %(default)s)")
+    a = p.parse_args()
+    opts = default_options(stations=a.stations, seed=a.seed, hourly_every=a.hourly_every,
+                           interval_min=a.interval_min, replay=a.replay, latency_ms=a.latency_ms,
+                           jitter_ms=a.jitter_ms, p429=a.p429, p503=a.p503, too_large_days=a.too_large_days)
+    server, standin = make_server(a.host, a.port, opts)
+    mode = f"replay {a.replay}" if a.replay else f"synthetic, {a.stations} stations"
+    print(f"Frost stand-in on http://{a.host}:{a.port} ({mode}) — Ctrl-C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"served: {standin.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Reverse geocoder: coordinates → nearest postnummer centroid via a uniform lat/lon grid.
+
+Centroids are bucketed into CELL_LAT × CELL_LON degree cells over their bounding
+box. They are sorted by cell and stored CSR-style: `starts[cell] .. starts[cell + 1]`
+indexes the sorted arrays. A lookup scans the query's cell ring by ring. It stops
+once the best haversine distance found is no larger than the closest any further
+ring could be (`min_cell_km` per ring), so the result is exact. The expected cost
+is O(1), a few dozen candidates. Queries outside the box start from the nearest
+edge cell. Far from every centroid (sea, across the border) the rings are mostly
+empty. After MAX_RINGS the search stops walking and does one vectorized scan of
+all centroids instead.
+
+`nearest_many` answers coordinate arrays. Each cell's 3×3 neighbourhood candidate
+array is built once and reused. A point whose best distance is within one cell
+width is then settled by a single vectorized haversine. Only points in sparse
+areas fall back to the ring search.
+
+`to_asset()` is the compact form shipped as postnummer-grid.json. The app can
+decode it and run the same ring search offline:
+
+  { latMin, lonMin, cellLat, cellLon, rows, cols,
+    starts:     base64 little-endian uint16, rows*cols + 1 offsets
+    postnummer: base64 uint16 (zero-pad to 4 digits), in cell order
+    lat, lon:   base64 little-endian int32, 1e-5 degrees, in cell order }
+"""
+
+import base64
+import math
+from typing import TypedDict
+
+import numpy as np
+
+from climate_data.postnummer import PostnummerEntry
+
+CELL_LAT = 0.1
+CELL_LON = 0.2
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEG = math.pi * EARTH_RADIUS_KM / 180
+COORD_SCALE = 1e5
+MAX_RINGS = 4
+
+
+class GridAsset(TypedDict):
+    latMin: float
+    lonMin: float
+    cellLat: float
+    cellLon: float
+    rows: int
+    cols: int
+    starts: str
+    postnummer: str
+    lat: str
+    lon: str
+
+
+def _b64(a: np.ndarray) -> str:
+    return base64.b64encode(a.tobytes()).decode("ascii")
+
+
+def _haversine_km(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    phi, lam = math.radians(lat), math.radians(lon)
+    p2, l2 = np.radians(lats), np.radians(lons)
+    a = np.sin((p2 - phi) / 2) ** 2 + math.cos(phi) * np.cos(p2) * np.sin((l2 - lam) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+class PostnummerGrid:
+    def __init__(self, codes: list[str], lat: np.ndarray, lon: np.ndarray,
+                 cell_lat: float = CELL_LAT, cell_lon: float = CELL_LON,
+                 origin: tuple[float, float] | None = None, shape: tuple[int, int] | None = None) -> None:
+        # Quantize to the asset's precision first so the shipped starts match the shipped coordinates.
+        lat, lon = np.rint(lat * COORD_SCALE) / COORD_SCALE, np.rint(lon * COORD_SCALE) / COORD_SCALE
+        self.cell_lat, self.cell_lon = cell_lat, cell_lon
+        self.lat_min, self.lon_min = origin or (float(lat.min()), float(lon.min()))
+        self.rows, self.cols = shape or (int((lat.max() - self.lat_min) / cell_lat) + 1,
+                                         int((lon.max() - self.lon_min) / cell_lon) + 1)
+        cell = self._cell_ids(lat, lon)
+        order = np.argsort(cell, kind="stable")
+        self.codes = [codes[i] for i in order]
+        self.lat, self.lon = lat[order], lon[order]
+        self.starts = np.searchsorted(cell[order], np.arange(self.rows * self.cols + 1))
+        # Lower bound on the distance across one cell anywhere in the box (longitude cells narrow
+        # towards the pole), so ring k+1 is at least k * min_cell_km away.
+        widest_lat = max(abs(self.lat_min), abs(self.lat_min + self.rows * cell_lat))
+        self.min_cell_km = min(cell_lat * KM_PER_DEG, cell_lon * KM_PER_DEG * math.cos(math.radians(widest_lat)))
+        self._neighbourhood: dict[tuple[int, int], np.ndarray] = {}
+
+    @classmethod
+    def from_entries(cls, entries: list[PostnummerEntry], **kwargs: float) -> "PostnummerGrid":
+        return cls([e["postnummer"] for e in entries],
+                   np.array([e["centroidLat"] for e in entries], dtype=float),
+                   np.array([e["centroidLon"] for e in entries], dtype=float), **kwargs)
+
+    def _rc(self, lat: np.ndarray | float, lon: np.ndarray | float) -> tuple[np.ndarray, np.ndarray]:
+        r = np.clip(np.floor((np.asarray(lat) - self.lat_min) / self.cell_lat).astype(np.int64), 0, self.rows - 1)
+        c = np.clip(np.floor((np.asarray(lon) - self.lon_min) / self.cell_lon).astype(np.int64), 0, self.cols - 1)
+        return r, c
+
+    def _cell_ids(self, lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+        r, c = self._rc(lat, lon)
+        return r * self.cols + c
+
+    def _ring(self, r: int, c: int, k: int) -> list[int]:
+        """Sorted-array indices of all centroids in the cells exactly k steps (Chebyshev) from (r, c)."""
+        out: list[int] = []
+        for rr in range(r - k, r + k + 1):
+            if not 0 <= rr < self.rows:
+                continue
+            step = 1 if abs(rr - r) == k else 2 * k
+            for cc in range(c - k, c + k + 1, max(step, 1)):
+                if 0 <= cc < self.cols:
+                    cell = rr * self.cols + cc
+                    out.extend(range(self.starts[cell], self.starts[cell + 1]))
+        return out
+
+    def nearest(self, lat: float, lon: float) -> tuple[str, float]:
+        """(postnummer, km) of the nearest centroid."""
+        i, km = self._nearest_index(lat, lon)
+        return self.codes[i], km
+
+    def _nearest_index(self, lat: float, lon: float) -> tuple[int, float]:
+        r, c = (int(x) for x in self._rc(lat, lon))
+        best, best_km = -1, math.inf
+        for k in range(MAX_RINGS + 1):
+            cand = self._ring(r, c, k)
+            if cand:
+                idx = np.asarray(cand)
+                d = _haversine_km(lat, lon, self.lat[idx], self.lon[idx])
+                j = int(np.argmin(d))
+                if d[j] < best_km:
+                    best, best_km = int(idx[j]), float(d[j])
+            if best >= 0 and best_km <= k * self.min_cell_km:
+                return best, best_km
+        d = _haversine_km(lat, lon, self.lat, self.lon)
+        j = int(np.argmin(d))
+        return j, float(d[j])
+
+    def _around(self, r: int, c: int) -> np.ndarray:
+        key = (r, c)
+        if key not in self._neighbourhood:
+            self._neighbourhood[key] = np.asarray(self._ring(r, c, 0) + self._ring(r, c, 1), dtype=np.int64)
+        return self._neighbourhood[key]
+
+    def nearest_many(self, lats: np.ndarray, lons: np.ndarray) -> tuple[list[str], np.ndarray]:
+        """Nearest postnummer + km for each coordinate pair."""
+        lats, lons = np.asarray(lats, dtype=float), np.asarray(lons, dtype=float)
+        rs, cs = self._rc(lats, lons)
+        out_idx = np.empty(len(lats), dtype=np.int64)
+        out_km = np.empty(len(lats))
+        for n, (lat, lon, r, c) in enumerate(zip(lats, lons, rs, cs)):
+            cand = self._around(int(r), int(c))
+            if len(cand):
+                d = _haversine_km(lat, lon, self.lat[cand], self.lon[cand])
+                j = int(np.argmin(d))
+                if d[j] <= self.min_cell_km:  # ring 2 is at least one cell width away
+                    out_idx[n], out_km[n] = cand[j], d[j]
+                    continue
+            out_idx[n], out_km[n] = self._nearest_index(float(lat), float(lon))
+        return [self.codes[i] for i in out_idx], out_km
+
+    def to_asset(self) -> GridAsset:
+        if len(self.codes) > np.iinfo(np.uint16).max:
+            raise ValueError(f"{len(self.codes)} centroids do not fit the uint16 offsets of the asset")
+        return {
+            "latMin": self.lat_min,
+            "lonMin": self.lon_min,
+            "cellLat": self.cell_lat,
+            "cellLon": self.cell_lon,
+            "rows": self.rows,
+            "cols": self.cols,
+            "starts": _b64(self.starts.astype("<u2")),
+            "postnummer": _b64(np.array([int(p) for p in self.codes], dtype="<u2")),
+            "lat": _b64(np.rint(self.lat * COORD_SCALE).astype("<i4")),
+            "lon": _b64(np.rint(self.lon * COORD_SCALE).astype("<i4")),
+        }
+
+    @classmethod
+    def from_asset(cls, asset: GridAsset) -> "PostnummerGrid":
+        def dec(s: str, dtype: str) -> np.ndarray:
+            return np.frombuffer(base64.b64decode(s), dtype=dtype)
+        codes = [f"{p:04d}" for p in dec(asset["postnummer"], "<u2")]
+        return cls(codes, dec(asset["lat"], "<i4") / COORD_SCALE, dec(asset["lon"], "<i4") / COORD_SCALE,
+                   asset["cellLat"], asset["cellLon"], origin=(asset["latMin"], asset["lonMin"]),
+                   shape=(asset["rows"], asset["cols"]))
@@ -0,0 +1,109 @@
+"""Build climate-lookup.json: postnummer → elevation-corrected climate, pre-joined.
+
+The app resolves a postnummer in three hops (postnummer.json → stationId →
+stations.json + frost-normals.json) and then lapse-corrects the frost dates and
+GDD curves on every request. This stage does that join once at build time, at
+the postnummer's centroid elevation, and emits one object keyed by postnummer so
+a lookup is a single keyed fetch.
+
+The correction mirrors `resolveLocation` / `elevationAdjustedGddCurve` in
+Spirr/src/lib/location.ts exactly (same constants, same JS `Math.round`
+semantics) with no user elevation override and no frostJustering offset. A user
+who overrides their elevation still goes through the raw path in the app. Keep
+the two in sync.
+"""
+
+import math
+from typing import NotRequired, TypedDict
+
+from climate_data.frost import FrostNormal
+from climate_data.postnummer import PostnummerEntry
+from climate_data.stations import StationEntry
+
+# Same constants as location.ts — ~0.65°C per 100 m, ~10 days per °C.
+LAPSE_DAYS_PER_METRE = 0.065
+LAPSE_C_PER_METRE = 0.0065
+
+
+class ClimateLookupEntry(TypedDict):
+    kommune: str
+    fylke: str
+    stationId: str
+    stationElevationM: int
+    centroidElevationM: int
+    # Lapse-corrected to centroidElevationM (informational shift kept so the app can
+    # re-derive the station values without loading frost-normals.json).
+    lastFrostDoy: int
+    firstFrostDoy: int
+    elevationShiftDays: float
+    gddCurve5: list[int]
+    gddCurve10: list[int]
+    years: NotRequired[int]
+    # Station bootstrap intervals shifted like the dates above.
+    lastFrostCi: NotRequired[list[int]]
+    firstFrostCi: NotRequired[list[int]]
+
+
+def _js_round(x: float) -> int:
+    """JavaScript `Math.round` (half rounds towards +inf), not Python's banker's rounding."""
+    return math.floor(x + 0.5)
+
+
+def elevation_adjusted_gdd_curve(raw: list[int], grow_days: list[int] | None, delta_t: float) -> list[int]:
+    """Port of `elevationAdjustedGddCurve`: add `delta_t` GDD per growing day so far, clamp to
+    >=0 and force non-decreasing. Returns the raw curve unchanged without growing-day counts."""
+    if not grow_days or delta_t == 0:
+        return list(raw)
+    out: list[int] = []
+    running = 0.0
+    for k, value in enumerate(raw):
+        adjusted = max(0.0, value + delta_t * (grow_days[k] if k < len(grow_days) else 0))
+        running = max(running, adjusted)
+        out.append(_js_round(running))
+    return out
+
+
+def resolve(pn: PostnummerEntry, station: StationEntry, normal: FrostNormal) -> ClimateLookupEntry:
+    elevation = pn["centroidElevationM"]
+    shift_days = LAPSE_DAYS_PER_METRE * (elevation - station["elevationM"])
+    delta_t = LAPSE_C_PER_METRE * (station["elevationM"] - elevation)
+    entry: ClimateLookupEntry = {
+        "kommune": pn["kommune"],
+        "fylke": pn["fylke"],
+        "stationId": station["id"],
+        "stationElevationM": station["elevationM"],
+        "centroidElevationM": elevation,
+        "lastFrostDoy": _js_round(normal["lastFrostDoy"] + shift_days),
+        "firstFrostDoy": _js_round(normal["firstFrostDoy"] - shift_days),
+        "elevationShiftDays": round(shift_days, 3),
+        "gddCurve5": elevation_adjusted_gdd_curve(normal["gddCurve5"], normal.get("growDays5"), delta_t),
+        "gddCurve10": elevation_adjusted_gdd_curve(normal["gddCurve10"], normal.get("growDays10"), delta_t),
+    }
+    if "years" in normal:
+        entry["years"] = normal["years"]
+    if "lastFrostCi" in normal:
+        entry["lastFrostCi"] = [_js_round(d + shift_days) for d in normal["lastFrostCi"]]
+    if "firstFrostCi" in normal:
+        entry["firstFrostCi"] = [_js_round(d - shift_days) for d in normal["firstFrostCi"]]
+    return entry
+
+
+def build(
+    postnumre: list[PostnummerEntry],
+    stations: list[StationEntry],
+    normals: list[FrostNormal],
+) -> dict[str, ClimateLookupEntry]:
+    station_by_id = {s["id"]: s for s in stations}
+    normal_by_key = {n["key"]: n for n in normals}
+    out: dict[str, ClimateLookupEntry] = {}
+    unresolved = 0
+    for pn in postnumre:
+        station = station_by_id.get(pn["stationId"])
+        normal = normal_by_key.get(pn["stationId"])
+        if station is None or normal is None:  # the app returns null here too
+            unresolved += 1
+            continue
+        out[pn["postnummer"]] = resolve(pn, station, normal)
+    if unresolved:
+        print(f"  lookup: {unresolved} postnumre without station/normals (omitted)")
+    return dict(sorted(out.items()))
@@ -0,0 +1,354 @@
+"""Local HTTP/JSON climate lookup service over the built assets.
+
+Loads stations.json, frost-normals.json, postnummer.json and, when present,
+daily-climatology.json from one directory, once, into in-memory indexes: dicts
+keyed by postnummer and station id, plus the station coordinates as numpy arrays
+in radians for a vectorized nearest-station search. Three queries are answered:
+
+  GET /postnummer/<code>                         lapse-corrected normals (as climate-lookup.json)
+  GET /nearest?lat=60.39&lon=5.32[&n=3]          nearest stations with distance + normals
+  GET /reverse?lat=60.39&lon=5.32                nearest postnummer centroid (geocode grid) + its normals
+  GET /gdd?postnummer=<code>|station=<id>&from=2025-05-10&to=2025-08-31[&base=5]
+                                                 GDD between two dates
+
+`/gdd` uses the daily climatology when available: a prefix sum over the smoothed
+daily Tmean, shifted by the lapse-rate ΔT for a postnummer. That is exact for any
+base. Without the climatology it interpolates the monthly gddCurve5/10 checkpoints,
+which supports base 5 and 10 only. Every response body is built once and kept in
+an LRU cache (CACHE_SIZE per route). Coordinates are rounded to ~10 m first, so
+nearby repeat queries share an entry. `GET /stats` reports cache hit rates.
+
+  python -m climate_data.lookup_server --data ../Spirr/src/data
+  python -m climate_data.lookup_server --data data/out --load-test 20000 --concurrency 8
+"""
+
+import argparse
+import datetime as dt
+import functools
+import http.client
+import json
+import math
+import random
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from climate_data import climatology, geocode, lookup, metrics
+
+DEFAULT_DATA_DIR = Path(__file__).parent.parent.parent / "Spirr" / "src" / "data"
+DEFAULT_PORT = 8766
+CACHE_SIZE = 8192
+EARTH_RADIUS_KM = 6371.0
+COORD_DECIMALS = 4
+# 1-based DOY of each month end in a common year; index 0 = 0 (year start), as the gddCurve layout.
+MONTH_END_DOY = np.cumsum([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+
+class _Error(Exception):
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+def _json(body: Any) -> bytes:
+    return json.dumps(body, ensure_ascii=False).encode()
+
+
+class ClimateIndex:
+    """In-memory indexes over the assets plus the (cached) query methods; no HTTP in here."""
+
+    def __init__(self, data_dir: Path, cache_size: int = CACHE_SIZE) -> None:
+        self.stations = {s["id"]: s for s in json.loads((data_dir / "stations.json").read_text())}
+        self.normals = {n["key"]: n for n in json.loads((data_dir / "frost-normals.json").read_text())}
+        self.postnumre = {p["postnummer"]: p for p in json.loads((data_dir / "postnummer.json").read_text())}
+        clim = data_dir / "daily-climatology.json"
+        self.tmean: dict[str, np.ndarray] = {}
+        if clim.exists():
+            self.tmean = {c["key"]: climatology.decode(c["tmean"]) for c in json.loads(clim.read_text())}
+        # Only stations with normals are worth returning from /nearest.
+        self.ids = [sid for sid in self.stations if sid in self.normals]
+        self.lat = np.radians([self.stations[sid]["lat"] for sid in self.ids])
+        self.lon = np.radians([self.stations[sid]["lon"] for sid in self.ids])
+        self.cos_lat = np.cos(self.lat)
+        self.grid = geocode.PostnummerGrid.from_entries(list(self.postnumre.values()))
+        self.postnummer = functools.lru_cache(cache_size)(self._postnummer)
+        self.nearest = functools.lru_cache(cache_size)(self._nearest)
+        self.gdd = functools.lru_cache(cache_size)(self._gdd)
+        self.reverse = functools.lru_cache(cache_size)(self._reverse)
+        self._prefix = functools.lru_cache(cache_size)(self._gdd_prefix)
+
+    def _postnummer(self, code: str) -> bytes:
+        pn = self.postnumre.get(code)
+        if pn is None:
+            raise _Error(404, f"unknown postnummer {code}")
+        station, normal = self.stations.get(pn["stationId"]), self.normals.get(pn["stationId"])
+        if station is None or normal is None:
+            raise _Error(404, f"no normals for postnummer {code}")
+        return _json({"postnummer": code, **lookup.resolve(pn, station, normal)})
+
+    def _reverse(self, lat: float, lon: float) -> bytes:
+        code, km = self.grid.nearest(lat, lon)
+        return _json({"distanceKm": round(km, 2), **json.loads(self.postnummer(code))})
+
+    def nearest_rows(self, lat: float, lon: float, n: int) -> tuple[np.ndarray, np.ndarray]:
+        """(rows into self.ids, distances in km) of the n nearest stations, nearest first."""
+        phi, lam = np.radians(lat), np.radians(lon)
+        a = np.sin((self.lat - phi) / 2) ** 2 + np.cos(phi) * self.cos_lat * np.sin((self.lon - lam) / 2) ** 2
+        km = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+        n = min(n, len(km))
+        rows = np.argpartition(km, n - 1)[:n] if n < len(km) else np.arange(len(km))
+        rows = rows[np.argsort(km[rows])]
+        return rows, km[rows]
+
+    def _nearest(self, lat: float, lon: float, n: int) -> bytes:
+        rows, km = self.nearest_rows(lat, lon, n)
+        out = []
+        for r, d in zip(rows, km):
+            sid = self.ids[r]
+            out.append({"station": self.stations[sid], "distanceKm": round(float(d), 2), "normals": self.normals[sid]})
+        return _json(out)
+
+    def _gdd_prefix(self, station_id: str, base: float, delta_t: float) -> np.ndarray:
+        daily = np.maximum(self.tmean[station_id][:365] + delta_t - base, 0.0)
+        return np.concatenate([[0.0], np.cumsum(daily)])
+
+    def _gdd(self, postnummer: str | None, station_id: str | None, start: dt.date, end: dt.date,
+             base: float) -> bytes:
+        if end < start:
+            raise _Error(400, "to is before from")
+        delta_t = 0.0
+        if postnummer is not None:
+            pn = self.postnumre.get(postnummer)
+            if pn is None:
+                raise _Error(404, f"unknown postnummer {postnummer}")
+            station_id = pn["stationId"]
+        if station_id not in self.normals or station_id not in self.stations:
+            raise _Error(404, f"no normals for station {station_id}")
+        if postnummer is not None:
+            delta_t = lookup.LAPSE_C_PER_METRE * (self.stations[station_id]["elevationM"] - pn["centroidElevationM"])
+        a, b = min(start.timetuple().tm_yday, 365), min(end.timetuple().tm_yday, 365)
+        years = end.year - start.year
+        if station_id in self.tmean:
+            prefix = self._prefix(station_id, base, round(delta_t, 3))
+            total = prefix[365] * years + prefix[b] - prefix[a - 1]
+            method = "daily"
+        else:
+            curve = self._curve(postnummer, station_id, base)
+            at = lambda doy: float(np.interp(doy, MONTH_END_DOY, curve))  # noqa: E731
+            total = curve[12] * years + at(b) - at(a - 1)
+            method = "monthly"
+        return _json({"stationId": station_id, "from": start.isoformat(), "to": end.isoformat(),
+                      "base": base, "gdd": round(float(total), 1), "method": method})
+
+    def _curve(self, postnummer: str | None, station_id: str, base: float) -> list[int]:
+        field = {5.0: "gddCurve5", 10.0: "gddCurve10"}.get(base)
+        if field is None:
+            raise _Error(400, "without daily-climatology.json only base 5 and 10 are available")
+        if postnummer is None:
+            return self.normals[station_id][field]
+        pn = self.postnumre[postnummer]
+        return lookup.resolve(pn, self.stations[station_id], self.normals[station_id])[field]
+
+    def cache_stats(self) -> dict[str, dict[str, int]]:
+        out = {}
+        for name in ("postnummer", "nearest", "reverse", "gdd"):
+            info = getattr(self, name).cache_info()
+            out[name] = {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+        return out
+
+
+def _number(params: dict[str, str], name: str, limit: float, default: str | None = None) -> float:
+    """Finite query parameter within ±limit. float() also parses "nan" and "inf", which would end
+    up as bare NaN in the JSON body."""
+    value = float(params[name] if default is None else params.get(name, default))
+    if not math.isfinite(value) or abs(value) > limit:
+        raise _Error(400, f"{name} must be a finite number within ±{limit:g}")
+    return value
+
+
+def _route(index: ClimateIndex, path: str, params: dict[str, str]) -> bytes:
+    try:
+        if path.startswith("/postnummer/"):
+            return index.postnummer(path.rsplit("/", 1)[1])
+        if path in ("/nearest", "/reverse"):
+            lat = round(_number(params, "lat", 90), COORD_DECIMALS)
+            lon = round(_number(params, "lon", 180), COORD_DECIMALS)
+            if path == "/reverse":
+                return index.reverse(lat, lon)
+            return index.nearest(lat, lon, max(1, min(int(params.get("n", 3)), 50)))
+        if path == "/gdd":
+            if "postnummer" not in params and "station" not in params:
+                raise _Error(400, "postnummer or station is required")
+            return index.gdd(params.get("postnummer"), params.get("station"),
+                             dt.date.fromisoformat(params["from"]), dt.date.fromisoformat(params["to"]),
+                             _number(params, "base", 100, default="5"))
+        if path == "/stats":
+            return _json(index.cache_stats())
+    except (KeyError, ValueError) as ex:
+        raise _Error(400, f"bad request: {ex}")
+    raise _Error(404, f"no route {path}")
+
+
+def _handler(index: ClimateIndex) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes; with Nagle on, keep-alive clients wait
+        # out the peer's delayed ACK (~40 ms) on every response.
+        disable_nagle_algorithm = True
+
+        def do_GET(self) -> None:  # noqa: N802 (http.server API)
+            url = urllib.parse.urlsplit(self.path)
+            try:
+                self._send(200, _route(index, url.path, dict(urllib.parse.parse_qsl(url.query))))
+            except _Error as ex:
+                self._send(ex.code, _json({"error": str(ex)}))
+
+        def _send(self, code: int, body: bytes) -> None:
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt: str, *args: Any) -> None:
+            pass
+
+    return Handler
+
+
+def make_server(data_dir: Path = DEFAULT_DATA_DIR, host: str = "127.0.0.1",
+                port: int = DEFAULT_PORT) -> tuple[ThreadingHTTPServer, ClimateIndex]:
+    index = ClimateIndex(data_dir)
+    server = ThreadingHTTPServer((host, port), _handler(index))
+    server.daemon_threads = True
+    return server, index
+
+
+def serve_in_thread(data_dir: Path = DEFAULT_DATA_DIR) -> tuple[ThreadingHTTPServer, ClimateIndex, str]:
+    """Start on an ephemeral port in a daemon thread; returns (server, index, base URL)."""
+    server, index = make_server(data_dir, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, index, f"http://{host}:{port}"
+
+
+def _request_mix(index: ClimateIndex, n: int, seed: int) -> list[tuple[str, str]]:
+    """(route, path) pairs: a realistic mix over real postnumre, jittered station coordinates and
+    season-length GDD windows, drawn with replacement so the LRU sees repeats."""
+    rng = random.Random(seed)
+    codes = list(index.postnumre)
+    stations = [index.stations[sid] for sid in index.ids]
+    out: list[tuple[str, str]] = []
+    for _ in range(n):
+        r = rng.random()
+        if r < 0.5:
+            out.append(("postnummer", f"/postnummer/{rng.choice(codes)}"))
+        elif r < 0.8:
+            s = rng.choice(stations)
+            lat, lon = s["lat"] + rng.uniform(-0.3, 0.3), s["lon"] + rng.uniform(-0.3, 0.3)
+            route = "nearest" if r < 0.65 else "reverse"
+            out.append((route, f"/{route}?lat={lat:.4f}&lon={lon:.4f}" + ("&n=3" if route == "nearest" else "")))
+        else:
+            sow = dt.date(2025, 4, 1) + dt.timedelta(days=rng.randrange(60))
+            to = sow + dt.timedelta(days=rng.randrange(60, 120))
+            out.append(("gdd", f"/gdd?postnummer={rng.choice(codes)}&from={sow}&to={to}&base=5"))
+    return out
+
+
+def load_test(base_url: str, mix: list[tuple[str, str]], concurrency: int) -> dict[str, Any]:
+    """Replay `mix` over `concurrency` keep-alive connections; latency summary per route."""
+    host, port = urllib.parse.urlsplit(base_url).netloc.split(":")
+    samples: dict[str, list[float]] = {}
+    errors = 0
+    lock = threading.Lock()
+
+    def worker(chunk: list[tuple[str, str]]) -> None:
+        nonlocal errors
+        conn = http.client.HTTPConnection(host, int(port))
+        local: dict[str, list[float]] = {}
+        bad = 0
+        for route, path in chunk:
+            t0 = time.perf_counter()
+            conn.request("GET", path)
+            resp = conn.getresponse()
+            resp.read()
+            local.setdefault(route, []).append(time.perf_counter() - t0)
+            bad += resp.status >= 500
+        conn.close()
+        with lock:
+            for route, v in local.items():
+                samples.setdefault(route, []).extend(v)
+            errors += bad
+
+    threads = [threading.Thread(target=worker, args=(mix[i::concurrency],)) for i in range(concurrency)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+    every = [x for v in samples.values() for x in v]
+    return {
+        "requests": len(mix),
+        "concurrency": concurrency,
+        "wallS": round(wall, 3),
+        "requestsPerS": round(len(mix) / wall, 1) if wall else None,
+        "serverErrors": errors,
+        "latencyS": {"all": metrics.summarize(every), **{r: metrics.summarize(v) for r, v in samples.items()}},
+    }
+
+
+def _print_report(report: dict[str, Any]) -> None:
+    print(f"{report['requests']} requests, {report['concurrency']} connections, "
+          f"{report['requestsPerS']} req/s, {report['serverErrors']} server errors")
+    for route, s in report["latencyS"].items():
+        print(f"  {route:11s} n={s['count']:6d}  p50 {s['p50'] * 1e3:7.3f} ms  p99 {s['p99'] * 1e3:7.3f} ms")
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--data", type=Path, default=DEFAULT_DATA_DIR, help="Directory with the built assets")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=DEFAULT_PORT)
+    p.add_argument("--load-test", type=int, default=0, metavar="N",
+                   help="Instead of serving, fire N mixed requests at an in-process server and report p50/p99")
+    p.add_argument("--concurrency", type=int, default=8, help="Load-test connections (default: %(default)s)")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--out", type=Path, default=None, help="Also write the load-test report as JSON here")
+    a = p.parse_args()
+
+    if a.load_test:
+        t0 = time.perf_counter()
+        server, index, base = serve_in_thread(a.data)
+        print(f"loaded {len(index.postnumre)} postnumre, {len(index.ids)} stations "
+              f"({'daily' if index.tmean else 'monthly'} GDD) in {time.perf_counter() - t0:.2f}s")
+        try:
+            report = load_test(base, _request_mix(index, a.load_test, a.seed), a.concurrency)
+        finally:
+            server.shutdown()
+        report["cache"] = index.cache_stats()
+        _print_report(report)
+        if a.out:
+            a.out.parent.mkdir(parents=True, exist_ok=True)
+            a.out.write_text(json.dumps(report, indent=2) + "\n")
+        return
+
+    server, index = make_server(a.data, a.host, a.port)
+    print(f"climate lookup on http://{a.host}:{a.port} ({len(index.postnumre)} postnumre, "
+          f"{len(index.ids)} stations) — Ctrl-C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"cache: {index.cache_stats()}")
+
+
+if __name__ == "__main__":
+    main()
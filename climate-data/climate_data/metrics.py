@@ -0,0 +1,124 @@
+"""Process-wide counters, histograms and stage timers for a climate build run.
+
+Deliberately tiny and stdlib-only: the builders call `count` / `observe` /
+`timed` / `stage` on the module-level registry, and build.py dumps `report()`
+as JSON at the end so a slow build can be attributed to rate-limit sleeps,
+fetches, JSON decoding, normal derivation or station matching.
+
+  - counters:   monotonically increasing totals (requests, bytes, cache hits)
+  - histograms: raw samples, summarized as count/sum/min/p50/p90/p99/max
+  - stages:     wall + CPU seconds of a named build phase (re-entering adds up)
+"""
+
+import json
+import sys
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from climate_data import profiling
+
+_counters: dict[str, int] = defaultdict(int)
+_histograms: dict[str, list[float]] = defaultdict(list)
+_stages: dict[str, dict[str, float]] = {}
+_started = time.perf_counter()
+
+
+def reset() -> None:
+    global _started
+    _counters.clear()
+    _histograms.clear()
+    _stages.clear()
+    _started = time.perf_counter()
+
+
+def count(name: str, n: int = 1) -> None:
+    _counters[name] += n
+
+
+def observe(name: str, value: float) -> None:
+    _histograms[name].append(value)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Record the wall time of the block as one sample of histogram `name`."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        _histograms[name].append(time.perf_counter() - t0)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Accumulate wall + CPU seconds of a build phase (and profile it under --profile)."""
+    w0, c0 = time.perf_counter(), time.process_time()
+    try:
+        with profiling.stage(name):
+            yield
+    finally:
+        s = _stages.setdefault(name, {"wallS": 0.0, "cpuS": 0.0, "calls": 0})
+        s["wallS"] += time.perf_counter() - w0
+        s["cpuS"] += time.process_time() - c0
+        s["calls"] += 1
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    # Nearest-rank; good enough for latency-style summaries.
+    idx = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[idx]
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    if not samples:
+        return {"count": 0}
+    v = sorted(samples)
+    return {
+        "count": len(v),
+        "sum": round(sum(v), 6),
+        "min": round(v[0], 6),
+        "p50": round(_percentile(v, 0.50), 6),
+        "p90": round(_percentile(v, 0.90), 6),
+        "p99": round(_percentile(v, 0.99), 6),
+        "max": round(v[-1], 6),
+    }
+
+
+def report() -> dict[str, Any]:
+    hits = _counters.get("frost.cache_hits", 0)
+    misses = _counters.get("frost.cache_misses", 0)
+    wall = time.perf_counter() - _started
+    return {
+        "wallS": round(wall, 3),
+        "counters": dict(sorted(_counters.items())),
+        "cacheHitRate": round(hits / (hits + misses), 4) if hits + misses else None,
+        "stages": {k: {f: round(x, 3) for f, x in v.items()} for k, v in _stages.items()},
+        "histograms": {k: summarize(v) for k, v in sorted(_histograms.items())},
+    }
+
+
+def write(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report(), indent=2) + "\n")
+
+
+def progress(done: int, total: int, t0: float, label: str = "") -> None:
+    """Overwrite a single stderr line with done/total, rate and ETA."""
+    elapsed = time.perf_counter() - t0
+    rate = done / elapsed if elapsed > 0 else 0.0
+    eta = (total - done) / rate if rate > 0 else 0.0
+    line = (f"  [{done}/{total}] {rate:5.2f}/s  elapsed {_hms(elapsed)}  ETA {_hms(eta)}  {label}")
+    sys.stderr.write("\r" + line[:120].ljust(120))
+    if done >= total:
+        sys.stderr.write("\n")
+    sys.stderr.flush()
+
+
+def _hms(s: float) -> str:
+    m, s = divmod(int(s), 60)
+    h, m = divmod(m, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
@@ -5,17 +5,20 @@ Data sources:
   - open-meteo elevation API (free, no auth): elevation in metres from SRTM DEM
 """
 
+import io
 import json
 import math
 import time
 import urllib.request
 import zipfile
+from collections.abc import Iterable, Iterator
 from pathlib import Path
-from typing import TypedDict
+from typing import NamedTuple, TypedDict
 
+from climate_data import metrics
 from climate_data.stations import StationEntry
 
-GEONAMES_URL = "https://download.geonames.org/export/zip/NO.zip"
+GEONAMES_URL = "https://download.geonames.org/export/zip/{country}.zip"
 ELEVATION_URL = "https://api.open-meteo.com/v1/elevation"
 ELEVATION_BATCH = 100
 ELEVATION_SLEEP_S = 1.1
@@ -24,6 +27,15 @@ DEFAULT_ELEVATION_M = 150
 CACHE_DIR = Path(__file__).parent.parent / "data" / "raw"
 
 
+class GeonamesRecord(NamedTuple):
+    """The five columns we keep from a geonames postal-code row (tuple-sized, no per-row dict)."""
+    postnummer: str
+    fylke: str
+    kommune: str
+    lat: float
+    lon: float
+
+
 class PostnummerEntry(TypedDict):
     postnummer: str
     kommune: str
@@ -35,13 +47,14 @@ class PostnummerEntry(TypedDict):
 
 
 def build(stations: list[StationEntry], with_elevation: bool = False) -> list[PostnummerEntry]:
-    rows = _load_geonames()
-    entries = _dedupe_by_postnummer(rows)
+    with metrics.stage("postnummer.geonames"):
+        entries = _dedupe_by_postnummer(_load_geonames())
     print(f"  geonames: {len(entries)} unique postnumre")
 
     if with_elevation:
         try:
-            elevations = _fetch_elevations([(e["centroidLat"], e["centroidLon"]) for e in entries])
+            with metrics.stage("postnummer.elevation"):
+                elevations = _fetch_elevations([(e["centroidLat"], e["centroidLon"]) for e in entries])
             for e, elev in zip(entries, elevations):
                 e["centroidElevationM"] = int(round(elev))
             print(f"  open-meteo: {len(elevations)} elevations resolved")
@@ -57,52 +70,48 @@ def build(stations: list[StationEntry], with_elevation: bool = False) -> list[Po
         # in place by ../backfill_elevation.py (2026-07-06) without a full re-derive; a full build should
         # be run WITH --with-elevation. A future offline Kartverket DEM would remove the API dependency.
 
-    for e in entries:
-        e["stationId"] = _nearest_station(e["centroidLat"], e["centroidLon"], stations)["id"]
+    with metrics.stage("postnummer.nearest_station"):
+        for e in entries:
+            e["stationId"] = _nearest_station(e["centroidLat"], e["centroidLon"], stations)["id"]
 
     return entries
 
 
-def _load_geonames() -> list[dict]:
-    cache = CACHE_DIR / "NO.zip"
+def _load_geonames(country: str = "NO") -> Iterator[GeonamesRecord]:
+    """Stream `<country>.txt` out of the cached geonames zip one line at a time, so memory stays flat
+    however large the dump (allCountries.zip is ~1.5M rows)."""
+    cache = CACHE_DIR / f"{country}.zip"
     if not cache.exists():
         CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        print(f"  fetching {GEONAMES_URL}")
-        urllib.request.urlretrieve(GEONAMES_URL, cache)
-
-    with zipfile.ZipFile(cache) as z, z.open("NO.txt") as f:
-        text = f.read().decode("utf-8")
-
-    out = []
-    for line in text.splitlines():
-        cols = line.split("\t")
-        if len(cols) < 11 or not cols[1] or not cols[9] or not cols[10]:
-            continue
-        out.append({
-            "postnummer": cols[1].strip(),
-            "fylke": cols[3].strip(),
-            "kommune": cols[5].strip(),
-            "centroidLat": float(cols[9]),
-            "centroidLon": float(cols[10]),
-        })
-    return out
+        url = GEONAMES_URL.format(country=country)
+        print(f"  fetching {url}")
+        urllib.request.urlretrieve(url, cache)
+
+    with zipfile.ZipFile(cache) as z, z.open(f"{country}.txt") as raw:
+        for line in io.TextIOWrapper(raw, encoding="utf-8", newline=""):
+            cols = line.rstrip("\r\n").split("\t", 11)
+            if len(cols) < 11 or not cols[1] or not cols[9] or not cols[10]:
+                continue
+            yield GeonamesRecord(cols[1].strip(), cols[3].strip(), cols[5].strip(), float(cols[9]), float(cols[10]))
 
 
-def _dedupe_by_postnummer(rows: list[dict]) -> list[PostnummerEntry]:
-    seen: dict[str, PostnummerEntry] = {}
+def _dedupe_by_postnummer(rows: Iterable[GeonamesRecord]) -> list[PostnummerEntry]:
+    # First row per postnummer wins; only the kept records are held, never the full row list.
+    seen: dict[str, GeonamesRecord] = {}
     for r in rows:
-        pn = r["postnummer"]
-        if pn not in seen:
-            seen[pn] = {
-                "postnummer": pn,
-                "kommune": r["kommune"],
-                "fylke": r["fylke"],
-                "centroidLat": r["centroidLat"],
-                "centroidLon": r["centroidLon"],
-                "centroidElevationM": 0,
-                "stationId": "",
-            }
-    return sorted(seen.values(), key=lambda e: e["postnummer"])
+        seen.setdefault(r.postnummer, r)
+    return [
+        {
+            "postnummer": r.postnummer,
+            "kommune": r.kommune,
+            "fylke": r.fylke,
+            "centroidLat": r.lat,
+            "centroidLon": r.lon,
+            "centroidElevationM": 0,
+            "stationId": "",
+        }
+        for r in sorted(seen.values(), key=lambda r: r.postnummer)
+    ]
 
 
 def _fetch_elevations(coords: list[tuple[float, float]]) -> list[float]:
@@ -0,0 +1,173 @@
+"""Opt-in cProfile / tracemalloc capture for build.py and the patch scripts.
+
+Off by default and free when off. With `--profile`, every top-level
+`metrics.stage(...)` is run under its own cProfile and written to the
+profile dir as:
+
+  - `<stage>.pstats`     — raw stats, for `python -m pstats` / snakeviz
+  - `<stage>.collapsed`  — flamegraph.pl / speedscope "collapsed stack" lines
+                           (`root;caller;callee <microseconds>`), rooted at the
+                           stage name so the per-stage files can be concatenated
+
+and `profile.collapsed` holds all stages of the run. cProfile only records
+caller → callee edges, so the stacks are reconstructed from the call graph:
+time along a path is apportioned by each edge's share of the callee's
+cumulative time. Exact for tree-shaped call graphs, an approximation where a
+function is reached from several callers.
+
+With `--profile-memory`, `memory(name)` blocks (wrapped around `_fetch_daily`,
+`_compute_normal` and `postnummer.build`) record their tracemalloc peak, written
+to `memory.json` as max / p50 peak bytes per block.
+"""
+
+import argparse
+import cProfile
+import json
+import pstats
+import tracemalloc
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+DEFAULT_OUT = Path(__file__).parent.parent / "data" / "out" / "profile"
+# Collapsed-stack pruning: skip paths below this many microseconds, and cap the depth so
+# recursive call graphs can't blow up the output.
+MIN_US = 50
+MAX_DEPTH = 64
+
+_out_dir: Path | None = None
+_memory = False
+_depth = 0
+_collapsed: list[str] = []
+_peaks: dict[str, list[int]] = defaultdict(list)
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--profile", action="store_true", help="Capture cProfile stats + collapsed stacks per stage")
+    p.add_argument(
+        "--profile-out",
+        type=Path,
+        default=DEFAULT_OUT,
+        help=f"Where to write profile output (default: {DEFAULT_OUT})",
+    )
+    p.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="With --profile, also record tracemalloc peak memory around fetch/derive/postnummer",
+    )
+
+
+def configure(args: argparse.Namespace) -> None:
+    global _out_dir, _memory
+    if not args.profile:
+        return
+    _out_dir = args.profile_out
+    _out_dir.mkdir(parents=True, exist_ok=True)
+    _memory = args.profile_memory
+    if _memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    print(f"profiling -> {_out_dir}/" + (" (+memory)" if _memory else ""))
+
+
+def enabled() -> bool:
+    return _out_dir is not None
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Profile the block if profiling is on and no enclosing stage is already being profiled
+    (cProfile can't nest; inner stages show up inside the outer stage's stacks)."""
+    global _depth
+    if _out_dir is None or _depth:
+        _depth += 1
+        try:
+            yield
+        finally:
+            _depth -= 1
+        return
+    prof = cProfile.Profile()
+    _depth += 1
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+        _depth -= 1
+        _dump(name, prof)
+
+
+@contextmanager
+def memory(name: str) -> Iterator[None]:
+    if not _memory:
+        yield
+        return
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    try:
+        yield
+    finally:
+        _, peak = tracemalloc.get_traced_memory()
+        _peaks[name].append(peak - base)
+
+
+def _safe(name: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+
+
+def _label(func: tuple[str, int, str]) -> str:
+    filename, line, fn = func
+    if filename == "~":  # builtins
+        return fn.replace(";", ":")
+    return f"{fn} ({Path(filename).name}:{line})".replace(";", ":")
+
+
+def collapse(stats: pstats.Stats, root: str) -> list[str]:
+    raw = stats.stats  # {func: (cc, nc, tt, ct, {caller: (cc, nc, tt, ct)})}
+    callees: dict[tuple, list[tuple]] = defaultdict(list)
+    for func, (*_, callers) in raw.items():
+        for caller in callers:
+            callees[caller].append(func)
+    roots = [f for f, (*_, callers) in raw.items() if not callers]
+
+    acc: dict[str, float] = defaultdict(float)
+
+    def walk(func: tuple, path: list[str], seen: set[tuple], frac: float) -> None:
+        _, _, tt, ct, _ = raw[func]
+        if ct * frac * 1e6 < MIN_US or len(path) > MAX_DEPTH:
+            return
+        acc[";".join(path)] += tt * frac
+        for callee in callees.get(func, ()):
+            if callee in seen:
+                continue
+            callee_ct = raw[callee][3]
+            edge_ct = raw[callee][4][func][3]
+            if callee_ct <= 0:
+                continue
+            walk(callee, path + [_label(callee)], seen | {callee}, frac * edge_ct / callee_ct)
+
+    for r in roots:
+        walk(r, [root, _label(r)], {r}, 1.0)
+    return [f"{stack} {int(round(t * 1e6))}" for stack, t in acc.items() if t * 1e6 >= 1]
+
+
+def _dump(name: str, prof: cProfile.Profile) -> None:
+    assert _out_dir is not None
+    prof.dump_stats(_out_dir / f"{_safe(name)}.pstats")
+    lines = collapse(pstats.Stats(prof), name)
+    (_out_dir / f"{_safe(name)}.collapsed").write_text("\n".join(lines) + "\n")
+    _collapsed.extend(lines)
+
+
+def finish() -> None:
+    """Write the whole-run collapsed stacks + memory peaks. No-op when profiling is off."""
+    if _out_dir is None:
+        return
+    (_out_dir / "profile.collapsed").write_text("\n".join(_collapsed) + "\n")
+    if _peaks:
+        report = {}
+        for name, peaks in sorted(_peaks.items()):
+            v = sorted(peaks)
+            report[name] = {"calls": len(v), "maxPeakBytes": v[-1], "p50PeakBytes": v[len(v) // 2]}
+        (_out_dir / "memory.json").write_text(json.dumps(report, indent=2) + "\n")
+    print(f"profile: wrote {_out_dir}/ (profile.collapsed → flamegraph.pl / speedscope)")
@@ -0,0 +1,119 @@
+"""Sliding-window normals: one normal per N-year window, for every window, in one pass.
+
+`frost.NORMAL_START` / `NORMAL_END` fix a single window, so comparing 1991-2020
+with 1995-2024 used to mean a rebuild per window. Instead this reuses the
+per-year statistics (`frost.per_year_stats`: frost DOYs, annual GDD, monthly
+GDD checkpoints) and slides a window across the years. Each series keeps a
+sorted window (`SlidingMedian`): a year entering is inserted, the year leaving
+is removed (bisect, O(N) memmove on a ~30-element list), and the median is read
+off the middle. That is one update per year per series, not a re-sort per window.
+
+Each series of a window (a frost DOY, gdd5, a curve) is emitted only when at
+least MIN_YEARS (frost.MIN_YEARS_WITH_FROST) years contribute to that series,
+otherwise null. The gate is per series: a window can have a gdd5 but no
+lastFrostDoy. The shipped normal is different. It spans the whole
+NORMAL_START..NORMAL_END range (1991-2024, longer than the default 30-year
+window) and needs both frost series to pass. So no window is expected to
+reproduce frost-normals.json.
+"""
+
+import bisect
+import math
+from typing import TypedDict
+
+import numpy as np
+
+from climate_data import frost
+
+DEFAULT_WINDOW = 30
+MIN_YEARS = frost.MIN_YEARS_WITH_FROST
+SCALARS = {"lastFrostDoy": "lastFrost", "firstFrostDoy": "firstFrost", "gdd5": "gdd5"}
+CURVES = ("gddCurve5", "gddCurve10")
+
+
+class RollingNormals(TypedDict):
+    key: str
+    window: int
+    # First year of each window; window k covers starts[k] .. starts[k] + window - 1.
+    starts: list[int]
+    years: list[int]
+    lastFrostDoy: list[int | None]
+    firstFrostDoy: list[int | None]
+    gdd5: list[int | None]
+    gddCurve5: list[list[int] | None]
+    gddCurve10: list[list[int] | None]
+
+
+class SlidingMedian:
+    """Median of a multiset under insert/remove; NaN values are ignored."""
+
+    __slots__ = ("_sorted",)
+
+    def __init__(self) -> None:
+        self._sorted: list[float] = []
+
+    def add(self, x: float) -> None:
+        if not math.isnan(x):
+            bisect.insort(self._sorted, x)
+
+    def remove(self, x: float) -> None:
+        if not math.isnan(x):
+            del self._sorted[bisect.bisect_left(self._sorted, x)]
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+    def median(self) -> float:
+        s, n = self._sorted, len(self._sorted)
+        return s[n // 2] if n % 2 else (s[n // 2 - 1] + s[n // 2]) / 2
+
+
+def _dense(stats: frost.YearlyStats, first: int, last: int) -> dict[str, np.ndarray]:
+    """Series re-indexed onto every calendar year first..last (NaN for absent years), so the
+    window slides by calendar year even when a station skips years."""
+    n = last - first + 1
+    idx = stats["years"] - first
+    out: dict[str, np.ndarray] = {}
+    for name in (*SCALARS.values(), *CURVES):
+        src = stats[name]
+        dense = np.full((n, *src.shape[1:]), np.nan)
+        dense[idx] = src
+        out[name] = dense
+    return out
+
+
+def rolling_normals(key: str, stats: frost.YearlyStats, window: int = DEFAULT_WINDOW,
+                    first_year: int | None = None, last_year: int | None = None) -> RollingNormals:
+    first = first_year if first_year is not None else int(frost.NORMAL_START[:4])
+    last = last_year if last_year is not None else int(frost.NORMAL_END[:4])
+    series = _dense(stats, first, last)
+    n_years = last - first + 1
+    # One SlidingMedian per scalar and per curve checkpoint; gdd5 doubles as the "years" count.
+    medians = {name: SlidingMedian() for name in SCALARS.values()}
+    curve_medians = {c: [SlidingMedian() for _ in range(13)] for c in CURVES}
+
+    def push(i: int, add: bool) -> None:
+        for name, m in medians.items():
+            (m.add if add else m.remove)(float(series[name][i]))
+        for c, ms in curve_medians.items():
+            for k, m in enumerate(ms):
+                (m.add if add else m.remove)(float(series[c][i, k]))
+
+    out: RollingNormals = {"key": key, "window": window, "starts": [], "years": [],
+                           "lastFrostDoy": [], "firstFrostDoy": [], "gdd5": [],
+                           "gddCurve5": [], "gddCurve10": []}
+    for i in range(n_years):
+        push(i, True)
+        if i >= window:
+            push(i - window, False)
+        if i < window - 1:
+            continue
+        out["starts"].append(first + i - window + 1)
+        out["years"].append(len(medians["gdd5"]))
+        for field, name in SCALARS.items():
+            m = medians[name]
+            out[field].append(int(round(m.median())) if len(m) >= MIN_YEARS else None)
+        for c, ms in curve_medians.items():
+            ok = len(ms[0]) >= MIN_YEARS
+            out[c].append([int(round(m.median())) for m in ms] if ok else None)
+    return out
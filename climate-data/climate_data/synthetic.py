@@ -0,0 +1,219 @@
+"""Deterministic synthetic Frost API payloads (and a geonames NO.zip) for offline runs.
+
+Shapes match what the real endpoints return as far as the builders read them:
+
+  - `sources(...)`            — /sources/v0.jsonld            (id, shortName, masl, geometry)
+  - `available_series(...)`   — /observations/availableTimeSeries/v0.jsonld
+  - `daily(...)`              — /observations, min+mean(air_temperature P1D)
+  - `element_daily(...)`      — /observations, one of ELEMENT_IDS (precipitation, snow depth,
+                                10 cm soil temperature), as `elements.py` requests them
+  - `subdaily(...)`           — /observations, sub-hourly `air_temperature` for one year
+  - `write_geonames_zip(...)` — geonames postal-code dump (tab separated, NO.txt in NO.zip)
+
+Temperatures follow a seasonal cosine shifted by latitude and elevation (lapse
+rate) plus seeded noise, so every station has real spring/autumn frosts and a
+growing season and survives the `frost.py` gates. Everything is a pure function
+of its arguments + seed: the same call yields byte-identical payloads, which is
+what benchmarks and the local Frost stand-in rely on.
+"""
+
+import datetime as dt
+import io
+import json
+import math
+import random
+import zipfile
+from pathlib import Path
+from typing import Any
+
+from climate_data import frost
+
+# Roughly mainland Norway.
+LAT_RANGE = (58.0, 71.0)
+LON_RANGE = (5.0, 30.0)
+MAX_ELEVATION_M = 1200
+
+
+def station_ids(n: int) -> list[str]:
+    return [f"SN{10000 + 7 * i}" for i in range(n)]
+
+
+def _station_rng(station_id: str, seed: int, salt: str = "") -> random.Random:
+    return random.Random(f"{seed}:{station_id}:{salt}")
+
+
+def station_meta(station_id: str, seed: int = 0) -> dict[str, Any]:
+    rnd = _station_rng(station_id, seed, "meta")
+    lat = rnd.uniform(*LAT_RANGE)
+    lon = rnd.uniform(*LON_RANGE)
+    return {"id": station_id, "lat": round(lat, 5), "lon": round(lon, 5),
+            "elevationM": int(rnd.triangular(0, MAX_ELEVATION_M, 50))}
+
+
+def _mean_temp(meta: dict[str, Any], doy: int, rnd: random.Random) -> float:
+    # Annual mean ~6°C at 60°N sea level, -0.5°C per degree north, lapse 0.65°C/100 m,
+    # ±11°C seasonal amplitude peaking mid-July, ~3°C day-to-day noise.
+    annual = 6.0 - 0.5 * (meta["lat"] - 60.0) - 0.0065 * meta["elevationM"]
+    seasonal = -11.0 * math.cos(2 * math.pi * (doy - 20) / 365.25)
+    return annual + seasonal + rnd.gauss(0.0, 3.0)
+
+
+def _days(first_year: int, last_year: int):
+    d, end = dt.date(first_year, 1, 1), dt.date(last_year, 12, 31)
+    while d <= end:
+        yield d
+        d += dt.timedelta(days=1)
+
+
+def _window_years() -> tuple[int, int]:
+    return int(frost.NORMAL_START[:4]), int(frost.NORMAL_END[:4])
+
+
+def sources(ids: list[str], seed: int = 0) -> dict[str, Any]:
+    data = []
+    for sid in ids:
+        m = station_meta(sid, seed)
+        data.append({
+            "@type": "SensorSystem",
+            "id": sid,
+            "name": f"SYNTHETIC {sid}",
+            "shortName": f"Synth {sid}",
+            "country": "Norge",
+            "masl": m["elevationM"],
+            "geometry": {"@type": "Point", "coordinates": [m["lon"], m["lat"]], "nearest": False},
+            "validFrom": "1980-01-01T00:00:00.000Z",
+        })
+    return {"@type": "SourceResponse", "totalItemCount": len(data), "data": data}
+
+
+def available_series(ids: list[str], element: str = "mean(air_temperature P1D)") -> dict[str, Any]:
+    lo, _ = _window_years()
+    data = [{
+        "sourceId": f"{sid}:0",
+        "validFrom": f"{lo}-01-01T00:00:00.000Z",
+        "timeOffset": "PT0H",
+        "elementId": element,
+    } for sid in ids]
+    return {"@type": "ObservationTimeSeriesResponse", "totalItemCount": len(data), "data": data}
+
+
+def daily(station_id: str, seed: int = 0, with_min: bool = True,
+          first_year: int | None = None, last_year: int | None = None) -> dict[str, Any]:
+    """Daily min+mean for the whole derivation window. `with_min=False` reproduces the
+    mean-only stations that force `frost.py` onto the hourly fallback."""
+    lo, hi = _window_years()
+    meta = station_meta(station_id, seed)
+    rnd = _station_rng(station_id, seed, "daily")
+    data = []
+    for d in _days(first_year or lo, last_year or hi):
+        tmean = _mean_temp(meta, d.timetuple().tm_yday, rnd)
+        obs = [{"elementId": "mean(air_temperature P1D)", "value": round(tmean, 1), "unit": "degC",
+                "timeOffset": "PT6H", "timeResolution": "P1D", "qualityCode": 0}]
+        if with_min:
+            tmin = tmean - 3.0 - abs(rnd.gauss(0.0, 2.0))
+            obs.insert(0, {"elementId": "min(air_temperature P1D)", "value": round(tmin, 1), "unit": "degC",
+                           "timeOffset": "PT18H", "timeResolution": "P1D", "qualityCode": 0})
+        data.append({"sourceId": f"{station_id}:0", "referenceTime": f"{d.isoformat()}T00:00:00.000Z",
+                     "observations": obs})
+    return {"@type": "ObservationResponse", "totalItemCount": len(data), "data": data}
+
+
+# Daily elements `element_daily` can generate, as `elements.ELEMENTS` requests them.
+ELEMENT_IDS = ("sum(precipitation_amount P1D)", "surface_snow_thickness", "mean(soil_temperature P1D)")
+
+
+def element_daily(station_id: str, element_id: str, seed: int = 0,
+                  first_year: int | None = None, last_year: int | None = None) -> dict[str, Any]:
+    """One daily element over the derivation window, driven by the same seasonal temperature
+    as `daily`: precipitation on ~45% of days, a snow pack that builds below 0°C and melts
+    above it, and soil temperature at 10 cm lagging the air."""
+    if element_id not in ELEMENT_IDS:
+        raise ValueError(f"no synthetic data for element {element_id!r}")
+    lo, hi = _window_years()
+    meta = station_meta(station_id, seed)
+    rnd = _station_rng(station_id, seed, element_id)
+    snow_cm, soil_c = 0.0, None
+    data = []
+    for d in _days(first_year or lo, last_year or hi):
+        tmean = _mean_temp(meta, d.timetuple().tm_yday, rnd)
+        precip = rnd.expovariate(1 / 5.0) if rnd.random() < 0.45 else 0.0
+        if element_id == "sum(precipitation_amount P1D)":
+            obs = {"value": round(precip, 1), "unit": "mm", "timeOffset": "PT6H", "timeResolution": "P1D"}
+        elif element_id == "surface_snow_thickness":
+            snow_cm = max(0.0, snow_cm + (1.5 * precip if tmean < 0.0 else -1.5 * tmean))
+            obs = {"value": round(snow_cm), "unit": "cm", "timeOffset": "PT6H", "timeResolution": "P1D"}
+        else:
+            soil_c = tmean if soil_c is None else soil_c + 0.2 * (tmean - soil_c)
+            obs = {"value": round(max(soil_c, 0.0), 1), "unit": "degC",
+                   "level": {"levelType": "depth", "unit": "cm", "value": 10},
+                   "timeOffset": "PT0H", "timeResolution": "P1D"}
+        data.append({"sourceId": f"{station_id}:0", "referenceTime": f"{d.isoformat()}T00:00:00.000Z",
+                     "observations": [{"elementId": element_id, **obs, "qualityCode": 0}]})
+    return {"@type": "ObservationResponse", "totalItemCount": len(data), "data": data}
+
+
+def subdaily(station_id: str, year: int, seed: int = 0, interval_min: int = 60) -> dict[str, Any]:
+    """One year of `air_temperature` every `interval_min` minutes (10 = the real sub-hourly
+    cadence of automatic stations; 60 keeps fixtures small)."""
+    meta = station_meta(station_id, seed)
+    rnd = _station_rng(station_id, seed, f"sub{year}")
+    per_day = 24 * 60 // interval_min
+    data = []
+    for d in _days(year, year):
+        tmean = _mean_temp(meta, d.timetuple().tm_yday, rnd)
+        for k in range(per_day):
+            minute = k * interval_min
+            diurnal = -4.0 * math.cos(2 * math.pi * (minute - 240) / 1440)
+            value = tmean + diurnal + rnd.gauss(0.0, 0.4)
+            data.append({
+                "sourceId": f"{station_id}:0",
+                "referenceTime": f"{d.isoformat()}T{minute // 60:02d}:{minute % 60:02d}:00.000Z",
+                "observations": [{"elementId": "air_temperature", "value": round(value, 1), "unit": "degC",
+                                  "level": {"levelType": "height_above_ground", "unit": "m", "value": 2},
+                                  "timeOffset": "PT0H", "timeResolution": f"PT{interval_min}M",
+                                  "qualityCode": 0}],
+            })
+    return {"@type": "ObservationResponse", "totalItemCount": len(data), "data": data}
+
+
+def centroids(n: int, seed: int = 0) -> list[tuple[float, float]]:
+    rnd = random.Random(f"{seed}:centroids")
+    return [(round(rnd.uniform(*LAT_RANGE), 4), round(rnd.uniform(*LON_RANGE), 4)) for _ in range(n)]
+
+
+def write_geonames_zip(path: Path, n: int, seed: int = 0, country: str = "NO") -> None:
+    """Geonames postal-code dump with `n` postnumre (plus a few duplicate rows per code, as
+    the real file has several places per postnummer)."""
+    rnd = random.Random(f"{seed}:geonames")
+    buf = io.StringIO()
+    for i, (lat, lon) in enumerate(centroids(n, seed)):
+        code = f"{i:04d}" if n <= 10000 else f"{i:05d}"
+        for _ in range(1 + (rnd.random() < 0.2)):
+            buf.write("\t".join([country, code, f"Place {i}", f"Fylke {i % 11}", f"{i % 11:02d}",
+                                 f"Kommune {i % 356}", f"{i % 356:04d}", "", "",
+                                 f"{lat}", f"{lon}", "4"]) + "\n")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr(f"{country}.txt", buf.getvalue())
+        z.writestr("readme.txt", "synthetic geonames fixture\n")
+
+
+def write_cache(cache_dir: Path, ids: list[str], seed: int = 0, hourly_every: int = 0,
+                interval_min: int = 60) -> None:
+    """Populate a `frost_api.CACHE_DIR` so a build over `ids` runs fully offline. Every
+    `hourly_every`-th station (0 = none) is mean-only and gets per-year sub-daily files."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    lo, hi = _window_years()
+
+    def put(key: str, payload: dict[str, Any]) -> None:
+        (cache_dir / f"{key}.json").write_text(json.dumps(payload))
+
+    put("sources_no_1991_2024", sources(ids, seed))
+    put("ats_meandaily", available_series(ids))
+    for i, sid in enumerate(ids):
+        hourly = hourly_every > 0 and i % hourly_every == 0
+        put(f"obs_{sid}_1991_2024", daily(sid, seed, with_min=not hourly))
+        if hourly:
+            put(f"ats_{sid}", available_series([sid], "air_temperature"))
+            for year in range(lo, hi + 1):
+                put(f"obs_hourly_{sid}_{year}", subdaily(sid, year, seed, interval_min))
@@ -0,0 +1,76 @@
+"""Robust per-station trends in the per-year frost dates and GDD, all stations at once.
+
+For each series the per-year values (`frost.per_year_stats`) are stacked into one
+(stations × calendar years) array, NaN where a year doesn't contribute. The trend is
+Theil–Sen: the median of the slopes between every pair of years. With the ~34-year
+window that is 561 year pairs, so the slopes form a (stations × 561) array and the
+estimate is one `nanmedian` along the pair axis. There is no per-station loop.
+
+The significance test is Mann–Kendall on the same pairs: S is the sum of the pair
+signs, and Z is the usual normal approximation (no tie correction, continuity
+corrected). A series is "shifting" when |Z| > Z_CRIT (two-sided 5%) and it has at
+least MIN_YEARS years.
+"""
+
+from typing import TypedDict
+
+import numpy as np
+
+from climate_data import frost
+
+MIN_YEARS = frost.MIN_YEARS_WITH_FROST
+Z_CRIT = 1.96
+# YearlyStats series -> output slope field (per decade).
+SERIES = {
+    "lastFrost": "lastFrostDaysPerDecade",
+    "firstFrost": "firstFrostDaysPerDecade",
+    "gdd5": "gdd5PerDecade",
+}
+
+
+class StationTrend(TypedDict, total=False):
+    key: str
+    # Per series, e.g. lastFrostDaysPerDecade / lastFrostZ / lastFrostYears; the slope and
+    # Z are absent when the series has fewer than MIN_YEARS years.
+    shifting: bool  # any series with a significant monotonic trend
+
+
+def theil_sen(values: np.ndarray, x: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Row-wise Theil–Sen slope, Mann–Kendall Z and count of non-NaN points for an (S, Y) array.
+
+    Rows with fewer than two points get NaN slope and NaN Z."""
+    i, j = np.triu_indices(values.shape[1], k=1)
+    dy = values[:, j] - values[:, i]         # (S, P); NaN if either year missing
+    dx = (x[j] - x[i]).astype(float)          # (P,)
+    ok = ~np.isnan(dy)
+    n = (~np.isnan(values)).sum(axis=1)
+    with np.errstate(all="ignore"):
+        slope = np.nanmedian(np.where(ok, dy / dx, np.nan), axis=1)
+    s = np.sign(np.where(ok, dy, 0.0)).sum(axis=1)
+    var = n * (n - 1) * (2 * n + 5) / 18.0
+    with np.errstate(all="ignore"):
+        z = np.where(s > 0, (s - 1) / np.sqrt(var), np.where(s < 0, (s + 1) / np.sqrt(var), 0.0))
+    z = np.where(n >= 2, z, np.nan)
+    return slope, z, n
+
+
+def compute(stats: dict[str, frost.YearlyStats], first_year: int | None = None,
+            last_year: int | None = None) -> list[StationTrend]:
+    first = first_year if first_year is not None else int(frost.NORMAL_START[:4])
+    last = last_year if last_year is not None else int(frost.NORMAL_END[:4])
+    x = np.arange(first, last + 1)
+    out: list[StationTrend] = [{"key": k} for k in stats]
+    shifting = np.zeros(len(out), dtype=bool)
+    for series, field in SERIES.items():
+        values = frost.stack_yearly(stats, series, first, last)
+        slope, z, n = theil_sen(values, x)
+        enough = n >= MIN_YEARS
+        shifting |= enough & (np.abs(z) > Z_CRIT)
+        for rec, b, zz, nn, e in zip(out, slope * 10, z, n, enough):
+            rec[f"{series}Years"] = int(nn)
+            if e:
+                rec[field] = round(float(b), 2)
+                rec[f"{series}Z"] = round(float(zz), 2)
+    for rec, sh in zip(out, shifting):
+        rec["shifting"] = bool(sh)
+    return out
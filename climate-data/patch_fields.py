@@ -0,0 +1,139 @@
+"""Recompute selected FrostNormal fields from the cache and merge them into frost-normals.json.
+
+Generic replacement for the one-off add_gdd_curves.py / add_grow_days.py: name
+the fields to (re)derive, and every station in the existing asset is recomputed
+from the cached observations (offline — a cache miss is reported, never
+fetched) across a process pool. Only the requested curve families are
+computed, only the requested fields are written back, and everything else in
+each record is left untouched. Stations that can't be derived keep their old
+record and are listed as misses.
+
+Drift is reported for requested fields that already existed, for the scalar
+anchors (lastFrostDoy / firstFrostDoy / gdd5 — always re-derived, so a change
+means the cache or the derivation moved), and for gddCurve5[12] != gdd5.
+
+Run: `python patch_fields.py gddCurve5 gddCurve10 [--workers N] [--data PATH]`.
+"""
+
+import argparse
+import json
+import os
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from climate_data import diff, frost, frost_api, metrics, profiling
+
+DATA = Path(__file__).parent.parent / "mvp-mygarden" / "src" / "data" / "frost-normals.json"
+PATCHABLE = [f for f in frost.FrostNormal.__annotations__ if f != "key"]
+ANCHORS = ("lastFrostDoy", "firstFrostDoy", "gdd5")
+
+
+def _init_worker() -> None:
+    frost_api.CACHE_ONLY = True
+
+
+def _derive(key: str, fields: Sequence[str]) -> tuple[str, frost.FrostNormal | None, frost.YearlyStats | None]:
+    normal, yearly = frost.derive_with_yearly(key, fields)
+    # Bootstrap intervals are batched across stations in the parent, from per-year stats.
+    wants_ci = normal is not None and any(f in frost.CI_FIELDS for f in fields)
+    return key, normal, frost.per_year_stats(yearly) if wants_ci else None
+
+
+def _drift(key: str, old: dict, rec: frost.FrostNormal, fields: Sequence[str], tolerance: float) -> list[str]:
+    out: list[str] = []
+    for f in dict.fromkeys([*ANCHORS, *fields]):
+        if f not in old or f not in rec:
+            continue
+        delta = diff.numeric_delta(old[f], rec[f])
+        if delta is not None and delta > tolerance:
+            out.append(f"{key}: recomputed {f} moved by {delta:g} from shipped")
+        elif delta is None and old[f] != rec[f]:
+            out.append(f"{key}: recomputed {f}={rec[f]} != shipped {old[f]}")
+    if "gddCurve5" in rec and rec["gddCurve5"][12] != rec["gdd5"]:
+        out.append(f"{key}: curve5[12]={rec['gddCurve5'][12]} != gdd5={rec['gdd5']}")
+    return out
+
+
+def _show(field: str, value: object) -> str:
+    if isinstance(value, list):
+        return f"{field}[{len(value) - 1}]={value[-1]}"
+    if isinstance(value, str) and len(value) > 16:
+        return f"{field}=<{len(value)} chars>"
+    return f"{field}={value}"
+
+
+def patch(
+    data: Path,
+    fields: Sequence[str],
+    workers: int | None = None,
+    tolerance: float = diff.DEFAULT_TOLERANCE,
+) -> None:
+    unknown = [f for f in fields if f not in PATCHABLE]
+    if unknown:
+        raise SystemExit(f"unknown FrostNormal field(s): {unknown} (patchable: {PATCHABLE})")
+
+    entries = json.loads(data.read_text())
+    keys = [e["key"] for e in entries]
+    n = len(keys)
+    _init_worker()
+    if profiling.enabled() and workers != 1:
+        print("profiling: running serially so the derivation shows up in the profile")
+        workers = 1
+
+    out: list[dict] = []
+    missing: list[str] = []
+    drift: list[str] = []
+    with metrics.stage("derive"):
+        if workers == 1:
+            results = list(map(_derive, keys, [fields] * n))
+        else:
+            # The with block shuts the workers down even when a derivation raises
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+                results = list(pool.map(_derive, keys, [fields] * n,
+                                        chunksize=max(1, n // (4 * (os.cpu_count() or 1)))))
+        if any(f in frost.CI_FIELDS for f in fields):
+            frost.attach_intervals([r for _, r, _ in results if r is not None],
+                                   {k: st for k, _, st in results if st is not None})
+        for i, (e, (key, rec, _)) in enumerate(zip(entries, results), 1):
+            if rec is None:
+                missing.append(key)
+                out.append(e)
+                print(f"[{i}/{n}] {key}: SKIP (no cache / insufficient) — left unchanged")
+                continue
+            drift.extend(_drift(key, e, rec, fields, tolerance))
+            merged = dict(e)
+            for f in fields:
+                merged[f] = rec[f]
+            out.append(merged)
+            print(f"[{i}/{n}] {key}: " + " ".join(_show(f, rec[f]) for f in fields))
+
+    with metrics.stage("write"):
+        data.write_text(json.dumps(out, ensure_ascii=False, indent=2) + "\n")
+    print(f"\nWrote {len(out)} entries to {data}")
+    print(f"missing {'/'.join(fields)}: {len(missing)} {missing}")
+    print(f"drift warnings: {len(drift)}")
+    for d in drift:
+        print(f"  ! {d}")
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("fields", nargs="+", metavar="FIELD", help=f"FrostNormal fields to recompute: {PATCHABLE}")
+    p.add_argument("--data", type=Path, default=DATA, help=f"frost-normals.json to patch (default: {DATA})")
+    p.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count; 1 = serial)")
+    p.add_argument(
+        "--drift-tolerance",
+        type=float,
+        default=diff.DEFAULT_TOLERANCE,
+        help="Flag recomputed values that move more than this from shipped (default: %(default)s)",
+    )
+    profiling.add_arguments(p)
+    args = p.parse_args()
+    profiling.configure(args)
+    patch(args.data, args.fields, workers=args.workers, tolerance=args.drift_tolerance)
+    profiling.finish()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from climate_data import climatology, frost
+
+
+def _yearly(first_year: int = 1995, last_year: int = 2024) -> frost.Yearly:
+    yearly: frost.Yearly = {}
+    for year in range(first_year, last_year + 1):
+        n_days = 366 if year % 4 == 0 else 365
+        yearly[year] = {}
+        for doy in range(1, n_days + 1):
+            tmean = 6.0 - 12.0 * np.cos(2 * np.pi * (doy - 15) / 365) + (year % 3) * 0.1
+            yearly[year][doy] = {"tmin": tmean - 4.0, "tmean": tmean}
+    return yearly
+
+
+def test_gdd_between_accepts_doy_366():
+    tmean = np.full(366, 15.0)
+    assert climatology.gdd_between(tmean, 5, 1, 366) == pytest.approx(3650.0)
+    assert climatology.gdd_between(tmean, 5, 100, 366) == climatology.gdd_between(tmean, 5, 100, 365)
+    assert climatology.gdd_between(tmean, 5, 366, 366) == pytest.approx(10.0)
+    # Wrapping from 31 Dec of a leap year into the next year
+    assert climatology.gdd_between(tmean, 5, 366, 2) == pytest.approx(30.0)
+
+
+@pytest.mark.parametrize("start, end", [(0, 10), (10, 367)])
+def test_gdd_between_rejects_out_of_range_doy(start, end):
+    with pytest.raises(ValueError):
+        climatology.gdd_between(np.zeros(366), 5, start, end)
+
+
+def test_collector_reuses_frost_build_daily_data(monkeypatch):
+    yearly = _yearly()
+    reads = []
+
+    def derive(station_id, fields=None):
+        reads.append(station_id)
+        return frost._compute_normal(station_id, yearly, fields), yearly
+
+    monkeypatch.setattr(frost, "derive_with_yearly", derive)
+    stations = [{"id": "SN1", "name": "A"}, {"id": "SN2", "name": "B"}]
+    out: list[climatology.DailyClimatology] = []
+    normals = frost.build(stations, on_yearly=climatology.collector(out))
+
+    assert reads == ["SN1", "SN2"]
+    assert [n["key"] for n in normals] == [c["key"] for c in out] == ["SN1", "SN2"]
+    assert out[0] == climatology.compute("SN1", yearly)
@@ -0,0 +1,39 @@
+import random
+
+import numpy as np
+
+from climate_data import frost
+
+
+def _station(seed: int) -> frost.Yearly:
+    # One-decimal temperatures, like Frost's, so month sums often land on .5
+    rnd = random.Random(seed)
+    yearly: frost.Yearly = {}
+    for year in range(1991, 2025):
+        n_days = 366 if year % 4 == 0 else 365
+        yearly[year] = {}
+        for doy in range(1, n_days + 1):
+            t = round(5 - 11 * np.cos(2 * np.pi * (doy - 20) / 365) + rnd.gauss(0, 3), 1)
+            yearly[year][doy] = {"tmin": round(t - 4, 1), "tmean": t}
+    return yearly
+
+
+def test_per_year_stats_medians_reproduce_the_normal():
+    for seed in range(20):
+        yearly = _station(seed)
+        normal = frost._compute_normal("SN1", yearly)
+        assert normal is not None
+        stats = frost.per_year_stats(yearly)
+        for field in ("gddCurve5", "gddCurve10"):
+            assert np.round(np.nanmedian(stats[field], axis=0)).astype(int).tolist() == normal[field]
+        assert int(round(float(np.nanmedian(stats["gdd5"])))) == normal["gdd5"]
+
+
+def test_grow_days_count_days_above_base():
+    yearly = _station(0)
+    normal = frost._compute_normal("SN1", yearly)
+    for base, field in ((5.0, "growDays5"), (10.0, "growDays10")):
+        totals = [sum(1 for v in days.values() if v["tmean"] > base) for days in yearly.values()]
+        assert normal[field][0] == 0
+        assert normal[field][12] == int(round(float(np.median(totals))))
+        assert normal[field] == sorted(normal[field])
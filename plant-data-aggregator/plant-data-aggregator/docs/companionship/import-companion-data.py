@@ -2,13 +2,23 @@
 """
 Import companion planting data into GardenTime database
 Maps plant names and creates bidirectional relationships
+
+Usage: python3 import-companion-data.py [--symmetric]
+    --symmetric  Store each pair in both directions (default: once, lower plant id first)
 """
 
+import argparse
 import json
 import sys
 from pathlib import Path
-from typing import Dict, Set, Tuple
-import psycopg2
+from typing import Dict
+
+SCRIPT_DIR = Path(__file__).parent
+# Shared import helpers live with the other importers
+sys.path.insert(0, str(SCRIPT_DIR.parent / 'scrapers'))
+import companion_loader
+import name_index
+import plant_db
 
 # Database connection settings
 DB_CONFIG = {
@@ -19,71 +29,8 @@ DB_CONFIG = {
     'password': 'gardentime'
 }
 
-SCRIPT_DIR = Path(__file__).parent
 COMPANION_FILE = SCRIPT_DIR / 'companionship-extended2.json'
 
-# Map companion data names to database plant names
-NAME_MAPPING = {
-    # Exact matches (case differences)
-    'Arugula': 'Arugula',
-    'Asparagus': 'Asparagus',
-    'Basil': 'Basil',
-    'Broccoli': 'Broccoli',
-    'Cabbage': 'Cabbage',
-    'Carrot': 'Carrot',
-    'Cauliflower': 'Cauliflower',
-    'Celery': 'Celery',
-    'Corn': 'Corn',
-    'Cucumber': 'Cucumber',
-    'Dill': 'Dill',
-    'Fennel': 'Fennel',
-    'Garlic': 'Garlic',
-    'Kale': 'Kale',
-    'Lettuce': 'Lettuce',
-    'Mint': 'Mint',
-    'Onion': 'Onion',
-    'Parsley': 'Parsley',
-    'Parsnip': 'Parsnip',
-    'Pepper': 'Pepper',
-    'Pumpkin': 'Pumpkin',
-    'Radish': 'Radish',
-    'Sage': 'Sage',
-    'Spinach': 'Spinach',
-    'Tomato': 'Tomato',
-    'Turnip': 'Turnip',
-    
-    # Plural to singular
-    'Beans': 'Bean',
-    'Peas': 'Pea',
-    'Brussels Sprouts': 'Brussels Sprouts',
-    'Leek': 'Leek',
-    'Leeks': 'Leek',
-    'Shallots': 'Shallot',
-    
-    # Special mappings
-    'Beetroot': 'Beet',
-    'Potato': 'Planting, Growing, and Harvesting Potato',
-    'Eggplant': 'Eggplant (Aubergines)',
-    'Strawberries': 'Strawberry Plant',
-    'Zucchini': 'Zucchini & Summer Squash',
-    'Squash': 'Zucchini & Summer Squash',  # Map to same
-    'Swiss Chard': 'Swiss Chard',
-    
-    # Herb mappings
-    'Chives': 'Chive',
-    'Cilantro': 'How to Plant and Grow Cilantro and Coriander',
-    'Thyme': 'Thyme Plant',
-    'Oregano': 'Oregano',
-    'Rosemary': 'Rosemary',
-}
-
-# Plants to skip (not in database - ornamental flowers/herbs)
-SKIP_PLANTS = {
-    'Chamomile', 'Marigold', 'Nasturtium', 'Rue', 'Borage',
-    'Calendula', 'Petunia', 'Zinnia', 'Lavender', 'Sunflower',
-    'Most plants'  # Special placeholder
-}
-
 # Relationship type mapping
 RELATIONSHIP_MAP = {
     'beneficial': 'BENEFICIAL',
@@ -94,7 +41,7 @@ RELATIONSHIP_MAP = {
 
 def get_db_connection():
     """Create database connection"""
-    return psycopg2.connect(**DB_CONFIG)
+    return plant_db.connect(**DB_CONFIG)
 
 
 def load_companion_data():
@@ -103,108 +50,27 @@ def load_companion_data():
         return json.load(f)
 
 
-def get_plant_id_map(conn) -> Dict[str, int]:
-    """Get mapping of plant name to ID from database"""
-    with conn.cursor() as cur:
-        cur.execute("SELECT id, name FROM plant_entity")
-        return {name: id for id, name in cur.fetchall()}
-
-
-def normalize_plant_name(name: str) -> str:
-    """Normalize plant name for database lookup"""
-    if name in SKIP_PLANTS:
-        return None
-    return NAME_MAPPING.get(name, name)
+def get_plant_id_map(cache: plant_db.LookupCache) -> Dict[str, int]:
+    """Get mapping of plant name to ID from the preloaded lookup cache"""
+    return cache.plants_by_name
 
 
-def clear_existing_companions(conn):
-    """Clear existing companion planting data"""
-    print("\n=== Clearing existing companion data ===")
-    with conn.cursor() as cur:
-        cur.execute("DELETE FROM plant_companions;")
-        conn.commit()
-    print("✓ Cleared existing companion relationships")
-
-
-def import_companions(conn, companion_data: dict, plant_id_map: Dict[str, int]):
+def import_companions(conn, companion_data: dict, symmetric: bool = False):
     """Import companion planting relationships"""
     print("\n=== Importing companion relationships ===")
     
-    relationships = []
-    skipped_plants = set()
-    unmapped_plants = set()
-    processed_pairs = set()  # Track to avoid duplicates
+    # Names resolve through the fuzzy name index (after companion_loader.NAME_ALIASES);
+    # ambiguous and unresolved ones are reported. The existing rows are replaced in the same transaction.
+    count, resolutions, conflicts = companion_loader.load_companions(
+        conn, companion_data, symmetric=symmetric, replace=True)
+    unresolved = {name for name, r in resolutions.items() if r.target is None}
     
-    for plant_name, companions in companion_data.items():
-        # Normalize source plant name
-        normalized_plant = normalize_plant_name(plant_name)
-        
-        if normalized_plant is None:
-            skipped_plants.add(plant_name)
-            continue
-        
-        if normalized_plant not in plant_id_map:
-            unmapped_plants.add(f"{plant_name} → {normalized_plant}")
-            continue
-        
-        plant_id = plant_id_map[normalized_plant]
-        
-        for companion_name, relationship in companions.items():
-            # Normalize companion plant name
-            normalized_companion = normalize_plant_name(companion_name)
-            
-            if normalized_companion is None:
-                skipped_plants.add(companion_name)
-                continue
-            
-            if normalized_companion not in plant_id_map:
-                unmapped_plants.add(f"{companion_name} → {normalized_companion}")
-                continue
-            
-            companion_id = plant_id_map[normalized_companion]
-            
-            # Skip self-references
-            if plant_id == companion_id:
-                continue
-            
-            # Map relationship type
-            rel_type = RELATIONSHIP_MAP.get(relationship.lower())
-            if not rel_type:
-                print(f"Warning: Unknown relationship type '{relationship}' for {plant_name} → {companion_name}")
-                continue
-            
-            # Create unique key for this pair (order-independent)
-            pair_key = tuple(sorted([plant_id, companion_id]))
-            
-            # Only add if not already processed
-            if pair_key not in processed_pairs:
-                relationships.append((plant_id, companion_id, rel_type))
-                processed_pairs.add(pair_key)
+    print(f"✓ Imported {count} companion relationships")
+    if conflicts:
+        print(f"  {len(conflicts)} pairs had different relationships per direction (kept the stronger one)")
+    name_index.print_report(resolutions)
     
-    # Insert relationships
-    if relationships:
-        with conn.cursor() as cur:
-            cur.executemany("""
-                INSERT INTO plant_companions (plant_id, companion_id, relationship)
-                VALUES (%s, %s, %s)
-                ON CONFLICT (plant_id, companion_id) DO UPDATE
-                SET relationship = EXCLUDED.relationship
-            """, relationships)
-            conn.commit()
-    
-    print(f"✓ Imported {len(relationships)} companion relationships")
-    
-    if skipped_plants:
-        print(f"\nSkipped {len(skipped_plants)} ornamental/non-vegetable plants:")
-        for plant in sorted(skipped_plants):
-            print(f"  - {plant}")
-    
-    if unmapped_plants:
-        print(f"\nWarning: {len(unmapped_plants)} plants could not be mapped:")
-        for mapping in sorted(unmapped_plants):
-            print(f"  - {mapping}")
-    
-    return len(relationships), skipped_plants, unmapped_plants
+    return count, unresolved
 
 
 def analyze_coverage(conn, plant_id_map: Dict[str, int]):
@@ -296,6 +162,11 @@ def verify_relationships(conn):
 
 def main():
     """Main import process"""
+    parser = argparse.ArgumentParser(description="Import companion planting data")
+    parser.add_argument('--symmetric', action='store_true',
+                        help="Store each pair in both directions")
+    args = parser.parse_args()
+    
     print("=" * 70)
     print("GardenTime Companion Planting Data Import")
     print("=" * 70)
@@ -310,14 +181,12 @@ def main():
         print(f"✓ Loaded companion data for {len(companion_data)} plants")
         
         # Get plant ID mapping
-        plant_id_map = get_plant_id_map(conn)
+        cache = plant_db.LookupCache(conn)
+        plant_id_map = get_plant_id_map(cache)
         print(f"✓ Found {len(plant_id_map)} plants in database")
         
-        # Clear existing data
-        clear_existing_companions(conn)
-        
-        # Import companion relationships
-        count, skipped, unmapped = import_companions(conn, companion_data, plant_id_map)
+        # Replace companion relationships
+        count, unresolved = import_companions(conn, companion_data, symmetric=args.symmetric)
         
         # Analyze coverage
         analyze_coverage(conn, plant_id_map)
@@ -328,6 +197,7 @@ def main():
         print("\n" + "=" * 70)
         print("✓ Import completed successfully!")
         print("=" * 70)
+        plant_db.print_query_report(cache)
         
         return 0
         
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Companion graph loader shared by the plant import scripts.
+
+The companion data is a nested dict, {plant name: {companion name: relationship}},
+and names may be display names or slugs. Loading it takes three steps:
+
+1. `load_name_index` reads every plant's id, slug, name and scientific name in
+   one query into a `name_index.NameIndex`, so "Potato" finds "Planting,
+   Growing, and Harvesting Potato" and "Strawberries" finds "Strawberry Plant"
+   without a hand-written mapping. Ambiguous and unresolved names are reported,
+   never guessed.
+2. `collect_pairs` resolves every name in memory. Each pair goes into canonical
+   order (lower id first) and is deduplicated, so "Tomato -> Basil" and
+   "Basil -> Tomato" become one row. When the two directions disagree, the
+   stronger relationship wins (UNFAVORABLE > BENEFICIAL > NEUTRAL), because an
+   antagonism reported from either side should not be lost. With
+   `symmetric=True` every pair is also emitted in reverse order.
+3. `write_pairs` COPYs the rows into a staging table and upserts
+   plant_companions in one statement.
+
+Memory and round trips stay flat in the size of the companion dataset: one
+query, one COPY, one upsert.
+"""
+
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import plant_db
+from name_index import NameIndex, Resolution, print_report
+
+RELATIONSHIP_MAP = {
+    'beneficial': 'BENEFICIAL',
+    'unfavorable': 'UNFAVORABLE',
+    'neutral': 'NEUTRAL',
+}
+# Which relationship survives when the two directions of a pair disagree
+PRECEDENCE = {'NEUTRAL': 0, 'BENEFICIAL': 1, 'UNFAVORABLE': 2}
+
+# Synonyms the name index can't work out from spelling ("Beetroot" scores 0.57
+# against "Beets"). Everything else ("Potato" -> "Planting, Growing, and
+# Harvesting Potato", "Strawberries" -> "Strawberry Plant", ...) is matched by
+# the fuzzy name index. Every loader resolves through these by default.
+NAME_ALIASES = {
+    'Beetroot': 'Beet',
+}
+
+Pair = Tuple[int, int]
+
+
+def load_name_index(conn) -> NameIndex:
+    """Index every plant's name, slug and scientific name, in one query."""
+    index = NameIndex()
+    with conn.cursor() as cur:
+        cur.execute("SELECT id, slug, name, scientific_name FROM plant_entity ORDER BY id")
+        for plant_id, slug, name, scientific_name in cur.fetchall():
+            index.add(plant_id, name)
+            index.add(plant_id, slug)
+            index.add(plant_id, scientific_name)
+    return index
+
+
+def index_resolver(index: NameIndex, aliases: Optional[Dict[str, str]] = None
+                   ) -> Tuple[Callable[[str], Optional[int]], Dict[str, Resolution]]:
+    """
+    Resolver over a `NameIndex`, plus the dict it records each name's Resolution in.
+
+    An alias replaces the name before lookup; use it for synonyms the index can't
+    see. Defaults to NAME_ALIASES.
+    """
+    aliases = NAME_ALIASES if aliases is None else aliases
+    resolutions: Dict[str, Resolution] = {}
+
+    def resolve(name: str) -> Optional[int]:
+        if name not in resolutions:
+            resolutions[name] = index.resolve(aliases.get(name, name))
+        return resolutions[name].target
+
+    return resolve, resolutions
+
+
+def relationship_of(value) -> Optional[str]:
+    """Relationship from a companion entry: a plain string, or a dict with a 'relationship' key."""
+    if isinstance(value, dict):
+        value = value.get('relationship', 'NEUTRAL')
+    return RELATIONSHIP_MAP.get(str(value).lower())
+
+
+def collect_pairs(companion_data: Dict[str, Dict[str, object]],
+                  resolve: Callable[[str], Optional[int]],
+                  symmetric: bool = False):
+    """
+    Resolve and deduplicate the companion graph in memory.
+
+    Returns (rows, unresolved names, conflicting pairs). Rows are
+    (plant_id, companion_id, relationship) tuples.
+    """
+    resolved: Dict[str, Optional[int]] = {}
+    unresolved: Set[str] = set()
+    pairs: Dict[Pair, str] = {}
+    conflicts: Set[Pair] = set()
+
+    def lookup(name: str) -> Optional[int]:
+        if name not in resolved:
+            resolved[name] = resolve(name)
+            if resolved[name] is None:
+                unresolved.add(name)
+        return resolved[name]
+
+    for plant_name, partners in companion_data.items():
+        plant_id = lookup(plant_name)
+        if plant_id is None:
+            continue
+        for companion_name, value in partners.items():
+            companion_id = lookup(companion_name)
+            rel = relationship_of(value)
+            if companion_id is None or companion_id == plant_id or rel is None:
+                continue
+            key = (plant_id, companion_id) if plant_id < companion_id else (companion_id, plant_id)
+            old = pairs.get(key)
+            if old is not None and old != rel:
+                conflicts.add(key)
+                if PRECEDENCE[old] >= PRECEDENCE[rel]:
+                    continue
+            pairs[key] = rel
+
+    rows = [(a, b, rel) for (a, b), rel in sorted(pairs.items())]
+    if symmetric:
+        rows += [(b, a, rel) for a, b, rel in rows]
+    return rows, unresolved, conflicts
+
+
+def write_pairs(conn, rows: List[Tuple[int, int, str]], replace: bool = False, commit: bool = True) -> int:
+    """COPY companion rows into a staging table and upsert them in one statement; returns rows written.
+
+    replace=True deletes every existing companion row first (same transaction), along
+    with the companion hashes in plant_import_manifest: the table no longer holds
+    what they describe.
+    """
+    started = time.perf_counter()
+    with conn.cursor() as cur:
+        if replace:
+            cur.execute("DELETE FROM plant_companions")
+            cur.execute("DELETE FROM plant_import_manifest WHERE kind = 'companions'")
+        cur.execute("""
+            CREATE TEMP TABLE staging_companions (
+                plant_id BIGINT NOT NULL,
+                companion_id BIGINT NOT NULL,
+                relationship VARCHAR(20) NOT NULL
+            ) ON COMMIT DROP
+        """)
+        plant_db.copy_rows(cur, 'staging_companions', ['plant_id', 'companion_id', 'relationship'], rows)
+        cur.execute("""
+            INSERT INTO plant_companions (plant_id, companion_id, relationship)
+            SELECT plant_id, companion_id, relationship FROM staging_companions
+            ON CONFLICT (plant_id, companion_id) DO UPDATE SET relationship = EXCLUDED.relationship
+        """)
+        written = cur.rowcount
+    if commit:
+        conn.commit()
+    plant_db.print_throughput('plant_companions', len(rows), time.perf_counter() - started, written)
+    return written
+
+
+def load_companions(conn, companion_data: Dict[str, Dict[str, object]],
+                    aliases: Optional[Dict[str, str]] = None,
+                    symmetric: bool = False, replace: bool = False, commit: bool = True):
+    """Resolve, dedupe and write a companion dataset. Returns (rows written, resolutions, conflicts).
+
+    aliases defaults to NAME_ALIASES.
+    """
+    resolve, resolutions = index_resolver(load_name_index(conn), aliases)
+    rows, _, conflicts = collect_pairs(companion_data, resolve, symmetric)
+    written = write_pairs(conn, rows, replace=replace, commit=commit)
+    return written, resolutions, conflicts
+
+
+def print_summary(written: int, resolutions: Dict[str, Resolution], conflicts: Iterable[Pair]):
+    conflicts = list(conflicts)
+    print(f"✅ Companion relationships written: {written}")
+    if conflicts:
+        print(f"  ⚠️  {len(conflicts)} pairs listed with different relationships in each direction "
+              f"(kept the stronger one)")
+    print_report(resolutions)
@@ -2,6 +2,11 @@
 """
 Fetch Trefle API data for all scraped plants.
 Creates a mapping file with botanical information.
+
+Each search returns a list of Trefle plants. Instead of taking the first hit,
+the results are ranked with name_index.NameIndex against the plant's common
+name, slug and (if known) scientific name. Matches that are ambiguous or too
+weak are left unmatched and listed in the output metadata for review.
 """
 
 import json
@@ -9,12 +14,15 @@ import os
 import time
 import requests
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
+
+from name_index import NameIndex, Resolution
 
 TREFLE_API_KEY = os.environ.get('TREFLE_API_KEY', '')
 TREFLE_BASE_URL = 'https://trefle.io/api/v1'
 
-# Common name to scientific name mapping (known mappings)
+# Scientific name hints by slug. Optional: they only sharpen the search query
+# and add a label to match on; plants without one are matched by common name.
 COMMON_TO_SCIENTIFIC = {
     'tomatoes': 'Solanum lycopersicum',
     'peppers': 'Capsicum annuum',
@@ -62,11 +70,11 @@ COMMON_TO_SCIENTIFIC = {
     'bok-choy': 'Brassica rapa subsp. chinensis',
 }
 
-def search_trefle(query: str, token: str) -> Optional[Dict]:
-    """Search Trefle API for a plant."""
+def search_trefle(query: str, token: str) -> List[Dict]:
+    """Search Trefle API for a plant. Returns every result on the first page."""
     if not token:
         print("⚠️  No TREFLE_API_KEY found in environment")
-        return None
+        return []
     
     url = f"{TREFLE_BASE_URL}/plants/search"
     params = {'token': token, 'q': query}
@@ -75,8 +83,7 @@ def search_trefle(query: str, token: str) -> Optional[Dict]:
         response = requests.get(url, params=params, timeout=10)
         if response.status_code == 200:
             data = response.json()
-            if data.get('data') and len(data['data']) > 0:
-                return data['data'][0]  # Return first match
+            return data.get('data') or []
         elif response.status_code == 429:
             print("⚠️  Rate limited by Trefle API")
             time.sleep(60)  # Wait a minute
@@ -86,7 +93,32 @@ def search_trefle(query: str, token: str) -> Optional[Dict]:
     except Exception as e:
         print(f"❌ Error calling Trefle: {e}")
     
-    return None
+    return []
+
+def pick_trefle_match(results: List[Dict], queries: List[str]) -> Tuple[Optional[Dict], Optional[Resolution]]:
+    """
+    Rank search results by name similarity to any of the queries.
+
+    Returns (best result or None, the Resolution it came from). The best
+    resolved query wins; if none resolves, the strongest ambiguous or
+    unresolved Resolution is returned for reporting.
+    """
+    index = NameIndex()
+    for i, plant in enumerate(results):
+        for label in (plant.get('common_name'), plant.get('scientific_name'), plant.get('slug')):
+            index.add(i, label)
+    
+    best: Optional[Resolution] = None
+    for query in queries:
+        resolution = index.resolve(query)
+        if not resolution.candidates:
+            continue
+        rank = (resolution.target is not None, resolution.candidates[0].score)
+        if best is None or rank > (best.target is not None, best.candidates[0].score):
+            best = resolution
+    if best is None or best.target is None:
+        return None, best
+    return results[best.target], best
 
 def get_plant_details(plant_id: int, token: str) -> Optional[Dict]:
     """Get detailed plant information from Trefle."""
@@ -120,17 +152,29 @@ def process_plant(common_name: str, slug: str, api_key: str) -> Dict:
         'scientific_name': None,
         'family': None,
         'genus': None,
+        'match': None,
+        'match_score': None,
+        'candidates': [],
         'data': None
     }
     
-    # Try scientific name mapping first
+    # Search by the scientific hint if there is one, else by the common name
     scientific_name = COMMON_TO_SCIENTIFIC.get(slug)
     search_query = scientific_name if scientific_name else common_name
     
     print(f"🔍 Searching Trefle for: {common_name} ({search_query})...")
     
-    # Search Trefle
-    search_result = search_trefle(search_query, api_key)
+    # Search Trefle and rank every result against all the names we know
+    results = search_trefle(search_query, api_key)
+    queries = [q for q in (scientific_name, common_name, slug) if q]
+    search_result, resolution = pick_trefle_match(results, queries)
+    if resolution is not None:
+        result['match'] = resolution.status
+        result['match_score'] = resolution.candidates[0].score
+        result['candidates'] = [
+            {'trefle_id': results[c.target].get('id'), 'label': c.label, 'score': c.score}
+            for c in resolution.candidates[:3]
+        ]
     
     if search_result:
         plant_id = search_result.get('id')
@@ -140,7 +184,8 @@ def process_plant(common_name: str, slug: str, api_key: str) -> Dict:
         result['family'] = search_result.get('family')
         result['genus'] = search_result.get('genus')
         
-        print(f"   ✓ Found: {result['scientific_name']} (Family: {result['family']})")
+        print(f"   ✓ Found: {result['scientific_name']} (Family: {result['family']}, "
+              f"{result['match']} match {result['match_score']:.2f})")
         
         # Get detailed data
         time.sleep(0.6)  # Rate limiting: max 120 requests/minute
@@ -148,6 +193,9 @@ def process_plant(common_name: str, slug: str, api_key: str) -> Dict:
         if details:
             result['data'] = details
             print(f"   ✓ Retrieved detailed data")
+    elif result['match'] == 'ambiguous':
+        options = ', '.join(f"{c['label']} ({c['score']:.2f})" for c in result['candidates'])
+        print(f"   ⚠️  Ambiguous, left unmatched: {options}")
     else:
         print(f"   ❌ Not found in Trefle")
     
@@ -174,6 +222,7 @@ def fetch_trefle_data_for_all_plants():
     
     results = []
     found_count = 0
+    ambiguous = []
     
     for i, json_file in enumerate(sorted(json_files), 1):
         try:
@@ -190,6 +239,8 @@ def fetch_trefle_data_for_all_plants():
             
             if result['trefle_found']:
                 found_count += 1
+            elif result['match'] == 'ambiguous':
+                ambiguous.append(slug)
             
             time.sleep(0.6)  # Rate limiting
             
@@ -203,6 +254,7 @@ def fetch_trefle_data_for_all_plants():
             'total_plants': len(results),
             'found_in_trefle': found_count,
             'not_found': len(results) - found_count,
+            'ambiguous': ambiguous,
             'description': 'Trefle API botanical data for scraped plants'
         },
         'plants': results
@@ -217,6 +269,8 @@ def fetch_trefle_data_for_all_plants():
     print(f"   🌱 Total plants: {len(results)}")
     print(f"   ✓ Found in Trefle: {found_count}")
     print(f"   ❌ Not found: {len(results) - found_count}")
+    if ambiguous:
+        print(f"   ⚠️  Ambiguous (see 'candidates'): {', '.join(ambiguous)}")
     
     # Summary by family
     families = {}
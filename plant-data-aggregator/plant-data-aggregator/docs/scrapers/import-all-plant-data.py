@@ -7,6 +7,14 @@ Imports:
 - Pests and diseases
 - Links between plants and pests/diseases
 - Edible parts
+
+WARNING: this is a destructive full reload. clear_existing_plants also deletes
+crop records, planned crops and the rotation cache, and resets the plant id
+sequence. It also empties plant_import_manifest, so the next import-plants.py
+run re-imports every record (including companions, which this script does not
+load). The rotation cache is recomputed at the end (rotation_cache.py).
+For routine (re-)imports use import-plants.py, which only writes changed
+records and leaves user data alone.
 """
 
 import json
@@ -14,9 +22,11 @@ import os
 import re
 from pathlib import Path
 from typing import Dict, List, Set, Optional
-import psycopg2
 from psycopg2.extras import execute_batch
 
+import plant_db
+import rotation_cache
+
 # Database connection settings
 DB_CONFIG = {
     'host': 'localhost',
@@ -35,7 +45,7 @@ TREFLE_FILE = SCRIPT_DIR / 'trefle-botanical-data.json'
 
 def get_db_connection():
     """Create database connection"""
-    return psycopg2.connect(**DB_CONFIG)
+    return plant_db.connect(**DB_CONFIG)
 
 
 def clear_existing_plants(conn):
@@ -52,6 +62,8 @@ def clear_existing_plants(conn):
         cur.execute("DELETE FROM planned_crops;")
         cur.execute("DELETE FROM plant_details;")
         cur.execute("DELETE FROM plant_entity;")
+        # The hashes describe rows that no longer exist; import-plants.py must reload everything
+        cur.execute("DELETE FROM plant_import_manifest;")
         
         # Reset sequence
         cur.execute("ALTER SEQUENCE plant_entity_id_seq RESTART WITH 1;")
@@ -74,17 +86,6 @@ def normalize_name(name: str) -> str:
     return name.strip()
 
 
-def get_family_id(conn, family_name: str) -> Optional[int]:
-    """Get family ID from name"""
-    if not family_name:
-        return None
-    
-    with conn.cursor() as cur:
-        cur.execute("SELECT id FROM plant_families WHERE name = %s", (family_name,))
-        result = cur.fetchone()
-        return result[0] if result else None
-
-
 def determine_feeder_type(family_name: str, is_nitrogen_fixer: bool) -> Optional[str]:
     """Determine feeder type based on family"""
     if is_nitrogen_fixer:
@@ -105,7 +106,7 @@ def determine_feeder_type(family_name: str, is_nitrogen_fixer: bool) -> Optional
     return feeder_map.get(family_name)
 
 
-def import_plants(conn):
+def import_plants(conn, cache: plant_db.LookupCache):
     """Import all plants from parsed JSON files"""
     print("\n=== Importing plants ===")
     
@@ -134,7 +135,7 @@ def import_plants(conn):
         genus = trefle.get('genus')
         
         # Get family ID
-        family_id = get_family_id(conn, family_name)
+        family_id = cache.family_id(family_name)
         
         # Determine if nitrogen fixer (Fabaceae family)
         is_nitrogen_fixer = family_name == 'Fabaceae'
@@ -207,6 +208,7 @@ def import_plants(conn):
             cur.execute(insert_sql, plant_data)
             plant_id, slug = cur.fetchone()
             plant_id_map[slug] = (plant_id, edible_parts)
+            cache.add_plant(plant_id, slug, plant_data['name'])
             plants_imported += 1
         
         conn.commit()
@@ -215,21 +217,17 @@ def import_plants(conn):
     return plant_id_map
 
 
-def import_edible_parts(conn, plant_id_map: Dict[str, tuple]):
+def import_edible_parts(conn, cache: plant_db.LookupCache, plant_id_map: Dict[str, tuple]):
     """Import edible parts for plants"""
     print("\n=== Importing edible parts ===")
     
-    # Get edible part IDs
-    with conn.cursor() as cur:
-        cur.execute("SELECT id, name FROM edible_parts")
-        edible_part_ids = {name: id for id, name in cur.fetchall()}
-    
     # Insert plant-edible part relationships
     relationships = []
     for slug, (plant_id, edible_parts) in plant_id_map.items():
         for part in edible_parts:
-            if part in edible_part_ids:
-                relationships.append((plant_id, edible_part_ids[part]))
+            part_id = cache.edible_part_id(part)
+            if part_id is not None:
+                relationships.append((plant_id, part_id))
     
     with conn.cursor() as cur:
         execute_batch(
@@ -242,7 +240,7 @@ def import_edible_parts(conn, plant_id_map: Dict[str, tuple]):
     print(f"✓ Imported {len(relationships)} edible part relationships")
 
 
-def import_pests_and_diseases(conn, plant_id_map: Dict[str, tuple]):
+def import_pests_and_diseases(conn, cache: plant_db.LookupCache, plant_id_map: Dict[str, tuple]):
     """Import pests and diseases and link to plants"""
     print("\n=== Importing pests and diseases ===")
     
@@ -263,6 +261,7 @@ def import_pests_and_diseases(conn, plant_id_map: Dict[str, tuple]):
             """, (normalized, pest_name, f"Affects {pest_data['plant_count']} plants"))
             
             pest_id_map[pest_name] = cur.fetchone()[0]
+            cache.add_pest(normalized, pest_id_map[pest_name])
         
         conn.commit()
     
@@ -282,6 +281,7 @@ def import_pests_and_diseases(conn, plant_id_map: Dict[str, tuple]):
             """, (normalized, disease_name, f"Affects {disease_data['plant_count']} plants"))
             
             disease_id_map[disease_name] = cur.fetchone()[0]
+            cache.add_disease(normalized, disease_id_map[disease_name])
         
         conn.commit()
     
@@ -402,17 +402,24 @@ def main():
         # Clear existing data
         clear_existing_plants(conn)
         
+        # Reference tables are read once, after the clear so no stale plant ids remain
+        cache = plant_db.LookupCache(conn)
+        
         # Import plants
-        plant_id_map = import_plants(conn)
+        plant_id_map = import_plants(conn, cache)
         
         # Import edible parts
-        import_edible_parts(conn, plant_id_map)
+        import_edible_parts(conn, cache, plant_id_map)
         
         # Import pests and diseases
-        import_pests_and_diseases(conn, plant_id_map)
+        import_pests_and_diseases(conn, cache, plant_id_map)
+        
+        # Refill the rotation cache cleared above
+        rotation_cache.precompute(conn)
         
         # Verify
         verify_import(conn)
+        plant_db.print_query_report(cache)
         
         print("\n" + "=" * 70)
         print("✓ Import completed successfully!")
@@ -9,7 +9,12 @@ This script imports plant data from multiple sources into the GardenTime databas
 4. Companionship data
 
 Usage:
-    python3 import-plant-data.py
+    python3 import-plant-data.py [--bulk] [--symmetric-companions]
+
+    --bulk  Set-based import: plants are COPYed into staging tables and
+            upserted in one statement (existing plants are updated); pests,
+            diseases and their plant links are written one statement per table
+    --symmetric-companions  Store each companion pair in both directions
 
 Prerequisites:
     pip install psycopg2-binary
@@ -22,85 +27,18 @@ Environment variables:
     DB_PASSWORD (required)
 """
 
-import json
+import argparse
 import os
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-import psycopg2
-from psycopg2.extras import execute_values
-from datetime import datetime
-
-# Manual family mapping for plants not found in Trefle
-MANUAL_FAMILY_MAP = {
-    "apples": "Rosaceae",
-    "artichokes": "Asteraceae",
-    "asparagus": "Asparagaceae",
-    "blackberries": "Rosaceae",
-    "cantaloupes": "Cucurbitaceae",
-    "cauliflower": "Brassicaceae",
-    "cherries": "Rosaceae",
-    "collards": "Brassicaceae",
-    "corn": "Poaceae",
-    "edamame": "Fabaceae",
-    "fava-beans": "Fabaceae",
-    "fennel": "Apiaceae",
-    "grapes": "Vitaceae",
-    "honeydew-melons": "Cucurbitaceae",
-    "horseradish": "Brassicaceae",
-    "kohlrabi": "Brassicaceae",
-    "mustard-greens": "Brassicaceae",
-    "okra": "Malvaceae",
-    "peaches": "Rosaceae",
-    "peanuts": "Fabaceae",
-    "pears": "Rosaceae",
-    "plums": "Rosaceae",
-    "rhubarb": "Polygonaceae",
-    "rutabagas": "Brassicaceae",
-    "salsify": "Asteraceae",
-    "shallots": "Amaryllidaceae",
-    "tomatillos": "Solanaceae",
-    "watermelon": "Cucurbitaceae",
-}
 
-# Derive feeder type from family and soil nutrients
-def derive_feeder_type(family: str, soil_nutrients: Optional[int]) -> str:
-    """Derive feeder type from family and soil nutrient requirements."""
-    if family == "Fabaceae":
-        return "NITROGEN_FIXER"
-    
-    heavy_feeders = ["Solanaceae", "Brassicaceae", "Cucurbitaceae", "Poaceae"]
-    light_feeders = ["Amaryllidaceae", "Asteraceae", "Lamiaceae"]
-    
-    if family in heavy_feeders:
-        return "HEAVY"
-    elif family in light_feeders:
-        return "LIGHT"
-    else:
-        # Use soil nutrients if available
-        if soil_nutrients:
-            if soil_nutrients >= 7:
-                return "HEAVY"
-            elif soil_nutrients <= 4:
-                return "LIGHT"
-            else:
-                return "MODERATE"
-        return "MODERATE"
+import companion_loader
+import plant_db
+from plant_records import build_plant_record, load_json_file, load_trefle_by_slug, slug_from_filename
 
 def get_db_connection():
     """Create database connection."""
-    return psycopg2.connect(
-        host=os.getenv("DB_HOST", "localhost"),
-        port=os.getenv("DB_PORT", "5432"),
-        database=os.getenv("DB_NAME", "gardentime"),
-        user=os.getenv("DB_USER", "postgres"),
-        password=os.getenv("DB_PASSWORD")
-    )
-
-def load_json_file(filepath: Path) -> Any:
-    """Load and parse JSON file."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return plant_db.connect_from_env()
 
 def import_plant_families(conn):
     """Import plant families (already in V9 migration, just verify)."""
@@ -118,33 +56,10 @@ def import_edible_parts(conn):
         print(f"✓ Edible parts: {count} rows")
         return count
 
-def get_family_id(conn, family_name: str) -> Optional[int]:
-    """Get family ID by name."""
-    with conn.cursor() as cur:
-        cur.execute("SELECT id FROM plant_families WHERE name = %s", (family_name,))
-        result = cur.fetchone()
-        return result[0] if result else None
-
-def get_edible_part_id(conn, part_name: str) -> Optional[int]:
-    """Get edible part ID by name."""
-    with conn.cursor() as cur:
-        cur.execute("SELECT id FROM edible_parts WHERE name = %s", (part_name,))
-        result = cur.fetchone()
-        return result[0] if result else None
-
-def import_plants(conn, scraped_dir: Path, trefle_file: Path):
+def import_plants(conn, cache: plant_db.LookupCache, scraped_dir: Path, trefle_file: Path):
     """Import plants from scraped data and Trefle data."""
     
-    # Load Trefle data
-    trefle_data = load_json_file(trefle_file)
-    trefle_by_slug = {}
-    
-    for plant in trefle_data.get('plants', []):
-        slug = plant.get('slug')
-        if slug:
-            trefle_by_slug[slug] = plant
-    
-    print(f"Loaded {len(trefle_by_slug)} plants from Trefle data")
+    trefle_by_slug = load_trefle_by_slug(trefle_file)
     
     # Process extracted text files
     extracted_dir = scraped_dir / "extracted-text"
@@ -158,9 +73,9 @@ def import_plants(conn, scraped_dir: Path, trefle_file: Path):
     with conn.cursor() as cur:
         for json_file in json_files:
             plant_data = load_json_file(json_file)
-            
-            common_name = plant_data.get('commonName')
-            slug = json_file.stem.replace('_extracted_20251104', '').replace('_extracted', '')
+            slug = slug_from_filename(json_file)
+            record = build_plant_record(slug, plant_data, trefle_by_slug)
+            common_name = record['name']
             
             if not common_name:
                 print(f"  ⚠️  Skipping {json_file.name}: no commonName")
@@ -168,34 +83,13 @@ def import_plants(conn, scraped_dir: Path, trefle_file: Path):
                 continue
             
             # Check if plant already exists
-            cur.execute("SELECT id FROM plant_entity WHERE slug = %s", (slug,))
-            existing = cur.fetchone()
-            
-            if existing:
+            if cache.plant_id(slug) is not None:
                 print(f"  ⚠️  Skipping {common_name}: already exists (slug: {slug})")
                 skipped += 1
                 continue
             
-            # Get Trefle data if available
-            trefle = trefle_by_slug.get(slug, {})
-            trefle_main = trefle.get('data', {}).get('main_species', {}) if trefle.get('data') else {}
-            trefle_growth = trefle_main.get('growth', {}) if trefle_main else {}
-            
-            # Get family
-            family_name = None
-            if trefle.get('family'):
-                family_name = trefle['family']
-            elif slug in MANUAL_FAMILY_MAP:
-                family_name = MANUAL_FAMILY_MAP[slug]
-            
-            family_id = get_family_id(conn, family_name) if family_name else None
-            
-            # Determine if nitrogen fixer
-            is_nitrogen_fixer = family_name == "Fabaceae"
-            
-            # Derive feeder type
-            soil_nutrients = trefle_growth.get('soil_nutriments') if trefle_growth else None
-            feeder_type = derive_feeder_type(family_name or "", soil_nutrients) if family_name else None
+            family_name = record['family_name']
+            family_id = cache.family_id(family_name)
             
             # Insert plant
             cur.execute("""
@@ -210,44 +104,24 @@ def import_plants(conn, scraped_dir: Path, trefle_file: Path):
                     notes, is_nitrogen_fixer, feeder_type,
                     soil_ph_min, soil_ph_max
                 ) VALUES (
-                    %s, %s, %s, %s,
-                    %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s,
-                    %s, %s, %s,
-                    %s, %s, %s,
-                    %s, %s,
-                    %s, %s, %s,
-                    %s, %s, %s,
-                    %s, %s
+                    %(name)s, %(slug)s, %(scientific_name)s, %(genus)s,
+                    %(family_id)s, %(cycle)s, %(sun_needs)s, %(water_needs)s, %(root_depth)s, %(growth_habit)s,
+                    %(soil_temp_min_f)s, %(soil_temp_optimal_f)s, %(frost_tolerant)s,
+                    %(spacing_min_inches)s, %(spacing_max_inches)s, %(planting_depth_inches)s,
+                    %(container_suitable)s, %(requires_staking)s, %(requires_pruning)s,
+                    %(days_to_maturity_min)s, %(days_to_maturity_max)s,
+                    %(watering_inches_per_week)s, %(fertilizing_frequency_weeks)s, %(mulch_recommended)s,
+                    %(notes)s, %(is_nitrogen_fixer)s, %(feeder_type)s,
+                    %(soil_ph_min)s, %(soil_ph_max)s
                 ) RETURNING id
-            """, (
-                common_name, slug, trefle.get('scientific_name'), trefle.get('genus'),
-                family_id, plant_data.get('cycle'), plant_data.get('sunNeeds'), 
-                plant_data.get('waterNeeds'), plant_data.get('rootDepth'), 
-                plant_data.get('growthHabit'),
-                plant_data.get('soilTempMinF'), plant_data.get('soilTempOptimalF'),
-                plant_data.get('frostTolerant', False),
-                plant_data.get('spacingMin'), plant_data.get('spacingMax'),
-                plant_data.get('plantingDepthInches'),
-                plant_data.get('containerSuitable', False),
-                plant_data.get('requiresStaking', False),
-                plant_data.get('requiresPruning', False),
-                plant_data.get('daysToMaturityMin'), plant_data.get('daysToMaturityMax'),
-                plant_data.get('wateringInchesPerWeek'),
-                plant_data.get('fertilizingFrequencyWeeks'),
-                plant_data.get('mulchRecommended', True),
-                plant_data.get('notes'),
-                is_nitrogen_fixer, feeder_type,
-                trefle_growth.get('ph_minimum') if trefle_growth else None,
-                trefle_growth.get('ph_maximum') if trefle_growth else None
-            ))
+            """, {**record, 'family_id': family_id})
             
             plant_id = cur.fetchone()[0]
+            cache.add_plant(plant_id, slug, common_name)
             
             # Import edible parts
-            edible_parts = plant_data.get('edibleParts', [])
-            for part_name in edible_parts:
-                part_id = get_edible_part_id(conn, part_name)
+            for part_name in record['edible_parts']:
+                part_id = cache.edible_part_id(part_name)
                 if part_id:
                     cur.execute("""
                         INSERT INTO plant_edible_parts (plant_id, edible_part_id)
@@ -262,7 +136,32 @@ def import_plants(conn, scraped_dir: Path, trefle_file: Path):
     print(f"\n✅ Plants imported: {imported}, skipped: {skipped}")
     return imported
 
-def import_pests_diseases(conn, pests_diseases_file: Path):
+def import_plants_bulk(conn, cache: plant_db.LookupCache, scraped_dir: Path, trefle_file: Path):
+    """Import all plants set-based: COPY into staging tables, then one upsert.
+    
+    Unlike import_plants, existing plants (same slug) are updated, not skipped.
+    """
+    
+    trefle_by_slug = load_trefle_by_slug(trefle_file)
+    
+    json_files = list((scraped_dir / "extracted-text").glob("*.json"))
+    print(f"Found {len(json_files)} plant files to import")
+    
+    records = [
+        build_plant_record(slug_from_filename(f), load_json_file(f), trefle_by_slug)
+        for f in json_files
+    ]
+    stats = plant_db.bulk_import_plants(conn, records)
+    cache.refresh_plants(conn)
+    
+    print(f"\n✅ Plants inserted: {stats['inserted']}, updated: {stats['updated']}, "
+          f"skipped: {stats['skipped']} (no commonName)")
+    print(f"   Edible part links: {stats['edible_parts']}")
+    if stats['unknown_family']:
+        print(f"  ⚠️  {stats['unknown_family']} plants name a family missing from plant_families")
+    return stats['inserted'] + stats['updated']
+
+def import_pests_diseases(conn, cache: plant_db.LookupCache, pests_diseases_file: Path):
     """Import pests and diseases."""
     
     data = load_json_file(pests_diseases_file)
@@ -278,6 +177,7 @@ def import_pests_diseases(conn, pests_diseases_file: Path):
                 RETURNING id
             """, (pest_name, pest_name.lower()))
             pests_map[pest_name] = cur.fetchone()[0]
+            cache.add_pest(pest_name, pests_map[pest_name])
     
     print(f"✓ Imported {len(pests_map)} pests")
     
@@ -292,6 +192,7 @@ def import_pests_diseases(conn, pests_diseases_file: Path):
                 RETURNING id
             """, (disease_name, disease_name.lower()))
             diseases_map[disease_name] = cur.fetchone()[0]
+            cache.add_disease(disease_name, diseases_map[disease_name])
     
     print(f"✓ Imported {len(diseases_map)} diseases")
     
@@ -301,11 +202,9 @@ def import_pests_diseases(conn, pests_diseases_file: Path):
             slug = plant_data.get('slug')
             
             # Get plant ID
-            cur.execute("SELECT id FROM plant_entity WHERE slug = %s", (slug,))
-            result = cur.fetchone()
-            if not result:
+            plant_id = cache.plant_id(slug)
+            if plant_id is None:
                 continue
-            plant_id = result[0]
             
             # Link pests
             for pest_name in plant_data.get('pests', []):
@@ -328,50 +227,57 @@ def import_pests_diseases(conn, pests_diseases_file: Path):
     conn.commit()
     print("✅ Linked plants to pests and diseases")
 
-def import_companions(conn, companions_file: Path):
-    """Import companion planting relationships."""
-    
-    data = load_json_file(companions_file)
+def import_pests_diseases_bulk(conn, cache: plant_db.LookupCache, pests_diseases_file: Path):
+    """Import pests and diseases set-based: one upsert per index, one insert per join table."""
     
-    imported = 0
-    skipped = 0
+    data = load_json_file(pests_diseases_file)
     
     with conn.cursor() as cur:
-        for plant_slug, companions in data.items():
-            # Get plant ID
-            cur.execute("SELECT id FROM plant_entity WHERE slug = %s", (plant_slug,))
-            result = cur.fetchone()
-            if not result:
-                skipped += 1
+        pests_map = plant_db.upsert_by_name(
+            cur, "pests", {name: name.lower() for name in data.get('pests_index', {})})
+        diseases_map = plant_db.upsert_by_name(
+            cur, "diseases", {name: name.lower() for name in data.get('diseases_index', {})})
+        for name, pest_id in pests_map.items():
+            cache.add_pest(name, pest_id)
+        for name, disease_id in diseases_map.items():
+            cache.add_disease(name, disease_id)
+        
+        print(f"✓ Imported {len(pests_map)} pests")
+        print(f"✓ Imported {len(diseases_map)} diseases")
+        
+        # Resolve every link in memory, then write each join table in one statement
+        pest_links = []
+        disease_links = []
+        for plant_data in data.get('plants', []):
+            plant_id = cache.plant_id(plant_data.get('slug'))
+            if plant_id is None:
                 continue
-            plant_id = result[0]
-            
-            for companion_slug, relationship_data in companions.items():
-                # Get companion ID
-                cur.execute("SELECT id FROM plant_entity WHERE slug = %s", (companion_slug,))
-                result = cur.fetchone()
-                if not result:
-                    continue
-                companion_id = result[0]
-                
-                relationship = relationship_data.get('relationship', 'NEUTRAL')
-                reason = relationship_data.get('reason', '')
-                
-                # Insert bidirectional relationship
-                cur.execute("""
-                    INSERT INTO plant_companions (plant_id, companion_id, relationship, reason)
-                    VALUES (%s, %s, %s, %s)
-                    ON CONFLICT (plant_id, companion_id) DO NOTHING
-                """, (plant_id, companion_id, relationship, reason))
-                
-                imported += 1
+            pest_links += [(plant_id, pests_map[p]) for p in plant_data.get('pests', []) if p in pests_map]
+            disease_links += [(plant_id, diseases_map[d]) for d in plant_data.get('diseases', []) if d in diseases_map]
+        
+        plant_db.insert_links(cur, "plant_pests", ("plant_id", "pest_id"), pest_links)
+        plant_db.insert_links(cur, "plant_diseases", ("plant_id", "disease_id"), disease_links)
     
     conn.commit()
-    print(f"✅ Companion relationships imported: {imported}, skipped: {skipped}")
+    print("✅ Linked plants to pests and diseases")
+
+def import_companions(conn, companions_file: Path, symmetric: bool = False):
+    """Import companion planting relationships (resolved, deduplicated and written in bulk)."""
+    
+    data = load_json_file(companions_file)
+    written, resolutions, conflicts = companion_loader.load_companions(conn, data, symmetric=symmetric)
+    companion_loader.print_summary(written, resolutions, conflicts)
 
 def main():
     """Main import function."""
     
+    parser = argparse.ArgumentParser(description="Import plant data into the GardenTime database")
+    parser.add_argument("--bulk", action="store_true",
+                        help="Set-based import: COPY + one upsert for plants, one statement per pest/disease table")
+    parser.add_argument("--symmetric-companions", action="store_true",
+                        help="Store each companion pair in both directions")
+    args = parser.parse_args()
+    
     # Check for DB password
     if not os.getenv("DB_PASSWORD"):
         print("❌ DB_PASSWORD environment variable required")
@@ -412,6 +318,8 @@ def main():
         sys.exit(1)
     
     try:
+        cache = plant_db.LookupCache(conn)
+        
         # Import in order
         print("1. Verifying plant families...")
         import_plant_families(conn)
@@ -422,17 +330,25 @@ def main():
         print()
         
         print("3. Importing plants...")
-        import_plants(conn, scraped_dir, trefle_file)
+        if args.bulk:
+            import_plants_bulk(conn, cache, scraped_dir, trefle_file)
+        else:
+            import_plants(conn, cache, scraped_dir, trefle_file)
         print()
         
         print("4. Importing pests and diseases...")
-        import_pests_diseases(conn, pests_diseases_file)
+        if args.bulk:
+            import_pests_diseases_bulk(conn, cache, pests_diseases_file)
+        else:
+            import_pests_diseases(conn, cache, pests_diseases_file)
         print()
         
         print("5. Importing companion relationships...")
-        import_companions(conn, companions_file)
+        import_companions(conn, companions_file, symmetric=args.symmetric_companions)
         print()
         
+        plant_db.print_query_report(cache)
+        
         print("=" * 80)
         print("✅ IMPORT COMPLETE!")
         print("=" * 80)
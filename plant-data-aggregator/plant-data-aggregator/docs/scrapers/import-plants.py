@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Incremental Plant Data Import
+
+One idempotent command for everything the older import scripts load:
+plants, pests, diseases, plant-pest/disease links and companion relationships.
+
+Every input record is hashed (sha256 of its canonical JSON). The hash is
+compared with the one stored in plant_import_manifest (migration V16). Only
+new or changed records are written, all in one transaction:
+  - plants are upserted by slug (COPY + one upsert, see plant_db), so plant ids
+    stay stable. Crop records and planned crops that reference them are left
+    alone.
+  - pests and diseases are upserted by name
+  - the pest/disease links of a changed plant are replaced
+  - if any companion record changed, the companion graph is reloaded
+    (companion_loader: one name query, fuzzy name index, canonical deduplicated
+    pairs, COPY)
+Nothing outside those link tables is deleted, and sequences are never reset.
+Records that disappear from the inputs are reported, not removed.
+A record's hash is stored even when its names don't resolve to a plant; the
+unresolved names are reported, and when new plants are inserted every link and
+companion record is retried.
+After a write, rotation_recommendation_cache is recomputed for every grow area
+(rotation_cache.py), so the first recommendations after an import are warm.
+
+A record whose target is gone is re-imported even if its hash matches: a plant
+slug missing from plant_entity, or companion records while plant_companions is
+empty. The full reload (import-all-plant-data.py) and the companion reload
+(import-companion-data.py) also clear the manifest hashes they invalidate.
+
+Re-running on unchanged inputs reads the manifest, finds nothing to do and
+exits without writing.
+
+Usage:
+    python3 import-plants.py [--dry-run] [--force] [--symmetric-companions] [--skip-rotation-cache]
+
+    --dry-run  Show what would be imported, write nothing
+    --force    Re-import every record, ignoring the manifest
+    --symmetric-companions  Store each companion pair in both directions
+    --skip-rotation-cache   Don't recompute rotation_recommendation_cache
+
+Environment variables: same as import-plant-data.py
+    DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD (required)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from psycopg2.extras import execute_values
+
+import companion_loader
+import plant_db
+import rotation_cache
+from plant_records import build_plant_record, load_json_file, load_trefle_by_slug, slug_from_filename
+
+SCRIPT_DIR = Path(__file__).parent
+TREFLE_FILE = SCRIPT_DIR / "trefle-botanical-data.json"
+PESTS_DISEASES_FILE = SCRIPT_DIR / "pests-diseases-database.json"
+COMPANIONS_FILE = SCRIPT_DIR.parent / "companionship" / "companionship-extended2.json"
+
+# Record kinds in dependency order
+KINDS = ("plant", "pest", "disease", "plant_links", "companions")
+
+
+def content_hash(record: Any) -> str:
+    """sha256 of the record's canonical JSON."""
+    canonical = json.dumps(record, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def load_inputs() -> Dict[str, Dict[str, Any]]:
+    """All input records, as kind -> record key -> record."""
+    trefle_by_slug = load_trefle_by_slug(TREFLE_FILE)
+    plants = {}
+    for json_file in sorted((SCRIPT_DIR / "extracted-text").glob("*.json")):
+        slug = slug_from_filename(json_file)
+        plants[slug] = build_plant_record(slug, load_json_file(json_file), trefle_by_slug)
+
+    pd_data = load_json_file(PESTS_DISEASES_FILE)
+    pests = {name: {'name': name, 'common_name': name.lower()} for name in pd_data.get('pests_index', {})}
+    diseases = {name: {'name': name, 'common_name': name.lower()} for name in pd_data.get('diseases_index', {})}
+    links = {
+        p['slug']: {'pests': sorted(set(p.get('pests', []))), 'diseases': sorted(set(p.get('diseases', [])))}
+        for p in pd_data.get('plants', []) if p.get('slug')
+    }
+
+    companions = load_json_file(COMPANIONS_FILE)
+
+    return {
+        "plant": plants,
+        "pest": pests,
+        "disease": diseases,
+        "plant_links": links,
+        "companions": companions,
+    }
+
+
+def load_manifest(conn) -> Dict[Tuple[str, str], str]:
+    """(kind, record key) -> content hash of the last import."""
+    with conn.cursor() as cur:
+        cur.execute("SELECT kind, record_key, content_hash FROM plant_import_manifest")
+        return {(kind, key): h for kind, key, h in cur.fetchall()}
+
+
+def load_targets(conn) -> Tuple[set, bool]:
+    """Slugs in plant_entity, and whether plant_companions has any rows."""
+    with conn.cursor() as cur:
+        cur.execute("SELECT slug FROM plant_entity WHERE slug IS NOT NULL")
+        slugs = {row[0] for row in cur.fetchall()}
+        cur.execute("SELECT EXISTS (SELECT 1 FROM plant_companions)")
+        has_companions = cur.fetchone()[0]
+    return slugs, has_companions
+
+
+def plan(inputs: Dict[str, Dict[str, Any]], manifest: Dict[Tuple[str, str], str], force: bool,
+         slugs: set, has_companions: bool):
+    """Split the inputs into changed records (with their new hash) and stale manifest keys.
+
+    A record also counts as changed when what it was imported into is gone: a named plant
+    whose slug is not in plant_entity, or companion records when plant_companions is empty
+    (the tables were cleared or reloaded by another script since the manifest was written).
+    """
+    changed: Dict[str, Dict[str, Tuple[Any, str]]] = {}
+    for kind in KINDS:
+        changed[kind] = {}
+        for key, record in inputs[kind].items():
+            h = content_hash(record)
+            missing = ((kind == "plant" and record.get('name') and key not in slugs)
+                       or (kind == "companions" and not has_companions))
+            if force or missing or manifest.get((kind, key)) != h:
+                changed[kind][key] = (record, h)
+    stale = {kind: sorted(k for (mk, k) in manifest if mk == kind and k not in inputs[kind]) for kind in KINDS}
+    return changed, stale
+
+
+def replace_plant_links(cur, cache: plant_db.LookupCache, links: Dict[str, Dict[str, List[str]]]) -> Tuple[set, int, int]:
+    """Replace the pest/disease links of the given plants. Returns (resolved slugs, pest rows, disease rows)."""
+    plant_ids = {}
+    for slug in links:
+        plant_id = cache.plant_id(slug)
+        if plant_id is not None:
+            plant_ids[slug] = plant_id
+    if not plant_ids:
+        return set(), 0, 0
+
+    pest_rows, disease_rows = [], []
+    for slug, plant_id in plant_ids.items():
+        for pest in links[slug]['pests']:
+            pest_id = cache.pest_id(pest)
+            if pest_id is not None:
+                pest_rows.append((plant_id, pest_id))
+        for disease in links[slug]['diseases']:
+            disease_id = cache.disease_id(disease)
+            if disease_id is not None:
+                disease_rows.append((plant_id, disease_id))
+
+    ids = list(plant_ids.values())
+    cur.execute("DELETE FROM plant_pests WHERE plant_id = ANY(%s)", (ids,))
+    cur.execute("DELETE FROM plant_diseases WHERE plant_id = ANY(%s)", (ids,))
+    plant_db.insert_links(cur, "plant_pests", ("plant_id", "pest_id"), pest_rows)
+    plant_db.insert_links(cur, "plant_diseases", ("plant_id", "disease_id"), disease_rows)
+    return set(plant_ids), len(pest_rows), len(disease_rows)
+
+
+def apply_changes(conn, changed: Dict[str, Dict[str, Tuple[Any, str]]], inputs: Dict[str, Dict[str, Any]],
+                  symmetric: bool = False):
+    """Write the changed records and their manifest hashes in one transaction."""
+    cache = plant_db.LookupCache(conn)
+    done: List[Tuple[str, str, str]] = []  # (kind, key, hash) to record in the manifest
+
+    with conn.cursor() as cur:
+        plants = changed["plant"]
+        if plants:
+            stats = plant_db.bulk_import_plants(conn, [r for r, _ in plants.values()], commit=False)
+            cache.refresh_plants(conn)
+            print(f"  plants: {stats['inserted']} inserted, {stats['updated']} updated, "
+                  f"{stats['skipped']} skipped (no commonName)")
+            # Every processed record is recorded, resolved or not: unchanged inputs must stay a
+            # no-op. Records that could not be resolved are reported above and on each write.
+            done += [("plant", k, h) for k, (_, h) in plants.items()]
+            if stats['inserted']:
+                # New plants can complete links and companion pairs that were unresolved before
+                for kind in ("plant_links", "companions"):
+                    changed[kind] = {k: (r, content_hash(r)) for k, r in inputs[kind].items()}
+
+        for kind, table, add in (("pest", "pests", cache.add_pest), ("disease", "diseases", cache.add_disease)):
+            records = changed[kind]
+            ids = plant_db.upsert_by_name(cur, table, {r['name']: r['common_name'] for r, _ in records.values()})
+            for name, row_id in ids.items():
+                add(name, row_id)
+            if records:
+                print(f"  {table}: {len(records)} upserted")
+            done += [(kind, k, h) for k, (_, h) in records.items()]
+
+        links = changed["plant_links"]
+        if links:
+            resolved, n_pests, n_diseases = replace_plant_links(cur, cache, {k: r for k, (r, _) in links.items()})
+            print(f"  plant links: {len(resolved)} plants, {n_pests} pest rows, {n_diseases} disease rows "
+                  f"({len(links) - len(resolved)} plants not in database)")
+            missing = sorted(set(links) - resolved)
+            if missing:
+                print(f"    not in database: {', '.join(missing[:10])}{' ...' if len(missing) > 10 else ''}")
+            done += [("plant_links", k, h) for k, (_, h) in links.items()]
+
+        if changed["companions"]:
+            # Pairs are stored canonically, so one source's rows can't be replaced on their own
+            written, resolutions, conflicts = companion_loader.load_companions(
+                conn, inputs["companions"], symmetric=symmetric, replace=True, commit=False)
+            companion_loader.print_summary(written, resolutions, conflicts)
+            done += [("companions", k, content_hash(r)) for k, r in inputs["companions"].items()]
+
+        execute_values(cur, """
+            INSERT INTO plant_import_manifest (kind, record_key, content_hash)
+            VALUES %s
+            ON CONFLICT (kind, record_key) DO UPDATE
+            SET content_hash = EXCLUDED.content_hash, imported_at = CURRENT_TIMESTAMP
+        """, done)
+
+    conn.commit()
+    return cache
+
+
+def main():
+    """Main import function."""
+    parser = argparse.ArgumentParser(description="Incremental, idempotent plant data import")
+    parser.add_argument("--dry-run", action="store_true", help="Show what would be imported, write nothing")
+    parser.add_argument("--force", action="store_true", help="Re-import every record, ignoring the manifest")
+    parser.add_argument("--symmetric-companions", action="store_true",
+                        help="Store each companion pair in both directions")
+    parser.add_argument("--skip-rotation-cache", action="store_true",
+                        help="Don't recompute rotation_recommendation_cache after importing")
+    args = parser.parse_args()
+
+    if not os.getenv("DB_PASSWORD"):
+        print("❌ DB_PASSWORD environment variable required")
+        print("   Set it with: export DB_PASSWORD='your-password'")
+        sys.exit(1)
+
+    for path in (TREFLE_FILE, PESTS_DISEASES_FILE, COMPANIONS_FILE):
+        if not path.exists():
+            print(f"❌ Input file not found: {path}")
+            sys.exit(1)
+
+    started = time.perf_counter()
+    inputs = load_inputs()
+
+    try:
+        conn = plant_db.connect_from_env()
+    except Exception as e:
+        print(f"❌ Database connection failed: {e}")
+        sys.exit(1)
+
+    try:
+        try:
+            manifest = load_manifest(conn)
+            slugs, has_companions = load_targets(conn)
+        except Exception as e:
+            print(f"❌ Could not read plant_import_manifest: {e}")
+            print("   Apply the database migrations first (V16__create_plant_import_manifest.sql)")
+            sys.exit(1)
+
+        changed, stale = plan(inputs, manifest, args.force, slugs, has_companions)
+        for kind in KINDS:
+            n_changed = len(changed[kind])
+            print(f"  {kind:12s} {len(inputs[kind]):5d} records, {n_changed:5d} new/changed, "
+                  f"{len(inputs[kind]) - n_changed:5d} unchanged")
+            if stale[kind]:
+                print(f"  ⚠️  {len(stale[kind])} {kind} records no longer in the inputs (left in place): "
+                      f"{', '.join(stale[kind][:5])}{' ...' if len(stale[kind]) > 5 else ''}")
+
+        cache = None
+        if not any(changed.values()):
+            print("\n✅ Nothing to import: database is up to date")
+        elif args.dry_run:
+            print("\n(dry run: nothing written)")
+        else:
+            print("\nImporting changes...")
+            cache = apply_changes(conn, changed, inputs, symmetric=args.symmetric_companions)
+            if not args.skip_rotation_cache:
+                rotation_cache.precompute(conn)
+            print("\n✅ Import complete")
+
+        print(f"⏱  {(time.perf_counter() - started) * 1000:.0f} ms")
+        plant_db.print_query_report(cache)
+
+    except Exception as e:
+        conn.rollback()
+        print(f"\n❌ Import failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
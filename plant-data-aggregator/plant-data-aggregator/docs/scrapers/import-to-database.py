@@ -2,16 +2,21 @@
 """
 Import plant data to PostgreSQL database for crop rotation planning.
 Imports: parsed plant data, Trefle botanical data, pests/diseases, and companionship data.
+
+Usage: python3 import-to-database.py [--bulk]
+    --bulk  Import plants set-based (COPY into staging tables + one upsert)
 """
 
+import argparse
 import json
 import os
 import sys
-import psycopg2
 from psycopg2.extras import execute_values
 from datetime import datetime
 from pathlib import Path
 
+import plant_db
+
 # Database connection
 DB_CONFIG = {
     'host': 'localhost',
@@ -44,7 +49,7 @@ FEEDER_TYPE_MAPPING = {
 def connect_db():
     """Connect to PostgreSQL database."""
     try:
-        conn = psycopg2.connect(**DB_CONFIG)
+        conn = plant_db.connect(**DB_CONFIG)
         return conn
     except Exception as e:
         print(f"Error connecting to database: {e}")
@@ -67,48 +72,73 @@ def insert_plant_families(conn):
     """Plant families are already inserted via migration V9."""
     print("✓ Plant families already seeded via migration")
 
-def get_family_id(cursor, family_name):
-    """Get plant family ID by name."""
-    if not family_name:
-        return None
-    
-    cursor.execute("SELECT id FROM plant_families WHERE name = %s", (family_name,))
-    result = cursor.fetchone()
-    return result[0] if result else None
-
 def insert_edible_parts(conn):
     """Edible parts are already inserted via migration V9."""
     print("✓ Edible parts already seeded via migration")
 
-def get_edible_part_ids(cursor, edible_parts):
-    """Get edible part IDs from list of names."""
-    if not edible_parts:
-        return []
-    
-    placeholders = ','.join(['%s'] * len(edible_parts))
-    cursor.execute(f"SELECT id, name FROM edible_parts WHERE name IN ({placeholders})", edible_parts)
-    return {name: id for id, name in cursor.fetchall()}
-
-def import_plants(conn):
-    """Import plant data from parsed JSON files and Trefle data."""
-    cursor = conn.cursor()
+def build_plant_record(slug, plant_data, trefle_lookup):
+    """Merge parsed attributes and Trefle data into a plant record (see plant_db)."""
+    trefle_info = trefle_lookup.get(slug, {})
+    trefle_found = trefle_info.get('trefle_found', False)
+    family_name = trefle_info.get('family') if trefle_found else None
     
-    # Load Trefle data
+    return {
+        'name': plant_data.get('commonName'),
+        'slug': slug,
+        'genus': trefle_info.get('genus') if trefle_found else None,
+        'cycle': plant_data.get('cycle'),
+        'sun_needs': plant_data.get('sunNeeds'),
+        'water_needs': plant_data.get('waterNeeds'),
+        'root_depth': plant_data.get('rootDepth'),
+        'growth_habit': plant_data.get('growthHabit'),
+        'soil_temp_min_f': plant_data.get('soilTempMinF'),
+        'soil_temp_optimal_f': plant_data.get('soilTempOptimalF'),
+        'frost_tolerant': plant_data.get('frostTolerant'),
+        'spacing_min_inches': plant_data.get('spacingMin'),
+        'spacing_max_inches': plant_data.get('spacingMax'),
+        'planting_depth_inches': plant_data.get('plantingDepthInches'),
+        'container_suitable': plant_data.get('containerSuitable'),
+        'requires_staking': plant_data.get('requiresStaking'),
+        'requires_pruning': plant_data.get('requiresPruning'),
+        'days_to_maturity_min': plant_data.get('daysToMaturityMin'),
+        'days_to_maturity_max': plant_data.get('daysToMaturityMax'),
+        'watering_inches_per_week': plant_data.get('wateringInchesPerWeek'),
+        'fertilizing_frequency_weeks': plant_data.get('fertilizingFrequencyWeeks'),
+        'mulch_recommended': plant_data.get('mulchRecommended'),
+        'notes': plant_data.get('notes'),
+        'is_nitrogen_fixer': family_name == 'Fabaceae',
+        'feeder_type': FEEDER_TYPE_MAPPING.get(family_name, 'MODERATE'),
+        'family_name': family_name,
+        'edible_parts': plant_data.get('edibleParts', []),
+    }
+
+def load_trefle_lookup():
+    """Load Trefle data keyed by slug."""
     trefle_data = load_json(TREFLE_DATA)
     if not trefle_data:
         print("Warning: No Trefle data found")
-        trefle_lookup = {}
-    else:
-        trefle_lookup = {p['slug']: p for p in trefle_data.get('plants', [])}
-    
-    # Get all parsed plant attribute files
+        return {}
+    return {p['slug']: p for p in trefle_data.get('plants', [])}
+
+def list_attribute_files():
+    """Parsed plant attribute files, or None if nothing has been parsed yet."""
     attributes_dir = BASE_DIR / 'plant-attributes'
     if not attributes_dir.exists():
         print(f"\nNo plant-attributes directory found. Plants need to be parsed first.")
         print(f"Run parse-all-plants.py to extract attributes from scraped data.")
-        return
+        return None
+    return list(attributes_dir.glob('*_attributes.json'))
+
+def import_plants(conn, cache):
+    """Import plant data from parsed JSON files and Trefle data."""
+    cursor = conn.cursor()
+    
+    trefle_lookup = load_trefle_lookup()
     
-    parsed_files = list(attributes_dir.glob('*_attributes.json'))
+    # Get all parsed plant attribute files
+    parsed_files = list_attribute_files()
+    if parsed_files is None:
+        return
     print(f"\nImporting {len(parsed_files)} plants...")
     
     imported = 0
@@ -126,83 +156,46 @@ def import_plants(conn):
             filename = file_path.stem
             slug = filename.replace('_attributes', '')
             
-            # Get Trefle data if available
-            trefle_info = trefle_lookup.get(slug, {})
-            trefle_found = trefle_info.get('trefle_found', False)
-            family_name = trefle_info.get('family') if trefle_found else None
-            genus = trefle_info.get('genus') if trefle_found else None
+            record = build_plant_record(slug, plant_data, trefle_lookup)
             
             # Get family ID
-            family_id = get_family_id(cursor, family_name)
-            
-            # Determine feeder type
-            feeder_type = FEEDER_TYPE_MAPPING.get(family_name, 'MODERATE')
-            is_nitrogen_fixer = (family_name == 'Fabaceae')
+            record['family_id'] = cache.family_id(record['family_name'])
             
             # Check if plant already exists
-            cursor.execute("SELECT id FROM plant_entity WHERE slug = %s", (slug,))
-            existing = cursor.fetchone()
+            plant_id = cache.plant_id(slug)
             
-            if existing:
-                plant_id = existing[0]
+            if plant_id is not None:
                 # Update existing plant
                 cursor.execute("""
                     UPDATE plant_entity SET
-                        name = %s,
-                        family_id = %s,
-                        genus = %s,
-                        cycle = %s,
-                        sun_needs = %s,
-                        water_needs = %s,
-                        root_depth = %s,
-                        growth_habit = %s,
-                        soil_temp_min_f = %s,
-                        soil_temp_optimal_f = %s,
-                        frost_tolerant = %s,
-                        spacing_min_inches = %s,
-                        spacing_max_inches = %s,
-                        planting_depth_inches = %s,
-                        container_suitable = %s,
-                        requires_staking = %s,
-                        requires_pruning = %s,
-                        days_to_maturity_min = %s,
-                        days_to_maturity_max = %s,
-                        watering_inches_per_week = %s,
-                        fertilizing_frequency_weeks = %s,
-                        mulch_recommended = %s,
-                        notes = %s,
-                        is_nitrogen_fixer = %s,
-                        feeder_type = %s,
+                        name = %(name)s,
+                        family_id = %(family_id)s,
+                        genus = %(genus)s,
+                        cycle = %(cycle)s,
+                        sun_needs = %(sun_needs)s,
+                        water_needs = %(water_needs)s,
+                        root_depth = %(root_depth)s,
+                        growth_habit = %(growth_habit)s,
+                        soil_temp_min_f = %(soil_temp_min_f)s,
+                        soil_temp_optimal_f = %(soil_temp_optimal_f)s,
+                        frost_tolerant = %(frost_tolerant)s,
+                        spacing_min_inches = %(spacing_min_inches)s,
+                        spacing_max_inches = %(spacing_max_inches)s,
+                        planting_depth_inches = %(planting_depth_inches)s,
+                        container_suitable = %(container_suitable)s,
+                        requires_staking = %(requires_staking)s,
+                        requires_pruning = %(requires_pruning)s,
+                        days_to_maturity_min = %(days_to_maturity_min)s,
+                        days_to_maturity_max = %(days_to_maturity_max)s,
+                        watering_inches_per_week = %(watering_inches_per_week)s,
+                        fertilizing_frequency_weeks = %(fertilizing_frequency_weeks)s,
+                        mulch_recommended = %(mulch_recommended)s,
+                        notes = %(notes)s,
+                        is_nitrogen_fixer = %(is_nitrogen_fixer)s,
+                        feeder_type = %(feeder_type)s,
                         updated_at = CURRENT_TIMESTAMP
-                    WHERE id = %s
-                """, (
-                    plant_data.get('commonName'),
-                    family_id,
-                    genus,
-                    plant_data.get('cycle'),
-                    plant_data.get('sunNeeds'),
-                    plant_data.get('waterNeeds'),
-                    plant_data.get('rootDepth'),
-                    plant_data.get('growthHabit'),
-                    plant_data.get('soilTempMinF'),
-                    plant_data.get('soilTempOptimalF'),
-                    plant_data.get('frostTolerant'),
-                    plant_data.get('spacingMin'),
-                    plant_data.get('spacingMax'),
-                    plant_data.get('plantingDepthInches'),
-                    plant_data.get('containerSuitable'),
-                    plant_data.get('requiresStaking'),
-                    plant_data.get('requiresPruning'),
-                    plant_data.get('daysToMaturityMin'),
-                    plant_data.get('daysToMaturityMax'),
-                    plant_data.get('wateringInchesPerWeek'),
-                    plant_data.get('fertilizingFrequencyWeeks'),
-                    plant_data.get('mulchRecommended'),
-                    plant_data.get('notes'),
-                    is_nitrogen_fixer,
-                    feeder_type,
-                    plant_id
-                ))
+                    WHERE id = %(plant_id)s
+                """, {**record, 'plant_id': plant_id})
             else:
                 # Insert new plant
                 cursor.execute("""
@@ -215,54 +208,32 @@ def import_plants(conn):
                         watering_inches_per_week, fertilizing_frequency_weeks,
                         mulch_recommended, notes, is_nitrogen_fixer, feeder_type
                     ) VALUES (
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
+                        %(name)s, %(slug)s, %(family_id)s, %(genus)s, %(cycle)s, %(sun_needs)s,
+                        %(water_needs)s, %(root_depth)s, %(growth_habit)s, %(soil_temp_min_f)s,
+                        %(soil_temp_optimal_f)s, %(frost_tolerant)s, %(spacing_min_inches)s,
+                        %(spacing_max_inches)s, %(planting_depth_inches)s, %(container_suitable)s,
+                        %(requires_staking)s, %(requires_pruning)s, %(days_to_maturity_min)s,
+                        %(days_to_maturity_max)s, %(watering_inches_per_week)s,
+                        %(fertilizing_frequency_weeks)s, %(mulch_recommended)s, %(notes)s,
+                        %(is_nitrogen_fixer)s, %(feeder_type)s
                     ) RETURNING id
-                """, (
-                    plant_data.get('commonName'),
-                    slug,
-                    family_id,
-                    genus,
-                    plant_data.get('cycle'),
-                    plant_data.get('sunNeeds'),
-                    plant_data.get('waterNeeds'),
-                    plant_data.get('rootDepth'),
-                    plant_data.get('growthHabit'),
-                    plant_data.get('soilTempMinF'),
-                    plant_data.get('soilTempOptimalF'),
-                    plant_data.get('frostTolerant'),
-                    plant_data.get('spacingMin'),
-                    plant_data.get('spacingMax'),
-                    plant_data.get('plantingDepthInches'),
-                    plant_data.get('containerSuitable'),
-                    plant_data.get('requiresStaking'),
-                    plant_data.get('requiresPruning'),
-                    plant_data.get('daysToMaturityMin'),
-                    plant_data.get('daysToMaturityMax'),
-                    plant_data.get('wateringInchesPerWeek'),
-                    plant_data.get('fertilizingFrequencyWeeks'),
-                    plant_data.get('mulchRecommended'),
-                    plant_data.get('notes'),
-                    is_nitrogen_fixer,
-                    feeder_type
-                ))
+                """, record)
                 plant_id = cursor.fetchone()[0]
+                cache.add_plant(plant_id, slug, record['name'])
             
             # Handle edible parts (many-to-many)
-            edible_parts = plant_data.get('edibleParts', [])
+            edible_parts = record['edible_parts']
             if edible_parts:
                 # Delete existing associations
                 cursor.execute("DELETE FROM plant_edible_parts WHERE plant_id = %s", (plant_id,))
                 
-                # Get edible part IDs
-                edible_part_ids = get_edible_part_ids(cursor, edible_parts)
-                
                 # Insert new associations
                 for part in edible_parts:
-                    if part in edible_part_ids:
+                    part_id = cache.edible_part_id(part)
+                    if part_id is not None:
                         cursor.execute(
                             "INSERT INTO plant_edible_parts (plant_id, edible_part_id) VALUES (%s, %s) ON CONFLICT DO NOTHING",
-                            (plant_id, edible_part_ids[part])
+                            (plant_id, part_id)
                         )
             
             imported += 1
@@ -282,7 +253,37 @@ def import_plants(conn):
     print(f"  - Skipped: {skipped}")
     print(f"  - Errors: {errors}")
 
-def import_pests_diseases(conn):
+def import_plants_bulk(conn, cache):
+    """Import all parsed plants set-based: COPY into staging tables, then one upsert."""
+    trefle_lookup = load_trefle_lookup()
+    
+    parsed_files = list_attribute_files()
+    if parsed_files is None:
+        return
+    print(f"\nImporting {len(parsed_files)} plants (bulk)...")
+    
+    records = []
+    skipped = 0
+    for file_path in parsed_files:
+        plant_data = load_json(file_path)
+        if not plant_data:
+            skipped += 1
+            continue
+        slug = file_path.stem.replace('_attributes', '')
+        records.append(build_plant_record(slug, plant_data, trefle_lookup))
+    
+    stats = plant_db.bulk_import_plants(conn, records)
+    cache.refresh_plants(conn)
+    
+    print(f"\n✓ Plants import complete:")
+    print(f"  - Inserted: {stats['inserted']}")
+    print(f"  - Updated: {stats['updated']}")
+    print(f"  - Skipped: {skipped + stats['skipped']}")
+    print(f"  - Edible part links: {stats['edible_parts']}")
+    if stats['unknown_family']:
+        print(f"  - Unknown family: {stats['unknown_family']}")
+
+def import_pests_diseases(conn, cache):
     """Import pests and diseases from extracted data."""
     cursor = conn.cursor()
     
@@ -313,6 +314,7 @@ def import_pests_diseases(conn):
             RETURNING id
         """, (pest_name, pest_name))
         pest_id_map[pest_name] = cursor.fetchone()[0]
+        cache.add_pest(pest_name, pest_id_map[pest_name])
     
     print(f"  Inserted {len(all_pests)} pests")
     
@@ -325,6 +327,7 @@ def import_pests_diseases(conn):
             RETURNING id
         """, (disease_name, disease_name))
         disease_id_map[disease_name] = cursor.fetchone()[0]
+        cache.add_disease(disease_name, disease_id_map[disease_name])
     
     print(f"  Inserted {len(all_diseases)} diseases")
     
@@ -333,13 +336,10 @@ def import_pests_diseases(conn):
         slug = plant.get('slug')
         
         # Get plant ID
-        cursor.execute("SELECT id FROM plant_entity WHERE slug = %s", (slug,))
-        result = cursor.fetchone()
-        if not result:
+        plant_id = cache.plant_id(slug)
+        if plant_id is None:
             continue
         
-        plant_id = result[0]
-        
         # Link pests
         for pest_name in plant.get('pests', []):
             if pest_name in pest_id_map:
@@ -363,7 +363,7 @@ def import_pests_diseases(conn):
     
     print(f"✓ Pests and diseases import complete")
 
-def import_companionship(conn):
+def import_companionship(conn, cache):
     """Import companionship data."""
     cursor = conn.cursor()
     
@@ -374,19 +374,13 @@ def import_companionship(conn):
     
     print(f"\nImporting companionship data...")
     
-    # Build slug lookup for plants
-    cursor.execute("SELECT id, slug, name FROM plant_entity")
-    plants = cursor.fetchall()
-    slug_to_id = {slug: id for id, slug, name in plants}
-    name_to_id = {name.lower(): id for id, slug, name in plants}
-    
     imported = 0
     skipped = 0
     
     for plant_name, companions in companionship_data.items():
         # Try to find plant ID by name (normalize)
         plant_slug = slugify(plant_name)
-        plant_id = slug_to_id.get(plant_slug) or name_to_id.get(plant_name.lower())
+        plant_id = cache.plant_id(plant_slug) or cache.plant_id_by_name(plant_name, ignore_case=True)
         
         if not plant_id:
             skipped += 1
@@ -394,7 +388,7 @@ def import_companionship(conn):
         
         for companion_name, relationship in companions.items():
             companion_slug = slugify(companion_name)
-            companion_id = slug_to_id.get(companion_slug) or name_to_id.get(companion_name.lower())
+            companion_id = cache.plant_id(companion_slug) or cache.plant_id_by_name(companion_name, ignore_case=True)
             
             if not companion_id:
                 continue
@@ -425,6 +419,11 @@ def import_companionship(conn):
 
 def main():
     """Main import process."""
+    parser = argparse.ArgumentParser(description="Import plant data for crop rotation planning")
+    parser.add_argument('--bulk', action='store_true',
+                        help="Import plants set-based via COPY + one upsert")
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("PLANT DATA IMPORT - Crop Rotation Database")
     print("=" * 60)
@@ -435,13 +434,18 @@ def main():
         # Import data in order
         insert_plant_families(conn)
         insert_edible_parts(conn)
-        import_plants(conn)
-        import_pests_diseases(conn)
-        import_companionship(conn)
+        cache = plant_db.LookupCache(conn)
+        if args.bulk:
+            import_plants_bulk(conn, cache)
+        else:
+            import_plants(conn, cache)
+        import_pests_diseases(conn, cache)
+        import_companionship(conn, cache)
         
         print("\n" + "=" * 60)
         print("✓ ALL DATA IMPORTED SUCCESSFULLY")
         print("=" * 60)
+        plant_db.print_query_report(cache)
         
     except Exception as e:
         print(f"\n✗ Error during import: {e}")
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Fuzzy plant-name resolution.
+
+Companion data says "Potato" and "Strawberries". The database says
+"Planting, Growing, and Harvesting Potato" and "Strawberry Plant", and Trefle
+says "Solanum tuberosum". `NameIndex` maps the first kind of name onto the
+others without a hand-maintained mapping.
+
+Every label (plant name, slug, scientific name) is normalized:
+  - lower-cased, punctuation dropped, slug dashes read as spaces
+  - filler words from article titles removed ("how", "to", "grow", "planting", ...)
+  - each token singularized ("tomatoes" -> "tomato", "berries" -> "berry")
+The index keeps an inverted map from token -> labels and from character
+trigram -> labels. A query only scores the labels that share a token or a
+trigram with it:
+  - 1.0 if the normalized strings are equal
+  - token score: 0.7 * containment + 0.3 * Jaccard of the token sets. "Eggplant"
+    scores 0.85 against "Eggplant (Aubergines)".
+  - trigram Dice similarity, which catches spelling drift
+A candidate's score is the best of these. A label that shares no token with
+the query is only scored if its trigram Dice can reach MIN_CANDIDATE_SCORE.
+That takes a minimum number of shared trigrams, so such a label must share
+one of the query's rarest trigrams. Candidates come from those postings only.
+The common trigrams ("er ") are intersected with the candidates instead of
+being scanned, so a lookup doesn't degrade into scoring the whole index.
+The best target is accepted if it scores at least MIN_SCORE and beats the
+runner-up target by AMBIGUITY_MARGIN.
+Otherwise the query is reported as ambiguous (with its candidates) or as
+unresolved. Nothing is silently dropped.
+"""
+
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+MIN_SCORE = 0.6
+AMBIGUITY_MARGIN = 0.1
+# Trigram-only matches below this are not candidates. It is at most
+# MIN_SCORE - AMBIGUITY_MARGIN, so resolutions are the same as scoring every label.
+MIN_CANDIDATE_SCORE = 0.4
+
+# Words that appear in scraped article titles but never name a plant
+FILLER_WORDS = {
+    'a', 'an', 'and', 'the', 'of', 'for', 'in', 'to', 'how', 'grow', 'growing', 'plant', 'plants',
+    'planting', 'harvest', 'harvesting', 'care', 'guide', 'complete', 'tips', 'home', 'gardener',
+    'gardeners', 'tree', 'trees',
+}
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def singular(token: str) -> str:
+    """Crude English singular, good enough for vegetable names."""
+    if len(token) <= 3 or token.endswith(('ss', 'us', 'is')):
+        return token
+    if token.endswith('ies'):
+        return token[:-3] + 'y'
+    if token.endswith(('oes', 'ches', 'shes', 'xes', 'sses')):
+        return token[:-2]
+    if token.endswith('s'):
+        return token[:-1]
+    return token
+
+
+def tokens(text: str) -> List[str]:
+    """Normalized tokens of a name, slug or title."""
+    words = _NON_WORD.split(text.lower())
+    return [singular(w) for w in words if w and w not in FILLER_WORDS]
+
+
+def trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class Candidate(NamedTuple):
+    target: Hashable   # e.g. a plant id
+    label: str         # the label that matched
+    score: float
+
+
+class Resolution(NamedTuple):
+    query: str
+    target: Optional[Hashable]   # None when unresolved or ambiguous
+    status: str                  # 'exact', 'fuzzy', 'ambiguous' or 'unresolved'
+    candidates: List[Candidate]  # best first, one per target
+
+
+class NameIndex:
+    """Token + trigram index over labels that point at targets (plant ids, Trefle ids, ...)."""
+
+    def __init__(self, min_score: float = MIN_SCORE, margin: float = AMBIGUITY_MARGIN,
+                 min_candidate_score: float = MIN_CANDIDATE_SCORE):
+        self.min_score = min_score
+        self.margin = margin
+        self.min_candidate_score = min(min_candidate_score, min_score - margin)
+        self._labels: List[Tuple[Hashable, str, str, frozenset, frozenset]] = []  # target, label, key, tokens, trigrams
+        self._n_grams: List[int] = []  # trigram count per label
+        self._by_key: Dict[str, Set[int]] = defaultdict(set)
+        self._by_token: Dict[str, Set[int]] = defaultdict(set)
+        self._by_trigram: Dict[str, Set[int]] = defaultdict(set)
+
+    def add(self, target: Hashable, label: Optional[str]):
+        """Index one label (name, slug or scientific name) for a target."""
+        if not label:
+            return
+        toks = tokens(label)
+        if not toks:
+            return
+        key = ' '.join(toks)
+        grams = frozenset(trigrams(key))
+        i = len(self._labels)
+        self._labels.append((target, label, key, frozenset(toks), grams))
+        self._n_grams.append(len(grams))
+        self._by_key[key].add(i)
+        for t in toks:
+            self._by_token[t].add(i)
+        for g in grams:
+            self._by_trigram[g].add(i)
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def candidates(self, query: str, limit: int = 5) -> List[Candidate]:
+        """Best-scoring label per target, best first."""
+        toks = tokens(query)
+        if not toks:
+            return []
+        key = ' '.join(toks)
+        q_tokens = set(toks)
+        q_grams = trigrams(key)
+
+        # Dice >= floor needs 2 * shared >= floor * (n_q + n_label) with shared <= n_label,
+        # so at least `needed` shared trigrams: any such label is in one of the
+        # n_q - needed + 1 rarest postings.
+        floor = self.min_candidate_score
+        n_q = len(q_grams)
+        needed = max(1, math.ceil(floor * n_q / (2 - floor)))
+        postings = sorted((self._by_trigram.get(g, set()) for g in q_grams), key=len)
+        shared = Counter()  # label -> trigrams shared with the query
+        for posting in postings[:n_q - needed + 1]:
+            shared.update(posting)
+        found = set(shared)
+        for posting in postings[n_q - needed + 1:]:
+            shared.update(found & posting)
+
+        pool: Set[int] = set(self._by_key.get(key, ()))
+        for t in q_tokens:
+            pool |= self._by_token.get(t, set())
+        n_grams = self._n_grams
+        pool.update(i for i, n in shared.items() if 2 * n >= floor * (n_q + n_grams[i]))
+
+        best: Dict[Hashable, Candidate] = {}
+        for i in pool:
+            target, label, l_key, l_tokens, l_grams = self._labels[i]
+            if l_key == key:
+                score = 1.0
+            else:
+                common = len(q_tokens & l_tokens)
+                token_score = (0.7 * common / min(len(q_tokens), len(l_tokens))
+                               + 0.3 * common / len(q_tokens | l_tokens))
+                overlap = shared[i] if i in found else len(q_grams & l_grams)
+                dice = 2 * overlap / (n_q + len(l_grams))
+                score = max(token_score, dice)
+            if target not in best or score > best[target].score:
+                best[target] = Candidate(target, label, round(score, 3))
+        return sorted(best.values(), key=lambda c: (-c.score, str(c.label)))[:limit]
+
+    def resolve(self, query: str) -> Resolution:
+        found = self.candidates(query)
+        if not found or found[0].score < self.min_score:
+            return Resolution(query, None, 'unresolved', found)
+        top = found[0]
+        if len(found) > 1 and top.score - found[1].score < self.margin:
+            return Resolution(query, None, 'ambiguous', found)
+        return Resolution(query, top.target, 'exact' if top.score == 1.0 else 'fuzzy', found)
+
+    def resolve_all(self, queries: Iterable[str]) -> Dict[str, Resolution]:
+        return {q: self.resolve(q) for q in dict.fromkeys(queries)}
+
+
+def print_report(resolutions: Dict[str, Resolution]):
+    """Print fuzzy, ambiguous and unresolved names; exact matches are only counted."""
+    by_status: Dict[str, List[Tuple[str, Resolution]]] = defaultdict(list)
+    for name, r in sorted(resolutions.items()):
+        by_status[r.status].append((name, r))
+    print(f"  names: {len(by_status['exact'])} exact, {len(by_status['fuzzy'])} fuzzy, "
+          f"{len(by_status['ambiguous'])} ambiguous, {len(by_status['unresolved'])} unresolved")
+    for name, r in by_status['fuzzy']:
+        c = r.candidates[0]
+        print(f"    ~ {name} → {c.label} ({c.score:.2f})")
+    for name, r in by_status['ambiguous']:
+        options = ', '.join(f"{c.label} ({c.score:.2f})" for c in r.candidates[:3])
+        print(f"    ? {name} → {options}")
+    for name, r in by_status['unresolved']:
+        hint = f" (closest: {r.candidates[0].label}, {r.candidates[0].score:.2f})" if r.candidates else ""
+        print(f"    ✗ {name}{hint}")
@@ -2,13 +2,22 @@
 """
 Extract pests and diseases from scraped plant data.
 Creates a structured JSON file for use in crop rotation planning.
+
+Usage:
+    python3 parse-pests-diseases.py                    # pestsAndDiseases text of parsed/*_scraped_*.json
+    python3 parse-pests-diseases.py --source rawhtml   # full page text of rawhtml/*.html
+    python3 parse-pests-diseases.py --workers 1        # no process pool
 """
 
+import argparse
+import html
 import json
 import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Set
+from typing import List, Dict, Optional, Set, Tuple
 from collections import defaultdict
 
 # Common pest patterns to extract
@@ -35,43 +44,66 @@ DISEASE_PATTERNS = [
     r'(clubroot|damping off)',
 ]
 
+# Every pattern matches only letters and literal spaces, so no match can cross
+# punctuation, digits or line breaks, and every match contains one of these words.
+# A run of letters and spaces without any of them cannot match and is skipped.
+TRIGGER_WORDS = [
+    'aphid', 'beetle', 'borer', 'bug', 'caterpillar', 'worm', 'miner', 'maggot', 'mite', 'moth',
+    'slug', 'snail', 'thrip', 'weevil', 'whitefl', 'fly', 'looper',
+    'blight', 'wilt', 'rot', 'mildew', 'rust', 'scab', 'spot', 'mosaic', 'canker', 'virus',
+    'clubroot', 'damping',
+]
+_RUN = re.compile(r'[a-z ]+', re.IGNORECASE)
+_TRIGGER = re.compile('|'.join(TRIGGER_WORDS), re.IGNORECASE)
+
+def _compile_matcher() -> Tuple[re.Pattern, List[Tuple[str, int]]]:
+    """One regex for all patterns: it stops wherever any pattern matches and
+    captures what each pattern would match there in its own group."""
+    patterns = [('pests', p) for p in PEST_PATTERNS] + [('diseases', p) for p in DISEASE_PATTERNS]
+    gate = '|'.join(f'(?:{p})' for _, p in patterns)
+    probes = ''.join(f'(?=(?P<m{i}>{p})?)' for i, (_, p) in enumerate(patterns))
+    matcher = re.compile(f'(?={gate}){probes}', re.IGNORECASE)
+    return matcher, [(kind, matcher.groupindex[f'm{i}']) for i, (kind, _) in enumerate(patterns)]
+
+_MATCHER, _MATCHER_GROUPS = _compile_matcher()
+
+def _normalize(name: str) -> str:
+    # Capitalize properly
+    return ' '.join(word.capitalize() for word in name.strip().split())
+
+def _scan(segment: str, found: Dict[str, Set[str]]):
+    # The matcher visits every position where some pattern matches. Pattern i is
+    # taken there only if the position is past its previous match, which is where
+    # re.finditer(pattern) would resume, so the results equal per-pattern finditer.
+    resume = [0] * len(_MATCHER_GROUPS)
+    for match in _MATCHER.finditer(segment):
+        for i, (kind, group) in enumerate(_MATCHER_GROUPS):
+            start = match.start(group)
+            if start >= resume[i]:
+                end = match.end(group)
+                found[kind].add(_normalize(segment[start:end]))
+                resume[i] = end
+
+def extract_pests_and_diseases(text: str) -> Tuple[Set[str], Set[str]]:
+    """Extract pest and disease names from text in one pass of the combined matcher."""
+    found = {'pests': set(), 'diseases': set()}
+    if not text:
+        return found['pests'], found['diseases']
+
+    for run in _RUN.finditer(text):
+        segment = run.group()
+        if _TRIGGER.search(segment):
+            _scan(segment, found)
+
+    return found['pests'], found['diseases']
+
 def extract_pests_from_text(text: str) -> Set[str]:
     """Extract pest names from text using patterns."""
-    if not text:
-        return set()
-    
-    pests = set()
-    text_lower = text.lower()
-    
-    # Apply patterns
-    for pattern in PEST_PATTERNS:
-        matches = re.finditer(pattern, text, re.IGNORECASE)
-        for match in matches:
-            pest = match.group(0).strip()
-            # Capitalize properly
-            pest = ' '.join(word.capitalize() for word in pest.split())
-            pests.add(pest)
-    
-    return pests
+    return extract_pests_and_diseases(text)[0]
 
 def extract_diseases_from_text(text: str) -> Set[str]:
     """Extract disease names from text using patterns."""
-    if not text:
-        return set()
-    
-    diseases = set()
-    text_lower = text.lower()
-    
-    # Apply patterns
-    for pattern in DISEASE_PATTERNS:
-        matches = re.finditer(pattern, text, re.IGNORECASE)
-        for match in matches:
-            disease = match.group(0).strip()
-            # Capitalize properly
-            disease = ' '.join(word.capitalize() for word in disease.split())
-            diseases.add(disease)
-    
-    return diseases
+    return extract_pests_and_diseases(text)[1]
 
 def process_plant_file(file_path: Path) -> Dict:
     """Process a single plant JSON file and extract pest/disease info."""
@@ -83,8 +115,7 @@ def process_plant_file(file_path: Path) -> Dict:
     pests_diseases_text = data.get('pestsAndDiseases', '')
     
     # Extract pests and diseases
-    pests = extract_pests_from_text(pests_diseases_text)
-    diseases = extract_diseases_from_text(pests_diseases_text)
+    pests, diseases = extract_pests_and_diseases(pests_diseases_text)
     
     return {
         'commonName': common_name,
@@ -94,41 +125,92 @@ def process_plant_file(file_path: Path) -> Dict:
         'rawText': pests_diseases_text[:500] if pests_diseases_text else None  # Keep first 500 chars for reference
     }
 
-def build_pest_disease_database():
+_NON_TEXT = re.compile(r'<(script|style|noscript)\b.*?</\1\s*>|<!--.*?-->', re.IGNORECASE | re.DOTALL)
+_TAG = re.compile(r'<[^>]+>')
+_H1 = re.compile(r'<h1\b[^>]*>(.*?)</h1\s*>', re.IGNORECASE | re.DOTALL)
+
+def html_to_text(page: str) -> str:
+    """Visible text of an HTML page, one space where each tag was."""
+    return html.unescape(_TAG.sub(' ', _NON_TEXT.sub(' ', page)))
+
+def process_html_file(file_path: Path) -> Dict:
+    """Process a raw Almanac page (rawhtml/<slug>_<timestamp>.html) over its full text."""
+    page = file_path.read_text(encoding='utf-8', errors='replace')
+
+    slug = file_path.stem.rsplit('_', 1)[0]
+    title = _H1.search(page)
+    common_name = ' '.join(html_to_text(title.group(1)).split()) if title else slug
+    text = ' '.join(html_to_text(page).split())
+
+    pests, diseases = extract_pests_and_diseases(text)
+
+    return {
+        'commonName': common_name,
+        'slug': slug,
+        'pests': sorted(list(pests)),
+        'diseases': sorted(list(diseases)),
+        'rawText': None
+    }
+
+SOURCES = {
+    # source: (directory, glob, processor, output file)
+    'parsed': ('parsed', '*_scraped_*.json', process_plant_file, 'pests-diseases-database.json'),
+    'rawhtml': ('rawhtml', '*.html', process_html_file, 'pests-diseases-rawhtml.json'),
+}
+
+def _process_safely(job: Tuple[str, Path]) -> Tuple[Optional[Dict], Optional[str]]:
+    # Runs in a worker process: report errors per file instead of aborting the pool
+    source, file_path = job
+    try:
+        return SOURCES[source][2](file_path), None
+    except Exception as e:
+        return None, str(e)
+
+def build_pest_disease_database(source: str = 'parsed', workers: Optional[int] = None):
     """Build comprehensive pest and disease database from all scraped plants."""
     
     script_dir = Path(__file__).parent
-    parsed_dir = script_dir / "parsed"
+    dir_name, pattern, _, output_name = SOURCES[source]
+    input_dir = script_dir / dir_name
     
-    if not parsed_dir.exists():
-        print(f"❌ Directory not found: {parsed_dir}")
+    if not input_dir.exists():
+        print(f"❌ Directory not found: {input_dir}")
         return
     
-    # Process all JSON files
+    # Process all files
     plant_data = []
     all_pests = defaultdict(list)  # pest -> [plants affected]
     all_diseases = defaultdict(list)  # disease -> [plants affected]
     
-    json_files = list(parsed_dir.glob("*_scraped_*.json"))
-    print(f"📁 Found {len(json_files)} plant files to process...")
+    files = sorted(input_dir.glob(pattern))
+    workers = workers or os.cpu_count() or 1
+    print(f"📁 Found {len(files)} plant files to process ({workers} workers)...")
+    
+    started = time.perf_counter()
+    jobs = [(source, f) for f in files]
+    if workers > 1 and len(files) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_process_safely, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    else:
+        results = [_process_safely(job) for job in jobs]
+    elapsed = time.perf_counter() - started
     
-    for json_file in sorted(json_files):
-        try:
-            result = process_plant_file(json_file)
-            plant_data.append(result)
-            
-            # Track which plants are affected by each pest/disease
-            for pest in result['pests']:
-                all_pests[pest].append(result['commonName'])
-            
-            for disease in result['diseases']:
-                all_diseases[disease].append(result['commonName'])
-            
-            if result['pests'] or result['diseases']:
-                print(f"✓ {result['commonName']}: {len(result['pests'])} pests, {len(result['diseases'])} diseases")
+    for input_file, (result, error) in zip(files, results):
+        if error is not None:
+            print(f"❌ Error processing {input_file.name}: {error}")
+            continue
         
-        except Exception as e:
-            print(f"❌ Error processing {json_file.name}: {e}")
+        plant_data.append(result)
+        
+        # Track which plants are affected by each pest/disease
+        for pest in result['pests']:
+            all_pests[pest].append(result['commonName'])
+        
+        for disease in result['diseases']:
+            all_diseases[disease].append(result['commonName'])
+        
+        if result['pests'] or result['diseases']:
+            print(f"✓ {result['commonName']}: {len(result['pests'])} pests, {len(result['diseases'])} diseases")
     
     # Create output
     output = {
@@ -137,7 +219,8 @@ def build_pest_disease_database():
             'total_plants': len(plant_data),
             'total_unique_pests': len(all_pests),
             'total_unique_diseases': len(all_diseases),
-            'description': 'Pests and diseases extracted from Almanac scraped data'
+            'description': ('Pests and diseases extracted from Almanac scraped data' if source == 'parsed'
+                            else 'Pests and diseases extracted from the full text of raw Almanac pages')
         },
         'plants': plant_data,
         'pests_index': {
@@ -157,13 +240,13 @@ def build_pest_disease_database():
     }
     
     # Save output
-    output_file = script_dir / "pests-diseases-database.json"
+    output_file = script_dir / output_name
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(output, f, indent=2, ensure_ascii=False)
     
     print(f"\n✅ Successfully created database:")
     print(f"   📄 Output: {output_file}")
-    print(f"   🌱 Plants processed: {len(plant_data)}")
+    print(f"   🌱 Plants processed: {len(plant_data)} in {elapsed:.2f}s")
     print(f"   🐛 Unique pests found: {len(all_pests)}")
     print(f"   🦠 Unique diseases found: {len(all_diseases)}")
     
@@ -179,4 +262,11 @@ def build_pest_disease_database():
         print(f"   • {disease}: {len(plants)} plants")
 
 if __name__ == "__main__":
-    build_pest_disease_database()
+    parser = argparse.ArgumentParser(description="Extract pests and diseases from scraped plant data")
+    parser.add_argument("--source", choices=sorted(SOURCES), default="parsed",
+                        help="parsed: pestsAndDiseases sections (default); rawhtml: full text of the raw pages")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count; 1 runs in-process)")
+    args = parser.parse_args()
+
+    build_pest_disease_database(args.source, args.workers)
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Shared database helpers for the plant import scripts.
+
+The import scripts are run as standalone files (`python3 import-plant-data.py`),
+so anything they share lives here, next to them, under an importable name.
+
+Bulk plant import:
+    `bulk_import_plants` loads every parsed plant record in a handful of round
+    trips instead of several queries per plant. Records are COPYed into temp
+    staging tables, family and edible-part ids are resolved with joins, and
+    plant_entity is upserted with a single `INSERT ... ON CONFLICT (slug) DO
+    UPDATE`. Everything runs in one transaction; the staging tables are dropped
+    on commit.
+
+A plant record is a dict keyed by plant_entity column names (`name`, `slug`,
+`cycle`, ...) plus two extra keys that are resolved in the database:
+    family_name   - plant_families.name, or None
+    edible_parts  - list of edible_parts.name
+
+Lookup cache:
+    The reference tables (families, edible parts, plants, pests, diseases) hold
+    a few dozen to a few hundred rows. `LookupCache` reads each one once per run,
+    so resolving a name or slug to an id is a dict hit rather than a query. The
+    importers register the rows they insert so the cache stays current.
+    Connections opened with `connect()` count every statement they send, and
+    `print_query_report()` prints the totals at the end of a run.
+
+Bulk pests/diseases:
+    `upsert_by_name` writes a whole pests_index / diseases_index in a single
+    multi-row statement and returns name -> id. `insert_links` writes
+    plant_pests / plant_diseases (or any join table) with execute_values as one
+    statement and prints its throughput.
+"""
+
+import io
+import os
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import psycopg2
+import psycopg2.extensions
+from psycopg2.extras import execute_values
+
+# Statements sent this run, by leading SQL keyword
+QUERY_COUNTS: Counter = Counter()
+
+
+def _verb(query) -> str:
+    if isinstance(query, bytes):
+        query = query.decode('utf-8', 'replace')
+    words = query.split(None, 1)
+    return words[0].upper() if words else '?'
+
+
+class CountingCursor(psycopg2.extensions.cursor):
+    """Cursor that tallies every statement it sends in QUERY_COUNTS."""
+
+    def execute(self, query, vars=None):
+        QUERY_COUNTS[_verb(query)] += 1
+        return super().execute(query, vars)
+
+    def executemany(self, query, vars_list):
+        # psycopg2 sends one statement per parameter set
+        vars_list = list(vars_list)
+        QUERY_COUNTS[_verb(query)] += len(vars_list)
+        return super().executemany(query, vars_list)
+
+    def copy_expert(self, sql, file, size=8192):
+        QUERY_COUNTS['COPY'] += 1
+        return super().copy_expert(sql, file, size)
+
+
+def connect(**kwargs):
+    """psycopg2.connect with statement counting."""
+    return psycopg2.connect(cursor_factory=CountingCursor, **kwargs)
+
+
+def connect_from_env():
+    """Connect using DB_HOST / DB_PORT / DB_NAME / DB_USER / DB_PASSWORD."""
+    return connect(
+        host=os.getenv("DB_HOST", "localhost"),
+        port=os.getenv("DB_PORT", "5432"),
+        database=os.getenv("DB_NAME", "gardentime"),
+        user=os.getenv("DB_USER", "postgres"),
+        password=os.getenv("DB_PASSWORD")
+    )
+
+
+class LookupCache:
+    """Name/slug -> id maps for the reference tables, loaded once per run."""
+
+    def __init__(self, conn):
+        self.hits = 0
+        self.misses = 0
+        with conn.cursor() as cur:
+            cur.execute("SELECT name, id FROM plant_families")
+            self.families: Dict[str, int] = dict(cur.fetchall())
+            cur.execute("SELECT name, id FROM edible_parts")
+            self.edible_parts: Dict[str, int] = dict(cur.fetchall())
+            cur.execute("SELECT name, id FROM pests")
+            self.pests: Dict[str, int] = dict(cur.fetchall())
+            cur.execute("SELECT name, id FROM diseases")
+            self.diseases: Dict[str, int] = dict(cur.fetchall())
+        self.refresh_plants(conn)
+
+    def refresh_plants(self, conn):
+        """Reload the plant maps, e.g. after a bulk upsert changed many rows at once."""
+        self.plants_by_slug: Dict[str, int] = {}
+        self.plants_by_name: Dict[str, int] = {}
+        self.plants_by_lower_name: Dict[str, int] = {}
+        with conn.cursor() as cur:
+            cur.execute("SELECT id, slug, name FROM plant_entity ORDER BY id")
+            for plant_id, slug, name in cur.fetchall():
+                self.add_plant(plant_id, slug, name)
+
+    def _get(self, table: Dict[str, int], key: Optional[str]) -> Optional[int]:
+        if key is None:
+            return None
+        found = table.get(key)
+        if found is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return found
+
+    def family_id(self, name: Optional[str]) -> Optional[int]:
+        return self._get(self.families, name)
+
+    def edible_part_id(self, name: Optional[str]) -> Optional[int]:
+        return self._get(self.edible_parts, name)
+
+    def pest_id(self, name: Optional[str]) -> Optional[int]:
+        return self._get(self.pests, name)
+
+    def disease_id(self, name: Optional[str]) -> Optional[int]:
+        return self._get(self.diseases, name)
+
+    def plant_id(self, slug: Optional[str]) -> Optional[int]:
+        return self._get(self.plants_by_slug, slug)
+
+    def plant_id_by_name(self, name: Optional[str], ignore_case: bool = False) -> Optional[int]:
+        if ignore_case:
+            return self._get(self.plants_by_lower_name, name.lower() if name else None)
+        return self._get(self.plants_by_name, name)
+
+    def add_plant(self, plant_id: int, slug: Optional[str], name: Optional[str]):
+        if slug:
+            self.plants_by_slug[slug] = plant_id
+        if name:
+            self.plants_by_name[name] = plant_id
+            self.plants_by_lower_name[name.lower()] = plant_id
+
+    def add_pest(self, name: str, pest_id: int):
+        self.pests[name] = pest_id
+
+    def add_disease(self, name: str, disease_id: int):
+        self.diseases[name] = disease_id
+
+
+def upsert_by_name(cur, table: str, common_names: Dict[str, str]) -> Dict[str, int]:
+    """Upsert (name, common_name) rows into pests or diseases in one statement; returns name -> id."""
+    if not common_names:
+        return {}
+    started = time.perf_counter()
+    rows = execute_values(cur, f"""
+        INSERT INTO {table} (name, common_name)
+        VALUES %s
+        ON CONFLICT (name) DO UPDATE SET common_name = EXCLUDED.common_name
+        RETURNING name, id
+    """, list(common_names.items()), page_size=len(common_names), fetch=True)
+    print_throughput(table, len(rows), time.perf_counter() - started)
+    return dict(rows)
+
+
+def insert_links(cur, table: str, columns: Tuple[str, str], rows: List[Tuple[int, int]]) -> int:
+    """Insert join-table rows in one statement, skipping existing ones; returns rows written."""
+    rows = list(dict.fromkeys(rows))
+    if not rows:
+        return 0
+    started = time.perf_counter()
+    execute_values(cur, f"""
+        INSERT INTO {table} ({', '.join(columns)})
+        VALUES %s
+        ON CONFLICT DO NOTHING
+    """, rows, page_size=len(rows))
+    written = cur.rowcount
+    print_throughput(table, len(rows), time.perf_counter() - started, written)
+    return written
+
+
+def print_throughput(table: str, rows: int, seconds: float, written: Optional[int] = None):
+    rate = rows / seconds if seconds > 0 else float('inf')
+    new = f", {written} new" if written is not None else ""
+    print(f"  ⚡ {table}: {rows} rows{new} in {seconds * 1000:.1f} ms ({rate:,.0f} rows/s)")
+
+
+def print_query_report(cache: Optional[LookupCache] = None):
+    """Print the statements sent this run (and cache hits, if a cache was used)."""
+    total = sum(QUERY_COUNTS.values())
+    by_verb = ', '.join(f"{verb} {n}" for verb, n in QUERY_COUNTS.most_common())
+    print(f"📊 Queries this run: {total}" + (f" ({by_verb})" if by_verb else ""))
+    if cache is not None:
+        print(f"📊 Id lookups served from cache: {cache.hits} ({cache.misses} not found)")
+
+# Keys of a plant record that are not plant_entity columns
+RECORD_EXTRAS = ('family_name', 'edible_parts')
+
+
+def _copy_value(value: Any) -> str:
+    """Format one value for COPY ... FROM STDIN (text format)."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return (str(value)
+            .replace('\\', '\\\\')
+            .replace('\t', '\\t')
+            .replace('\n', '\\n')
+            .replace('\r', '\\r'))
+
+
+def copy_rows(cur, table: str, columns: List[str], rows: List[tuple]):
+    """COPY rows into a table in one round trip."""
+    buf = io.StringIO()
+    for row in rows:
+        buf.write('\t'.join(_copy_value(v) for v in row))
+        buf.write('\n')
+    buf.seek(0)
+    cur.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buf)
+
+
+def bulk_import_plants(conn, records: List[Dict[str, Any]], commit: bool = True) -> Dict[str, int]:
+    """
+    Upsert all plant records set-based, in one transaction.
+
+    Existing plants (same slug) are updated in place; a plant's edible parts are
+    replaced when its record lists any. Returns counts for the summary. With
+    commit=False the caller owns the transaction (call at most once per transaction).
+    """
+    stats = {'inserted': 0, 'updated': 0, 'skipped': 0, 'unknown_family': 0, 'edible_parts': 0}
+    named = [r for r in records if r.get('name')]
+    stats['skipped'] = len(records) - len(named)
+    # Last record wins for a repeated slug; ON CONFLICT can't touch the same row twice
+    records = list({r['slug']: r for r in named}.values())
+    if not records:
+        return stats
+
+    columns = [c for c in records[0] if c not in RECORD_EXTRAS]
+    col_list = ', '.join(columns)
+
+    with conn.cursor() as cur:
+        # Staging table takes its column types straight from plant_entity
+        cur.execute(f"""
+            CREATE TEMP TABLE staging_plants ON COMMIT DROP AS
+                SELECT {col_list}, NULL::VARCHAR(100) AS family_name
+                FROM plant_entity WITH NO DATA;
+            CREATE TEMP TABLE staging_plant_edible_parts (
+                slug VARCHAR(100) NOT NULL,
+                part_name VARCHAR(50) NOT NULL
+            ) ON COMMIT DROP;
+        """)
+
+        copy_rows(cur, 'staging_plants', columns + ['family_name'],
+                  [tuple(r.get(c) for c in columns) + (r.get('family_name'),) for r in records])
+        copy_rows(cur, 'staging_plant_edible_parts', ['slug', 'part_name'],
+                  [(r['slug'], part) for r in records for part in dict.fromkeys(r.get('edible_parts') or [])])
+
+        updates = ',\n                '.join(f"{c} = EXCLUDED.{c}" for c in columns if c != 'slug')
+        cur.execute(f"""
+            WITH upserted AS (
+                INSERT INTO plant_entity ({col_list}, family_id)
+                SELECT {', '.join('s.' + c for c in columns)}, pf.id
+                FROM staging_plants s
+                LEFT JOIN plant_families pf ON pf.name = s.family_name
+                ON CONFLICT (slug) DO UPDATE SET
+                    {updates},
+                    family_id = EXCLUDED.family_id,
+                    updated_at = CURRENT_TIMESTAMP
+                RETURNING (xmax = 0) AS inserted
+            )
+            SELECT
+                COUNT(*) FILTER (WHERE inserted),
+                COUNT(*) FILTER (WHERE NOT inserted),
+                (SELECT COUNT(*) FROM staging_plants s
+                 WHERE s.family_name IS NOT NULL
+                   AND NOT EXISTS (SELECT 1 FROM plant_families pf WHERE pf.name = s.family_name))
+            FROM upserted
+        """)
+        stats['inserted'], stats['updated'], stats['unknown_family'] = cur.fetchone()
+
+        cur.execute("""
+            DELETE FROM plant_edible_parts pep
+            USING plant_entity p
+            WHERE pep.plant_id = p.id
+              AND p.slug IN (SELECT slug FROM staging_plant_edible_parts)
+        """)
+        cur.execute("""
+            INSERT INTO plant_edible_parts (plant_id, edible_part_id)
+            SELECT p.id, ep.id
+            FROM staging_plant_edible_parts s
+            JOIN plant_entity p ON p.slug = s.slug
+            JOIN edible_parts ep ON ep.name = s.part_name
+            ON CONFLICT DO NOTHING
+        """)
+        stats['edible_parts'] = cur.rowcount
+
+    if commit:
+        conn.commit()
+    return stats
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Plant records built from the scraped Almanac data and the Trefle botanical data.
+
+Shared by import-plant-data.py and import-plants.py. A record is a dict keyed by
+plant_entity column names plus `family_name` and `edible_parts` (see plant_db).
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+# Manual family mapping for plants not found in Trefle
+MANUAL_FAMILY_MAP = {
+    "apples": "Rosaceae",
+    "artichokes": "Asteraceae",
+    "asparagus": "Asparagaceae",
+    "blackberries": "Rosaceae",
+    "cantaloupes": "Cucurbitaceae",
+    "cauliflower": "Brassicaceae",
+    "cherries": "Rosaceae",
+    "collards": "Brassicaceae",
+    "corn": "Poaceae",
+    "edamame": "Fabaceae",
+    "fava-beans": "Fabaceae",
+    "fennel": "Apiaceae",
+    "grapes": "Vitaceae",
+    "honeydew-melons": "Cucurbitaceae",
+    "horseradish": "Brassicaceae",
+    "kohlrabi": "Brassicaceae",
+    "mustard-greens": "Brassicaceae",
+    "okra": "Malvaceae",
+    "peaches": "Rosaceae",
+    "peanuts": "Fabaceae",
+    "pears": "Rosaceae",
+    "plums": "Rosaceae",
+    "rhubarb": "Polygonaceae",
+    "rutabagas": "Brassicaceae",
+    "salsify": "Asteraceae",
+    "shallots": "Amaryllidaceae",
+    "tomatillos": "Solanaceae",
+    "watermelon": "Cucurbitaceae",
+}
+
+# Derive feeder type from family and soil nutrients
+def derive_feeder_type(family: str, soil_nutrients: Optional[int]) -> str:
+    """Derive feeder type from family and soil nutrient requirements."""
+    if family == "Fabaceae":
+        return "NITROGEN_FIXER"
+    
+    heavy_feeders = ["Solanaceae", "Brassicaceae", "Cucurbitaceae", "Poaceae"]
+    light_feeders = ["Amaryllidaceae", "Asteraceae", "Lamiaceae"]
+    
+    if family in heavy_feeders:
+        return "HEAVY"
+    elif family in light_feeders:
+        return "LIGHT"
+    else:
+        # Use soil nutrients if available
+        if soil_nutrients:
+            if soil_nutrients >= 7:
+                return "HEAVY"
+            elif soil_nutrients <= 4:
+                return "LIGHT"
+            else:
+                return "MODERATE"
+        return "MODERATE"
+
+
+
+def load_json_file(filepath: Path) -> Any:
+    """Load and parse JSON file."""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def load_trefle_by_slug(trefle_file: Path) -> Dict[str, Any]:
+    """Load Trefle data keyed by slug."""
+    trefle_data = load_json_file(trefle_file)
+    trefle_by_slug = {}
+    
+    for plant in trefle_data.get('plants', []):
+        slug = plant.get('slug')
+        if slug:
+            trefle_by_slug[slug] = plant
+    
+    print(f"Loaded {len(trefle_by_slug)} plants from Trefle data")
+    return trefle_by_slug
+
+def slug_from_filename(json_file: Path) -> str:
+    """Plant slug from an extracted-text file name."""
+    return json_file.stem.replace('_extracted_20251104', '').replace('_extracted', '')
+
+def build_plant_record(slug: str, plant_data: Dict[str, Any], trefle_by_slug: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge scraped and Trefle data into a plant record (see plant_db)."""
+    trefle = trefle_by_slug.get(slug, {})
+    trefle_main = trefle.get('data', {}).get('main_species', {}) if trefle.get('data') else {}
+    trefle_growth = trefle_main.get('growth', {}) if trefle_main else {}
+    
+    # Get family
+    family_name = None
+    if trefle.get('family'):
+        family_name = trefle['family']
+    elif slug in MANUAL_FAMILY_MAP:
+        family_name = MANUAL_FAMILY_MAP[slug]
+    
+    # Derive feeder type
+    soil_nutrients = trefle_growth.get('soil_nutriments') if trefle_growth else None
+    feeder_type = derive_feeder_type(family_name or "", soil_nutrients) if family_name else None
+    
+    return {
+        'name': plant_data.get('commonName'),
+        'slug': slug,
+        'scientific_name': trefle.get('scientific_name'),
+        'genus': trefle.get('genus'),
+        'cycle': plant_data.get('cycle'),
+        'sun_needs': plant_data.get('sunNeeds'),
+        'water_needs': plant_data.get('waterNeeds'),
+        'root_depth': plant_data.get('rootDepth'),
+        'growth_habit': plant_data.get('growthHabit'),
+        'soil_temp_min_f': plant_data.get('soilTempMinF'),
+        'soil_temp_optimal_f': plant_data.get('soilTempOptimalF'),
+        'frost_tolerant': plant_data.get('frostTolerant', False),
+        'spacing_min_inches': plant_data.get('spacingMin'),
+        'spacing_max_inches': plant_data.get('spacingMax'),
+        'planting_depth_inches': plant_data.get('plantingDepthInches'),
+        'container_suitable': plant_data.get('containerSuitable', False),
+        'requires_staking': plant_data.get('requiresStaking', False),
+        'requires_pruning': plant_data.get('requiresPruning', False),
+        'days_to_maturity_min': plant_data.get('daysToMaturityMin'),
+        'days_to_maturity_max': plant_data.get('daysToMaturityMax'),
+        'watering_inches_per_week': plant_data.get('wateringInchesPerWeek'),
+        'fertilizing_frequency_weeks': plant_data.get('fertilizingFrequencyWeeks'),
+        'mulch_recommended': plant_data.get('mulchRecommended', True),
+        'notes': plant_data.get('notes'),
+        'is_nitrogen_fixer': family_name == "Fabaceae",
+        'feeder_type': feeder_type,
+        'soil_ph_min': trefle_growth.get('ph_minimum') if trefle_growth else None,
+        'soil_ph_max': trefle_growth.get('ph_maximum') if trefle_growth else None,
+        'family_name': family_name,
+        'edible_parts': plant_data.get('edibleParts', []),
+    }
+
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Precompute rotation_recommendation_cache
+
+Scores every plant for every grow area (see rotation_cache.py) and bulk-loads
+the results. import-plants.py and import-all-plant-data.py run this after
+importing; run it on its own after editing crop records in bulk, or to fill
+the cache for a different planting date.
+
+Usage:
+    python3 precompute-rotation-cache.py [--date YYYY-MM-DD]
+
+    --date  Planting date to score for (default: today). Sets the cache's
+            season and year.
+
+Environment variables: same as import-plant-data.py
+    DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD (required)
+"""
+
+import argparse
+import os
+import sys
+from datetime import date
+
+import plant_db
+import rotation_cache
+
+
+def main():
+    """Main precompute function."""
+    parser = argparse.ArgumentParser(description="Precompute rotation_recommendation_cache")
+    parser.add_argument("--date", type=date.fromisoformat, default=None,
+                        help="Planting date to score for, YYYY-MM-DD (default: today)")
+    args = parser.parse_args()
+
+    if not os.getenv("DB_PASSWORD"):
+        print("❌ DB_PASSWORD environment variable required")
+        print("   Set it with: export DB_PASSWORD='your-password'")
+        sys.exit(1)
+
+    try:
+        conn = plant_db.connect_from_env()
+    except Exception as e:
+        print(f"❌ Database connection failed: {e}")
+        sys.exit(1)
+
+    try:
+        written = rotation_cache.precompute(conn, planting_date=args.date)
+        print(f"\n✅ Rotation cache: {written} rows written")
+        plant_db.print_query_report()
+    except Exception as e:
+        conn.rollback()
+        print(f"\n❌ Precompute failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Batch precomputation of rotation_recommendation_cache.
+
+`import-all-plant-data.py` empties the cache, and the Kotlin
+RotationScoringService otherwise scores plants one API round trip at a time
+when a user asks. This job scores every plant for every grow area in one pass
+and bulk-loads the results, so the cache is warm right after an import.
+
+Scores follow RotationScoringService / RotationRules component for component:
+    family rotation      0-35  years since the family last grew in the area
+    nutrient balance     0-25  NutrientBalance.scoreSequence(last crop, plant)
+    disease risk         0-20  years since a diseased crop of the family vs. the
+                               family's longest soil-borne disease persistence
+    root depth diversity 0-10  RootDepth.scoreDiversity over the last 3 crops
+    companions           0-10  beneficial/antagonistic crops growing there now
+
+Nothing is looped per plant. Plant-pair inputs are P x P matrices built once:
+same family, shared pests, shared diseases, and the companion relationship
+(+1 beneficial, -1 unfavorable, either direction). Per-area history is
+reduced to A x F "years since" arrays (A grow areas, F families) and small
+per-area codes. Every component is then a gather plus np.select over the
+A x P grid. Each row's `reasons` holds the component scores plus the pair
+inputs against the area's last crop (same family, shared pests/diseases).
+
+Rows are COPYed into a staging table and upserted on
+(grow_area_id, plant_id, season, year) in one statement.
+"""
+
+import json
+import time
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+import plant_db
+
+# RotationRules.familyIntervals
+FAMILY_INTERVALS = {
+    "Solanaceae": 4, "Brassicaceae": 4, "Cucurbitaceae": 3, "Fabaceae": 3, "Apiaceae": 3,
+    "Alliaceae": 3, "Asteraceae": 2, "Chenopodiaceae": 2, "Amaranthaceae": 2, "Poaceae": 2,
+    "Lamiaceae": 2,
+}
+DEFAULT_FAMILY_INTERVAL = 3
+DEFAULT_DISEASE_PERSISTENCE = 3
+HISTORY_YEARS = 5
+
+# Code 0 = unknown (NULL), last code = any other non-null value
+FEEDER_TYPES = (None, "HEAVY", "MODERATE", "LIGHT", "NITROGEN_FIXER", "OTHER")
+
+SEASONS = ("WINTER", "WINTER", "SPRING", "SPRING", "SPRING", "SUMMER",
+           "SUMMER", "SUMMER", "FALL", "FALL", "FALL", "WINTER")
+
+
+def season_of(day: date) -> str:
+    return SEASONS[day.month - 1]
+
+
+def years_before(day: date, years: int) -> date:
+    """LocalDate.minusYears: Feb 29 falls back to Feb 28."""
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:
+        return day.replace(year=day.year - years, day=28)
+
+
+def score_sequence(previous: Optional[str], current: Optional[str], is_nitrogen_fixer: bool) -> int:
+    """RotationRules.NutrientBalance.scoreSequence."""
+    if previous is None or current is None:
+        return 15
+    if is_nitrogen_fixer and previous == "HEAVY":
+        return 25
+    if current == "HEAVY" and previous == "LIGHT" and is_nitrogen_fixer:
+        return 25
+    if previous == "HEAVY" and current == "LIGHT":
+        return 20
+    if previous == "HEAVY" and current == "HEAVY":
+        return 10
+    if previous == "MODERATE" or current == "MODERATE":
+        return 15
+    if previous == "LIGHT" and current == "LIGHT":
+        return 12
+    return 15
+
+
+# [previous feeder code, current feeder code, is nitrogen fixer]
+NUTRIENT_TABLE = np.array(
+    [[[score_sequence(p, c, bool(n)) for n in (0, 1)] for c in FEEDER_TYPES] for p in FEEDER_TYPES],
+    dtype=np.int16,
+)
+
+
+def feeder_code(value: Optional[str]) -> int:
+    if value is None:
+        return 0
+    return FEEDER_TYPES.index(value) if value in FEEDER_TYPES[1:-1] else len(FEEDER_TYPES) - 1
+
+
+class Codes:
+    """String -> dense integer code, with -1 for None."""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def __call__(self, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        if value not in self._index:
+            self._index[value] = len(self.values)
+            self.values.append(value)
+        return self._index[value]
+
+
+def load_plants(conn, families: Codes, depths: Codes):
+    """Per-plant attribute arrays and the P x P pair matrices."""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT p.id, p.name, pf.name, p.feeder_type, COALESCE(p.is_nitrogen_fixer, false), p.root_depth
+            FROM plant_entity p
+            LEFT JOIN plant_families pf ON pf.id = p.family_id
+            ORDER BY p.id
+        """)
+        rows = cur.fetchall()
+        cur.execute("SELECT plant_id, pest_id FROM plant_pests")
+        pest_links = cur.fetchall()
+        cur.execute("SELECT plant_id, disease_id FROM plant_diseases")
+        disease_links = cur.fetchall()
+        cur.execute("SELECT plant_id, companion_id, relationship FROM plant_companions")
+        companion_links = cur.fetchall()
+        # getSoilBorneDiseases: a disease affects the families of the plants linked to it
+        cur.execute("""
+            SELECT pf.name, MAX(COALESCE(d.persistence_years, %s))
+            FROM diseases d
+            JOIN plant_diseases pd ON pd.disease_id = d.id
+            JOIN plant_entity p ON p.id = pd.plant_id
+            JOIN plant_families pf ON pf.id = p.family_id
+            WHERE d.is_soil_borne
+            GROUP BY pf.name
+        """, (DEFAULT_DISEASE_PERSISTENCE,))
+        persistence_by_family = dict(cur.fetchall())
+
+    ids = np.array([r[0] for r in rows], dtype=np.int64)
+    index = {plant_id: i for i, plant_id in enumerate(ids.tolist())}
+    n = len(rows)
+    plants = {
+        "ids": ids,
+        "index": index,
+        "by_name": {},
+        "family": np.array([families(r[2]) for r in rows], dtype=np.int32),
+        "feeder": np.array([feeder_code(r[3]) for r in rows], dtype=np.int8),
+        "nitrogen_fixer": np.array([bool(r[4]) for r in rows], dtype=bool),
+        "depth": np.array([depths(r[5]) for r in rows], dtype=np.int32),
+    }
+    for i, r in enumerate(rows):
+        if r[1]:
+            plants["by_name"].setdefault(r[1].lower(), i)
+
+    def incidence(links) -> np.ndarray:
+        columns = {x: j for j, x in enumerate(sorted({x for _, x in links}))}
+        m = np.zeros((n, len(columns)), dtype=np.int16)
+        for plant_id, x in links:
+            if plant_id in index:
+                m[index[plant_id], columns[x]] = 1
+        return m
+
+    pests, diseases = incidence(pest_links), incidence(disease_links)
+    relation = np.zeros((n, n), dtype=np.int8)
+    for a, b, rel in companion_links:
+        if a in index and b in index:
+            value = {"BENEFICIAL": 1, "UNFAVORABLE": -1}.get(rel, 0)
+            i, j = index[a], index[b]
+            for x, y in ((i, j), (j, i)):
+                # Unfavorable wins if the two directions disagree
+                relation[x, y] = min(relation[x, y], value) if relation[x, y] else value
+
+    pairs = {
+        "same_family": (plants["family"][:, None] == plants["family"][None, :]) & (plants["family"][:, None] >= 0),
+        "shared_pests": pests @ pests.T,
+        "shared_diseases": diseases @ diseases.T,
+        "relation": relation,
+    }
+    return plants, pairs, persistence_by_family
+
+
+def load_history(conn, as_of: date):
+    """Crop records of the last HISTORY_YEARS years for every grow area, newest first."""
+    with conn.cursor() as cur:
+        cur.execute("SELECT id FROM grow_area_entity ORDER BY id")
+        areas = [r[0] for r in cur.fetchall()]
+        cur.execute("""
+            SELECT grow_zone_id, name, plant_name, planting_date, harvest_date,
+                   plant_family, feeder_type, root_depth, COALESCE(had_diseases, false)
+            FROM crop_record_entity
+            WHERE planting_date > %s
+            ORDER BY grow_zone_id, planting_date DESC
+        """, (years_before(as_of, HISTORY_YEARS),))
+        records = cur.fetchall()
+    return areas, records
+
+
+def compute_scores(plants, pairs, persistence_by_family: Dict[str, int], areas: List[int],
+                   records: List[tuple], families: Codes, depths: Codes, planting_date: date, as_of: date):
+    """Component scores over the areas x plants grid (each an A x P int array) plus pair inputs."""
+    A, P = len(areas), len(plants["ids"])
+    area_index = {area_id: a for a, area_id in enumerate(areas)}
+    one_year_ago = years_before(as_of, 1)
+
+    # Per-area reductions of the history. The family arrays are sized after
+    # every record's family has been coded.
+    history_by_area: Dict[int, List[tuple]] = {}
+    for r in records:
+        if r[0] in area_index:
+            history_by_area.setdefault(area_index[r[0]], []).append(r)
+    for r in records:
+        families(r[5])
+    F = len(families.values) + 1  # last column: NULL family, never matched
+
+    last_family = np.full((A, F), np.nan)      # years since the family last grew here
+    last_diseased = np.full((A, F), np.nan)    # years since a diseased crop of the family
+    prev_feeder = np.zeros(A, dtype=np.int8)
+    has_history = np.zeros(A, dtype=bool)
+    recent_depths = np.zeros(A, dtype=np.int64)  # bitmask of the last 3 crops' root depths
+    last_crop = np.full(A, -1, dtype=np.int64)  # plant index of the newest crop, if known
+    current = np.zeros((A, P), dtype=np.int16)  # crops growing now, counted per plant
+    has_current = np.zeros(A, dtype=bool)
+
+    for a, history in history_by_area.items():
+        has_history[a] = True
+        newest = history[0]
+        prev_feeder[a] = feeder_code(newest[6])
+        last_crop[a] = plants["by_name"].get((newest[2] or newest[1] or "").lower(), -1)
+        for r in history[:3]:
+            code = depths(r[7])
+            if code >= 0:
+                recent_depths[a] |= 1 << code
+        for area_id, name, plant_name, planted, harvested, family, feeder, depth, diseased in history:
+            f = families(family)
+            years = (planting_date - planted).days / 365.0
+            if f >= 0:
+                if np.isnan(last_family[a, f]):
+                    last_family[a, f] = years
+                if diseased and np.isnan(last_diseased[a, f]):
+                    last_diseased[a, f] = years
+            if planted > one_year_ago and harvested is None:
+                has_current[a] = True
+                i = plants["by_name"].get((name or "").lower())
+                if i is not None:
+                    current[a, i] += 1
+
+    family = plants["family"]
+    known_family = family >= 0
+    fam_col = np.where(known_family, family, F - 1)
+
+    # Family rotation (0-35)
+    interval = np.array([FAMILY_INTERVALS.get(f, DEFAULT_FAMILY_INTERVAL) for f in families.values]
+                        + [DEFAULT_FAMILY_INTERVAL], dtype=np.float64)[fam_col]
+    years = last_family[:, fam_col]
+    with np.errstate(invalid="ignore"):
+        family_score = np.select(
+            [np.isnan(years), years < 1, years < 2, years < interval],
+            [35, 0, 10, np.floor(np.nan_to_num(years) / interval * 35)],
+            35,
+        )
+    family_score = np.where(known_family, family_score, 20).astype(np.int16)
+
+    # Nutrient balance (0-25)
+    nutrient_score = NUTRIENT_TABLE[prev_feeder[:, None], plants["feeder"][None, :],
+                                    plants["nitrogen_fixer"][None, :].astype(np.int8)]
+    nutrient_score = np.where(has_history[:, None], nutrient_score, 15).astype(np.int16)
+
+    # Disease risk (0-20); RotationScoringService halves persistence with integer division
+    persistence = np.array([persistence_by_family.get(f, DEFAULT_DISEASE_PERSISTENCE) for f in families.values]
+                           + [DEFAULT_DISEASE_PERSISTENCE], dtype=np.int64)[fam_col]
+    diseased_years = last_diseased[:, fam_col]
+    with np.errstate(invalid="ignore"):
+        disease_score = np.select(
+            [np.isnan(diseased_years), diseased_years < 1, diseased_years < persistence // 2,
+             diseased_years < persistence],
+            [20, 0, 5, 12],
+            20,
+        )
+    disease_score = np.where(known_family, disease_score, 15).astype(np.int16)
+
+    # Root depth diversity (0-10): distinct depths among the last 3 crops plus this plant
+    depth = plants["depth"]
+    depth_bit = np.where(depth >= 0, np.left_shift(1, np.maximum(depth, 0)), 0).astype(np.int64)
+    combined = recent_depths[:, None] | depth_bit[None, :]
+    distinct = np.zeros_like(combined)
+    for bit in range(max(len(depths.values), 1)):
+        distinct += (combined >> bit) & 1
+    root_score = np.select([distinct >= 3, distinct == 2], [10, 7], 3)
+    root_score = np.where((depth[None, :] < 0) | (recent_depths[:, None] == 0), 5, root_score).astype(np.int16)
+
+    # Companion compatibility (0-10)
+    relation = pairs["relation"]
+    beneficial = current @ (relation == 1).astype(np.int16).T
+    antagonistic = current @ (relation == -1).astype(np.int16).T
+    companion_score = np.select([antagonistic > 0, beneficial >= 2, beneficial == 1], [0, 10, 8], 7)
+    companion_score = np.where(has_current[:, None], companion_score, 10).astype(np.int16)
+
+    # Pair inputs against the area's last crop (informational, not part of the score)
+    has_last = last_crop >= 0
+    last = np.maximum(last_crop, 0)
+    shared_pests = np.where(has_last[:, None], pairs["shared_pests"][last], 0)
+    shared_diseases = np.where(has_last[:, None], pairs["shared_diseases"][last], 0)
+    same_family = has_last[:, None] & pairs["same_family"][last]
+
+    return {
+        "family": family_score,
+        "nutrient": nutrient_score,
+        "disease": disease_score,
+        "root_depth": root_score,
+        "companion": companion_score,
+        "beneficial_neighbors": beneficial,
+        "antagonistic_neighbors": antagonistic,
+        "shared_pests": shared_pests,
+        "shared_diseases": shared_diseases,
+        "same_family": same_family,
+    }
+
+
+def build_rows(areas: List[int], plant_ids: np.ndarray, scores: Dict[str, np.ndarray],
+               season: str, year: int) -> List[Tuple]:
+    """(grow_area_id, plant_id, season, year, score, reasons JSON) per area and plant."""
+    total = (scores["family"] + scores["nutrient"] + scores["disease"]
+             + scores["root_depth"] + scores["companion"])
+    columns = {k: v.tolist() for k, v in scores.items()}
+    totals = total.tolist()
+    ids = plant_ids.tolist()
+    rows = []
+    for a, area_id in enumerate(areas):
+        for p, plant_id in enumerate(ids):
+            reasons = [
+                {"category": "Family Rotation", "score": columns["family"][a][p], "max": 35},
+                {"category": "Nutrient Balance", "score": columns["nutrient"][a][p], "max": 25},
+                {"category": "Disease Risk", "score": columns["disease"][a][p], "max": 20},
+                {"category": "Root Depth Diversity", "score": columns["root_depth"][a][p], "max": 10},
+                {"category": "Companion Compatibility", "score": columns["companion"][a][p], "max": 10,
+                 "beneficialNeighbors": columns["beneficial_neighbors"][a][p],
+                 "antagonisticNeighbors": columns["antagonistic_neighbors"][a][p]},
+                {"category": "Last Crop Overlap", "sameFamily": columns["same_family"][a][p],
+                 "sharedPests": columns["shared_pests"][a][p],
+                 "sharedDiseases": columns["shared_diseases"][a][p]},
+            ]
+            rows.append((area_id, plant_id, season, year, totals[a][p],
+                         json.dumps(reasons, separators=(',', ':'))))
+    return rows
+
+
+def write_rows(conn, rows: List[Tuple], commit: bool = True) -> int:
+    """COPY cache rows into a staging table and upsert them in one statement; returns rows written."""
+    started = time.perf_counter()
+    with conn.cursor() as cur:
+        cur.execute("""
+            CREATE TEMP TABLE staging_rotation_cache (
+                grow_area_id BIGINT NOT NULL,
+                plant_id BIGINT NOT NULL,
+                season VARCHAR(50) NOT NULL,
+                year INTEGER NOT NULL,
+                score INTEGER NOT NULL,
+                reasons TEXT
+            ) ON COMMIT DROP
+        """)
+        plant_db.copy_rows(cur, 'staging_rotation_cache',
+                           ['grow_area_id', 'plant_id', 'season', 'year', 'score', 'reasons'], rows)
+        cur.execute("""
+            INSERT INTO rotation_recommendation_cache (grow_area_id, plant_id, season, year, score, reasons)
+            SELECT grow_area_id, plant_id, season, year, score, reasons::jsonb FROM staging_rotation_cache
+            ON CONFLICT (grow_area_id, plant_id, season, year) DO UPDATE
+            SET score = EXCLUDED.score, reasons = EXCLUDED.reasons, calculated_at = CURRENT_TIMESTAMP
+        """)
+        written = cur.rowcount
+    if commit:
+        conn.commit()
+    plant_db.print_throughput('rotation_recommendation_cache', len(rows), time.perf_counter() - started, written)
+    return written
+
+
+def precompute(conn, planting_date: Optional[date] = None, commit: bool = True) -> int:
+    """Score every plant for every grow area as of `planting_date` (default today) and load the cache."""
+    as_of = date.today()
+    planting_date = planting_date or as_of
+    started = time.perf_counter()
+    families, depths = Codes(), Codes()
+    plants, pairs, persistence = load_plants(conn, families, depths)
+    areas, records = load_history(conn, as_of)
+    scores = compute_scores(plants, pairs, persistence, areas, records, families, depths, planting_date, as_of)
+    rows = build_rows(areas, plants["ids"], scores, season_of(planting_date), planting_date.year)
+    print(f"  rotation cache: {len(areas)} grow areas x {len(plants['ids'])} plants "
+          f"({season_of(planting_date)} {planting_date.year}), scored in "
+          f"{(time.perf_counter() - started) * 1000:.0f} ms")
+    return write_rows(conn, rows, commit=commit) if rows else 0
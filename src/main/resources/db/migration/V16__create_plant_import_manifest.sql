@@ -0,0 +1,13 @@
+-- V16__create_plant_import_manifest.sql
+-- Content hashes of the last imported version of each plant-data record, so the
+-- plant import (plant-data-aggregator/.../scrapers/import-plants.py) only writes what changed
+
+CREATE TABLE IF NOT EXISTS plant_import_manifest (
+    kind VARCHAR(20) NOT NULL,           -- plant, pest, disease, plant_links, companions
+    record_key VARCHAR(255) NOT NULL,    -- slug or name within the kind
+    content_hash CHAR(64) NOT NULL,      -- sha256 of the canonical JSON of the record
+    imported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (kind, record_key)
+);
+
+COMMENT ON TABLE plant_import_manifest IS 'Content hash per imported plant-data record, for incremental re-imports';